@@ -0,0 +1,76 @@
+import importlib
+import importlib.util
+import logging
+import threading
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class BackendLoader:
+    """
+    Deferred loader for the optional analysis libraries (librosa, aubio, ...).
+    Availability is probed with importlib.util.find_spec, which only looks
+    the package up on disk, so constructing the analyzer costs milliseconds.
+    The modules themselves are imported on first real use, or ahead of time
+    on a background thread once the UI is up.
+    """
+    
+    def __init__(self, modules: Dict[str, str]):
+        """
+        Args:
+            modules: Backend name -> importable module name
+        """
+        self.modules = modules
+        self._loaded: Dict[str, ModuleType] = {}
+        self._failed: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def probe(self, name: str) -> bool:
+        """Check whether a backend is installed, without importing it."""
+        try:
+            return importlib.util.find_spec(self.modules[name]) is not None
+        except (ImportError, ValueError) as e:
+            logger.warning(f"Could not probe {name}: {e}")
+            return False
+    
+    def load(self, name: str) -> Optional[ModuleType]:
+        """
+        Import a backend, once. Concurrent callers wait for the first import.
+        
+        Returns:
+            The module, or None if importing it failed
+        """
+        if (module := self._loaded.get(name)) is not None:
+            return module
+        
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            if name in self._failed:
+                return None
+            try:
+                module = importlib.import_module(self.modules[name])
+            except Exception as e:
+                self._failed[name] = str(e)
+                logger.warning(f"{name} not available: {e}")
+                return None
+            self._loaded[name] = module
+            logger.info(f"✓ {name} loaded")
+            return module
+    
+    def preload(self, names: Iterable[str]) -> threading.Thread:
+        """
+        Import backends, in order, on a daemon thread.
+        
+        Returns:
+            The started thread
+        """
+        def run():
+            for name in names:
+                self.load(name)
+        
+        thread = threading.Thread(target=run, name="analysis-backend-preload", daemon=True)
+        thread.start()
+        return thread
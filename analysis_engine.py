@@ -0,0 +1,194 @@
+import os
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future, CancelledError, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Analyzer owned by the current worker process (set by _init_worker)
+_worker_analyzer = None
+
+def _init_worker(analysis_window: Optional[Dict] = None):
+    """Give each worker process its own UniversalAudioAnalyzer, with the parent's analysis window."""
+    global _worker_analyzer
+    from audio_analysis_universal import universal_audio_analyzer
+    from analysis_window import AnalysisWindowPolicy
+    universal_audio_analyzer.analysis_window = AnalysisWindowPolicy.from_dict(analysis_window)
+    _worker_analyzer = universal_audio_analyzer
+
+def _analyze_in_worker(file_path: str) -> Dict:
+    """Analyze a single file inside a worker process."""
+    return _worker_analyzer.analyze_sample(file_path)
+
+# (file_path, analysis result or None, exception or None)
+AnalysisOutcome = Tuple[str, Optional[Dict], Optional[Exception]]
+
+class ParallelAnalysisEngine:
+    """
+    Multi-process analysis engine.
+    Fans files out to a pool of worker processes, each with its own analyzer,
+    and streams results back as they complete. The number of files in flight
+    is bounded so large imports do not queue every path up front.
+    """
+    
+    # Seconds between checks for cancelled files and should_stop while waiting
+    POLL_INTERVAL = 0.5
+    
+    def __init__(self, max_workers: Optional[int] = None, max_in_flight: Optional[int] = None,
+                 analysis_window: Optional[Dict] = None):
+        """
+        Args:
+            max_workers: Number of worker processes. None picks one per core (leaving one
+                for the UI); 0 analyzes in-process without a pool.
+            max_in_flight: Maximum number of submitted but undelivered files.
+                Defaults to twice the worker count.
+            analysis_window: AnalysisWindowPolicy.to_dict() settings for the workers
+                (None = the default policy)
+        """
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) - 1)
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or max(2, self.max_workers * 2)
+        self.analysis_window = analysis_window
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool on first use and keep it warm between batches."""
+        # Several threads (import worker, library watcher) may share one engine
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.analysis_window,)
+                )
+                logger.info(f"Started analysis pool with {self.max_workers} worker processes")
+            return self._executor
+    
+    def analyze(self, file_paths: Iterable[str], ordered: bool = False,
+                should_stop: Optional[Callable[[], bool]] = None) -> Iterator[AnalysisOutcome]:
+        """
+        Analyze files and yield (file_path, result, error) as they complete.
+        
+        Args:
+            file_paths: Paths to analyze
+            ordered: Deliver results in input order instead of completion order
+            should_stop: Polled between deliveries; returning True stops submitting
+                new files and cancels queued ones, which yield no outcome.
+                Files cancelled by anything else (the pool being shut down by
+                another caller) yield a CancelledError outcome.
+        """
+        if self.max_workers == 0:
+            yield from self._analyze_in_process(file_paths, should_stop)
+            return
+        
+        pending: Dict[Future, Tuple[int, str, ProcessPoolExecutor]] = {}
+        stopped: Set[Future] = set()  # Cancelled by this call's should_stop
+        ready: Dict[int, AnalysisOutcome] = {}
+        next_index = 0
+        path_iter = enumerate(str(path) for path in file_paths)
+        exhausted = False
+        
+        try:
+            while True:
+                stopping = should_stop is not None and should_stop()
+                
+                # Keep the in-flight window full
+                while not stopping and not exhausted and len(pending) < self.max_in_flight:
+                    try:
+                        index, file_path = next(path_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    executor = self._get_executor()
+                    pending[executor.submit(_analyze_in_worker, file_path)] = (index, file_path, executor)
+                
+                if stopping:
+                    stopped.update(future for future in pending if future.cancel())
+                
+                if not pending:
+                    break
+                
+                # A cancelled future only wakes wait() once the pool dequeues it, which
+                # never happens after shutdown(cancel_futures=True), so pick those up here
+                done = {future for future in pending if future.cancelled()}
+                if not done:
+                    done, _ = wait(pending, timeout=self.POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, file_path, executor = pending.pop(future)
+                    if future in stopped:
+                        outcome = None
+                    elif future.cancelled():
+                        # Shared pool shut down under us (settings change, exit)
+                        logger.warning(f"Analysis of {file_path} was cancelled")
+                        outcome = file_path, None, CancelledError(f"Analysis of {file_path} was cancelled")
+                    else:
+                        outcome = self._collect(future, file_path, executor)
+                    
+                    if not ordered:
+                        if outcome is not None:
+                            yield outcome
+                        continue
+                    
+                    # Cancelled files leave a None placeholder so ordering can advance past them
+                    ready[index] = outcome
+                    while next_index in ready:
+                        if (outcome := ready.pop(next_index)) is not None:
+                            yield outcome
+                        next_index += 1
+            
+            # Anything still buffered after a stop is delivered in order
+            for index in sorted(ready):
+                if ready[index] is not None:
+                    yield ready[index]
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    def _collect(self, future: Future, file_path: str, executor: ProcessPoolExecutor) -> AnalysisOutcome:
+        """Turn a finished future into an outcome tuple."""
+        try:
+            return file_path, future.result(), None
+        except BrokenProcessPool as e:
+            logger.error(f"Analysis worker crashed while processing {file_path}: {e}")
+            # Replace the broken pool; later submissions start a fresh one. Its
+            # other futures fail on their own, so nothing is cancelled here
+            # (other threads may be sharing this engine)
+            self._discard_executor(executor)
+            return file_path, None, e
+        except Exception as e:
+            logger.warning(f"Analysis failed for {file_path}: {e}")
+            return file_path, None, e
+    
+    def _analyze_in_process(self, file_paths: Iterable[str],
+                            should_stop: Optional[Callable[[], bool]]) -> Iterator[AnalysisOutcome]:
+        """Sequential fallback using this process's analyzer."""
+        from audio_analysis_universal import universal_audio_analyzer
+        
+        for file_path in file_paths:
+            if should_stop is not None and should_stop():
+                break
+            try:
+                yield str(file_path), universal_audio_analyzer.analyze_sample(str(file_path)), None
+            except Exception as e:
+                yield str(file_path), None, e
+    
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Forget a broken pool without cancelling the futures queued on it."""
+        with self._executor_lock:
+            if executor is self._executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+    
+    def shutdown(self):
+        """Stop the worker pool. A new one is created on the next analysis."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,122 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Window recorded for analyses of the whole signal (and for analyses that predate windows)
+FULL_WINDOW = {"mode": "full"}
+
+class AnalysisWindowPolicy:
+    """
+    Decides how much of a long file the analyzer looks at.
+    Frame features (STFT, chroma, MFCC, beat tracking) cost time in
+    proportion to length, so multi-minute loops and stems dominate a mixed
+    library. Files up to max_full_seconds are always analyzed whole; longer
+    ones are cut to:
+    
+    - "full": the whole signal (no cap)
+    - "head": the first `seconds` seconds
+    - "segments": `segments` evenly spaced excerpts of `seconds` each,
+      joined end to end, so intros and outros do not decide the result
+    
+    Whole-file summaries (level, band energies, duration) still cover the
+    entire file; see streaming_audio.AudioSummary.
+    """
+    
+    FULL = "full"
+    HEAD = "head"
+    SEGMENTS = "segments"
+    MODES = (FULL, HEAD, SEGMENTS)
+    
+    def __init__(self, mode: str = SEGMENTS, seconds: float = 10.0, segments: int = 3,
+                 max_full_seconds: float = 60.0):
+        """
+        Args:
+            mode: "full", "head" or "segments"
+            seconds: Length of the head, or of each segment
+            segments: Number of segments in "segments" mode
+            max_full_seconds: Files up to this long are analyzed whole in every mode
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown analysis window mode: {mode}")
+        if seconds <= 0 or segments < 1:
+            raise ValueError("Analysis window needs a positive length and at least one segment")
+        self.mode = mode
+        self.seconds = float(seconds)
+        self.segments = int(segments)
+        self.max_full_seconds = float(max_full_seconds)
+    
+    def __repr__(self) -> str:
+        return f"AnalysisWindowPolicy({self.to_dict()})"
+    
+    def to_dict(self) -> Dict:
+        """Settings as plain data (e.g. to configure analysis worker processes)."""
+        return {
+            "mode": self.mode,
+            "seconds": self.seconds,
+            "segments": self.segments,
+            "max_full_seconds": self.max_full_seconds
+        }
+    
+    @classmethod
+    def from_dict(cls, settings: Optional[Dict]) -> "AnalysisWindowPolicy":
+        """Policy from to_dict output; None gives the default policy."""
+        return cls(**settings) if settings else cls()
+    
+    def ranges(self, total_samples: int, sr: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Sample ranges to analyze in a signal.
+        
+        Args:
+            total_samples: Length of the signal
+            sr: Sample rate of the signal
+        
+        Returns:
+            Sorted, non-overlapping (start, end) ranges, or None for the whole signal
+        """
+        if self.mode == self.FULL or total_samples <= self.max_full_seconds * sr:
+            return None
+        
+        length = int(self.seconds * sr)
+        count = 1 if self.mode == self.HEAD else self.segments
+        if length * count >= total_samples:
+            return None
+        
+        if self.mode == self.HEAD:
+            return [(0, length)]
+        
+        # Segments centred on evenly spaced points: 1/2K, 3/2K, ... of the signal
+        ranges: List[Tuple[int, int]] = []
+        for i in range(count):
+            start = int((i + 0.5) * total_samples / count) - length // 2
+            start = min(max(0, start), total_samples - length)
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1] = (ranges[-1][0], start + length)
+            else:
+                ranges.append((start, start + length))
+        return ranges
+    
+    def apply(self, y: np.ndarray, sr: int) -> np.ndarray:
+        """Cut a loaded signal to the policy's window (the signal itself if it is analyzed whole)."""
+        ranges = self.ranges(len(y), sr)
+        if ranges is None:
+            return y
+        return np.concatenate([y[start:end] for start, end in ranges])
+    
+    def describe(self, duration: float) -> Dict:
+        """
+        The window an analysis of a file of this length uses, as recorded in
+        the analysis result. Analyses with equal descriptions are comparable.
+        
+        Args:
+            duration: File duration in seconds
+        """
+        if self.ranges(int(round(duration * 1000)), 1000) is None:
+            return dict(FULL_WINDOW)
+        window = {"mode": self.mode, "seconds": self.seconds}
+        if self.mode == self.SEGMENTS:
+            window["segments"] = self.segments
+        return window
@@ -0,0 +1,204 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class AttributeColumns:
+    """
+    Columnar copy of the numeric and categorical sample attributes.
+    Each attribute is a NumPy array indexed by a slot per sample, so range and
+    equality filters become vectorized boolean masks and ordering uses argsort
+    instead of looping over analysis dicts. Text attributes are dictionary
+    encoded as integer codes.
+    
+    The columns are loaded from the library store on first use and then kept
+    in step through the store's change notifications.
+    """
+    
+    # Numeric attributes: column -> (location in the analysis, value when missing).
+    # bpm and confidence default to 0 like the dict-based filters did; the
+    # characteristics default to NaN so range filters never match them.
+    NUMERIC = {
+        "bpm": (("bpm",), 0.0),
+        "duration": (("duration",), np.nan),
+        "overall_confidence": (("overall_confidence",), 0.0),
+        "rms_mean": (("characteristics", "rms_mean"), np.nan),
+        "spectral_centroid": (("characteristics", "spectral_centroid"), np.nan),
+        # Native file format, read from the header at indexing time
+        "file_sample_rate": (("audio_format", "sample_rate"), np.nan),
+        "channels": (("audio_format", "channels"), np.nan),
+        "bit_depth": (("audio_format", "bit_depth"), np.nan)
+    }
+    
+    # Text attributes stored as codes (-1 when missing)
+    CODED = ("category", "key", "sample_type")
+    
+    def __init__(self, library_store, initial_capacity: int = 1024):
+        """
+        Args:
+            library_store: SampleLibraryStore the columns mirror
+            initial_capacity: Slots allocated before the first growth
+        """
+        self.library_store = library_store
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._initial_capacity = initial_capacity
+        self._reset(initial_capacity)
+        
+        library_store.add_change_listener(self)
+    
+    def _reset(self, capacity: int):
+        """Drop all rows and allocate empty columns."""
+        self._size = 0  # High-water mark of used slots
+        self._keys: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._columns: Dict[str, np.ndarray] = {name: np.full(capacity, np.nan) for name in self.NUMERIC}
+        self._columns.update({name: np.full(capacity, -1, dtype=np.int32) for name in self.CODED})
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in self.CODED}
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._slots)
+    
+    # Loading and maintenance
+    
+    def _ensure_loaded(self):
+        """Load every sample's attributes from the store. Caller holds the lock."""
+        if self._loaded:
+            return
+        
+        rows = list(self.library_store.iter_attribute_rows(
+            [path for path, _ in self.NUMERIC.values()] + [(name,) for name in self.CODED]
+        ))
+        self._reset(max(self._initial_capacity, len(rows)))
+        for row in rows:
+            self._set_row(row[0], row[1:])
+        self._loaded = True
+        logger.info(f"Loaded attribute columns for {len(rows)} samples")
+    
+    def _row_from_analysis(self, analysis: Dict) -> Tuple:
+        """Extract the column values of one analysis dict."""
+        values = []
+        for path, _ in self.NUMERIC.values():
+            value = analysis
+            for part in path:
+                value = value.get(part) if isinstance(value, dict) else None
+            values.append(value)
+        values.extend(analysis.get(name) for name in self.CODED)
+        return tuple(values)
+    
+    def _set_row(self, file_key: str, values: Tuple):
+        """Write one sample's values into its slot, allocating one if needed."""
+        slot = self._slots.get(file_key)
+        if slot is None:
+            slot = self._free.pop() if self._free else self._grow()
+            self._slots[file_key] = slot
+            self._keys[slot] = file_key
+        
+        numeric_count = len(self.NUMERIC)
+        for (name, (_, missing)), value in zip(self.NUMERIC.items(), values[:numeric_count]):
+            try:
+                self._columns[name][slot] = missing if value is None else float(value)
+            except (TypeError, ValueError):
+                self._columns[name][slot] = missing
+        for name, value in zip(self.CODED, values[numeric_count:]):
+            self._columns[name][slot] = self._code(name, value)
+        self._alive[slot] = True
+    
+    def _grow(self) -> int:
+        """Append a slot, doubling the column capacity when full."""
+        slot = self._size
+        if slot >= len(self._alive):
+            capacity = max(1, len(self._alive)) * 2
+            self._alive = np.resize(self._alive, capacity)
+            self._alive[slot:] = False
+            for name, column in self._columns.items():
+                grown = np.resize(column, capacity)
+                grown[slot:] = -1 if name in self.CODED else np.nan
+                self._columns[name] = grown
+        self._size += 1
+        self._keys.append(None)
+        return slot
+    
+    def _code(self, name: str, value) -> int:
+        """Dictionary code of a text value (-1 when missing)."""
+        if value is None:
+            return -1
+        codes = self._codes[name]
+        return codes.setdefault(str(value), len(codes))
+    
+    def samples_written(self, items: Iterable[Tuple[str, Dict]]):
+        """Store notification: analyses were inserted or replaced."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for file_key, analysis in items:
+                self._set_row(file_key, self._row_from_analysis(analysis))
+    
+    def samples_deleted(self, file_keys: Iterable[str]):
+        """Store notification: analyses were deleted."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for file_key in file_keys:
+                if (slot := self._slots.pop(file_key, None)) is not None:
+                    self._alive[slot] = False
+                    self._keys[slot] = None
+                    self._free.append(slot)
+    
+    def samples_cleared(self):
+        """Store notification: every analysis was deleted."""
+        with self._lock:
+            if self._loaded:
+                self._reset(self._initial_capacity)
+    
+    # Queries
+    
+    def query(self, equals: Optional[Dict[str, str]] = None,
+              ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              sort_by: Optional[str] = "overall_confidence", descending: bool = True,
+              limit: Optional[int] = None) -> List[str]:
+        """
+        Filter samples with vectorized masks and order the survivors.
+        
+        Args:
+            equals: Text attribute -> required value (exact match)
+            ranges: Numeric attribute -> inclusive (low, high); None leaves a side open
+            sort_by: Numeric attribute to order by, or None to keep slot order
+            descending: Sort from the highest value down
+            limit: Maximum number of results
+        
+        Returns:
+            Matching file keys in the requested order
+        """
+        with self._lock:
+            self._ensure_loaded()
+            size = self._size
+            mask = self._alive[:size].copy()
+            
+            for name, value in (equals or {}).items():
+                if (code := self._codes[name].get(str(value))) is None:
+                    return []
+                mask &= self._columns[name][:size] == code
+            
+            for name, (low, high) in (ranges or {}).items():
+                column = self._columns[name][:size]
+                if low is not None:
+                    mask &= column >= low
+                if high is not None:
+                    mask &= column <= high
+            
+            slots = np.flatnonzero(mask)
+            if sort_by is not None and len(slots):
+                values = self._columns[sort_by][slots]
+                slots = slots[np.argsort(-values if descending else values, kind="stable")]
+            if limit is not None:
+                slots = slots[:limit]
+            return [self._keys[slot] for slot in slots]
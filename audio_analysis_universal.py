@@ -4,6 +4,15 @@ import logging
 import numpy as np
 from typing import Dict, Union, Tuple, List, Optional
 
+from analysis_backends import BackendLoader
+from spectral_features import SpectralFeatureContext
+from audio_embedding import EMBEDDING_VERSION, compute_embedding
+from perceptual_hash import PERCEPTUAL_HASH_VERSION, compute_perceptual_hash
+from streaming_audio import AudioSummary, stream_audio
+from analysis_window import AnalysisWindowPolicy
+from keyword_matcher import CATEGORY_KEYWORDS, DRUM_TYPE_KEYWORDS, keyword_matcher
+from startup_tracer import startup_tracer
+
 # Set environment variables early for AMD compatibility
 os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
@@ -104,8 +113,9 @@ class UniversalAudioAnalyzer:
     """
     
     def __init__(self):
-        # Detect CPU and configure accordingly
-        self.cpu_detector = CPUDetector()
+        # Detect CPU and configure accordingly (py-cpuinfo can take a second)
+        with startup_tracer.phase("CPUDetector"):
+            self.cpu_detector = CPUDetector()
         self.config = self.cpu_detector.get_recommended_config()
         
         # Cache expensive CPU brand lookup
@@ -122,34 +132,36 @@ class UniversalAudioAnalyzer:
         self.sr = 22050
         self.hop_length = 512
         
-        # Category classification mappings
-        self.category_keywords = {
-            'Bass': ['bass', '808', 'sub', 'low'],
-            'Drums': ['kick', 'snare', 'hat', 'hh', 'cymbal', 'perc', 'drum', 'clap', 'tom', 'rim', 'crash', 'ride'],
-            'FX': ['fx', 'effect', 'sweep', 'riser', 'impact', 'ambient', 'foley'],
-            'Melodic': ['lead', 'melody', 'synth', 'key', 'pad', 'pluck', 'chord'],
-            'Vocals': ['vocal', 'voice', 'chop', 'phrase', 'word']
-        }
+        # Files at least this long are decoded block by block, with whole-file
+        # summaries gathered on the way (bounded memory, linear resampling)
+        self.streaming_min_seconds = 30.0
         
-        # Improved drum type detection with separated hi-hat types
-        self.drum_type_keywords = {
-            'kick': ['kick', 'bd', 'bassdrum'],
-            'snare': ['snare', 'sd'],
-            'clap': ['clap', 'handclap'],
-            'closed_hihat': ['closed hat', 'closehat', 'closed_hat', 'chh', 'cl hat', 'clhat', 'close hat'],
-            'open_hihat': ['open hat', 'openhat', 'open_hat', 'ohh', 'op hat', 'ophat'],
-            'hihat': ['hat', 'hh', 'hihat', 'hi-hat', 'hi_hat'],  # Generic hi-hat fallback
-            'cymbal': ['cymbal', 'crash', 'ride', 'splash'],
-            'percussion': ['perc', 'shaker', 'tambourine', 'conga', 'tom', 'rim']
-        }
+        # How much of a long file the frame features look at (see set_analysis_window)
+        self.analysis_window = AnalysisWindowPolicy()
+        
+        # Category and drum type keywords (compiled into the shared keyword_matcher)
+        self.category_keywords = CATEGORY_KEYWORDS
+        self.drum_type_keywords = DRUM_TYPE_KEYWORDS
         
         # Key profiles for key detection
         self.key_profiles = self._initialize_key_profiles()
         
         logger.info(f"UniversalAudioAnalyzer initialized for {self.config['cpu_type']} CPU")
     
+    # Backends imported before the first analysis (tensorflow is only probed:
+    # no analysis path uses it, and importing it takes seconds)
+    ANALYSIS_BACKENDS = ('librosa', 'aubio')
+    
     def _initialize_analyzers(self):
-        """Initialize available analyzers based on CPU capabilities."""
+        """
+        Probe the available analyzers based on CPU capabilities.
+        Backends are only looked up here; they are imported by
+        ensure_backends_loaded (or preload_backends) so that constructing
+        the analyzer does not pay for importing librosa and friends.
+        """
+        self.backends = BackendLoader({'librosa': 'librosa', 'aubio': 'aubio', 'tensorflow': 'tensorflow'})
+        self._backends_ready = False
+        
         self.available_methods = {
             'librosa': False,
             'aubio': False,
@@ -157,37 +169,28 @@ class UniversalAudioAnalyzer:
             'safe_fallback': True
         }
         
-        # Try to import libraries based on CPU capabilities
-        if self.config['use_librosa']:
-            try:
-                import librosa
-                self.available_methods['librosa'] = True
-                logger.info("✓ librosa available")
-            except Exception as e:
-                logger.warning(f"librosa not available: {e}")
-        
-        if self.config['use_aubio']:
-            try:
-                import aubio
-                self.available_methods['aubio'] = True
-                logger.info("✓ aubio available")
-            except Exception as e:
-                logger.warning(f"aubio not available: {e}")
-        
-        if self.config['use_tensorflow']:
-            try:
-                import tensorflow as tf
-                tf.get_logger().setLevel('ERROR')
-                self.available_methods['tensorflow'] = True
-                logger.info("✓ tensorflow available")
-            except Exception as e:
-                logger.warning(f"tensorflow not available: {e}")
+        for name in ('librosa', 'aubio', 'tensorflow'):
+            if self.config[f'use_{name}'] and self.backends.probe(name):
+                self.available_methods[name] = True
+                logger.info(f"✓ {name} found")
         
         # Always have safe fallback
-        import numpy as np
-        import soundfile as sf
         logger.info("✓ safe fallback methods available")
     
+    def ensure_backends_loaded(self):
+        """Import the probed analysis backends (once); drop any that fail to import."""
+        if self._backends_ready:
+            return
+        for name in self.ANALYSIS_BACKENDS:
+            if self.available_methods[name] and self.backends.load(name) is None:
+                self.available_methods[name] = False
+        self._backends_ready = True
+    
+    def preload_backends(self):
+        """Import the analysis backends on a background thread, ahead of the first analysis."""
+        names = [name for name in self.ANALYSIS_BACKENDS if self.available_methods[name]]
+        return self.backends.preload(names)
+    
     def _initialize_key_profiles(self) -> Dict:
         """Initialize key profiles for key detection."""
         import numpy as np
@@ -213,14 +216,20 @@ class UniversalAudioAnalyzer:
         try:
             logger.info(f"Starting universal analysis of: {file_path}")
             
+            # Import librosa/aubio on the first analysis (no-op once loaded)
+            self.ensure_backends_loaded()
+            
             # Load audio using the best available method
-            y, sr = self._load_audio_universal(file_path)
+            y, sr, summary = self._load_audio_universal(file_path)
+            
+            # Spectral features shared by every classifier below (computed once, on demand)
+            features = SpectralFeatureContext(y, sr, self.hop_length, summary)
             
-            # Get basic properties
-            duration = len(y) / sr
+            # Get basic properties (of the whole file, even if y is only its analysis window)
+            duration = features.duration
             
             # Perform analysis using available methods
-            category = self._classify_category_universal(file_path, y, sr)
+            category = self._classify_category_universal(file_path, y, sr, features)
             
             result = {
                 "file_path": file_path,
@@ -228,13 +237,14 @@ class UniversalAudioAnalyzer:
                 "sample_rate": sr,
                 "cpu_type": self.config['cpu_type'],
                 "analysis_methods": [k for k, v in self.available_methods.items() if v],
+                "analysis_window": self.analysis_window.describe(duration),
                 
                 # Universal analysis
-                "sample_type": self._determine_sample_type_universal(y, sr),
+                "sample_type": self._determine_sample_type_universal(y, sr, features),
                 "category": category,
-                "bpm": self._detect_bpm_universal(y, sr),
-                "key": self._detect_key_universal(y, sr),
-                "characteristics": self._analyze_characteristics_universal(y, sr),
+                "bpm": self._detect_bpm_universal(y, sr, features),
+                "key": self._detect_key_universal(y, sr, features),
+                "characteristics": self._analyze_characteristics_universal(y, sr, features),
                 
                 "confidence_scores": {},
                 "error": None
@@ -242,15 +252,30 @@ class UniversalAudioAnalyzer:
             
             # Add hi-hat subcategory classification if it's a drum sample with hi-hat keywords
             if category.lower() == "drums":
-                file_lower = file_path.lower()
-                hihat_keywords = ['hat', 'hh', 'hihat', 'hi-hat', 'hi_hat', 'closed hat', 'closehat', 'closed_hat', 
-                                'chh', 'cl hat', 'clhat', 'close hat', 'open hat', 'openhat', 'open_hat', 
-                                'ohh', 'op hat', 'ophat']
+                hits = keyword_matcher.scan(file_path)
                 
-                if any(keyword in file_lower for keyword in hihat_keywords):
-                    hihat_type = self._classify_hihat_type(y, sr, file_path)
+                if any(hits.matches('drum_type', hihat) for hihat in ('hihat', 'closed_hihat', 'open_hihat')):
+                    hihat_type = self._classify_hihat_type(y, sr, file_path, features)
                     result["hihat_subcategory"] = hihat_type
             
+            # Timbre embedding and perceptual hash describe the analysis window
+            # alone (no whole-file summaries), the same way for every file length
+            window_features = SpectralFeatureContext(y, sr, self.hop_length) if summary is not None else features
+            
+            # Timbre embedding for similarity search
+            try:
+                result["embedding"] = compute_embedding(window_features)
+                result["embedding_version"] = EMBEDDING_VERSION
+            except Exception as e:
+                logger.warning(f"Embedding extraction failed for {file_path}: {e}")
+            
+            # Perceptual hash for duplicate detection
+            try:
+                result["perceptual_hash"] = compute_perceptual_hash(y, sr, self.hop_length)
+                result["perceptual_hash_version"] = PERCEPTUAL_HASH_VERSION
+            except Exception as e:
+                logger.warning(f"Perceptual hash failed for {file_path}: {e}")
+            
             # Calculate overall confidence
             result["overall_confidence"] = self._calculate_confidence_universal(result)
             
@@ -272,63 +297,77 @@ class UniversalAudioAnalyzer:
                 "error": str(e)
             }
     
-    def _load_audio_universal(self, file_path: str) -> Tuple[np.ndarray, int]:
-        """Load audio using the best available method."""
-        import numpy as np
+    def set_analysis_window(self, policy: AnalysisWindowPolicy):
+        """
+        Change how much of long files is analyzed.
+        Results record the window they used, so cached analyses made under
+        a different policy are not reused (see the sample manager).
+        """
+        self.analysis_window = policy
+        logger.info(f"Analysis window: {policy}")
+    
+    def _load_audio_universal(self, file_path: str) -> Tuple[np.ndarray, int, Optional[AudioSummary]]:
+        """
+        Load audio using the best available method, cut to the analysis window.
+        
+        Returns:
+            (signal, sample rate, summary) where summary holds the whole-file
+            summaries of a streamed or windowed file and is None otherwise
+        """
         import soundfile as sf
         
+        # Long files are streamed: decoding them whole costs hundreds of MB
+        try:
+            info = sf.info(file_path)
+        except Exception:
+            info = None  # Not readable by soundfile (e.g. some compressed formats)
+        if info is not None and info.duration >= self.streaming_min_seconds:
+            # Only the window is kept; the summary still covers the whole file
+            keep = self.analysis_window.ranges(int(info.frames * self.sr / info.samplerate), self.sr)
+            y, summary = stream_audio(file_path, self.sr, self.hop_length, keep=keep)
+            return y, self.sr, summary
+        
         # Try librosa first if available and safe
+        y = None
         if self.available_methods['librosa'] and self.config['use_advanced_features']:
             try:
                 import librosa
                 y, sr = librosa.load(file_path, sr=self.sr)
-                return y, sr
             except Exception as e:
                 logger.warning(f"librosa load failed, falling back to soundfile: {e}")
         
-        # Fallback to soundfile
-        y, sr_original = sf.read(file_path)
+        # Fallback to soundfile, downmixed and resampled block by block
+        if y is None:
+            y, _ = stream_audio(file_path, self.sr, self.hop_length)
+            sr = self.sr
         
-        # Convert to mono if stereo
-        if len(y.shape) > 1:
-            y = np.mean(y, axis=1)
+        if self.analysis_window.ranges(len(y), sr) is None:
+            return y, sr, None
         
-        # Simple resampling if needed
-        if sr_original != self.sr:
-            y = self._simple_resample(y, sr_original, self.sr)
-        
-        return y, self.sr
-    
-    def _simple_resample(self, y: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
-        """Simple resampling using linear interpolation."""
-        import numpy as np
-        
-        if orig_sr == target_sr:
-            return y
-        
-        ratio = target_sr / orig_sr
-        old_indices = np.arange(len(y))
-        new_length = int(len(y) * ratio)
-        new_indices = np.linspace(0, len(y) - 1, new_length)
-        
-        return np.interp(new_indices, old_indices, y)
+        # Summarize the whole signal before cutting it to the window
+        summary = AudioSummary(sr, self.hop_length)
+        summary.update(y.astype(np.float32, copy=False))
+        summary.finish()
+        return self.analysis_window.apply(y, sr), sr, summary
     
-    def _determine_sample_type_universal(self, y: np.ndarray, sr: int) -> str:
+    def _determine_sample_type_universal(self, y: np.ndarray, sr: int,
+                                         features: Optional[SpectralFeatureContext] = None) -> str:
         """Universal sample type detection using multiple methods."""
+        features = features or SpectralFeatureContext(y, sr, self.hop_length)
         methods_results = []
         
         # Method 1: Safe energy analysis (always available)
-        energy_result = self._sample_type_energy_safe(y)
+        energy_result = self._sample_type_energy_safe(y, features)
         methods_results.append(energy_result)
         
         # Method 2: Safe onset detection (always available)
-        onset_result = self._sample_type_onset_safe(y)
+        onset_result = self._sample_type_onset_safe(y, features)
         methods_results.append(onset_result)
         
         # Method 3: librosa-based (if available and safe)
         if self.available_methods['librosa'] and self.config['use_advanced_features']:
             try:
-                librosa_result = self._sample_type_librosa_safe(y, sr)
+                librosa_result = self._sample_type_librosa_safe(y, sr, features)
                 methods_results.append(librosa_result)
             except Exception as e:
                 logger.warning(f"librosa sample type detection failed: {e}")
@@ -351,26 +390,19 @@ class UniversalAudioAnalyzer:
             return "loop"
         else:
             # Tie-breaker: use duration
-            duration = len(y) / sr
+            duration = features.duration
             return "one-shot" if duration < 2.0 else "loop"
     
-    def _sample_type_energy_safe(self, y: np.ndarray) -> str:
+    def _sample_type_energy_safe(self, y: np.ndarray, features: Optional[SpectralFeatureContext] = None) -> str:
         """Safe energy-based sample type detection."""
         import numpy as np
         
-        window_size = self.hop_length
-        rms_values = []
-        
-        for i in range(0, len(y) - window_size, window_size):
-            window = y[i:i + window_size]
-            rms = np.sqrt(np.mean(window**2))
-            rms_values.append(rms)
+        features = features or SpectralFeatureContext(y, self.sr, self.hop_length)
+        rms_values = features.frame_energy.rms
         
         if len(rms_values) < 2:
             return "one-shot"
         
-        rms_values = np.array(rms_values)
-        
         # Check for fade-out
         end_portion = rms_values[-int(len(rms_values) * 0.3):]
         start_portion = rms_values[:int(len(rms_values) * 0.3)]
@@ -383,40 +415,29 @@ class UniversalAudioAnalyzer:
         
         return "one-shot" if end_energy < start_energy * 0.4 else "loop"
     
-    def _sample_type_onset_safe(self, y: np.ndarray) -> str:
+    def _sample_type_onset_safe(self, y: np.ndarray, features: Optional[SpectralFeatureContext] = None) -> str:
         """Safe onset-based sample type detection."""
         import numpy as np
         
-        window_size = self.hop_length
-        energy_diff = []
-        prev_energy = 0
-        
-        for i in range(0, len(y) - window_size, window_size):
-            window = y[i:i + window_size]
-            energy = np.sum(window**2)
-            
-            if i > 0:
-                diff = max(0, energy - prev_energy)
-                energy_diff.append(diff)
-            
-            prev_energy = energy
+        features = features or SpectralFeatureContext(y, self.sr, self.hop_length)
+        energy_diff = features.frame_energy.flux
         
         if len(energy_diff) == 0:
             return "one-shot"
         
-        energy_diff = np.array(energy_diff)
         threshold = np.mean(energy_diff) + 2 * np.std(energy_diff)
         onsets = np.where(energy_diff > threshold)[0]
         
         return "one-shot" if len(onsets) <= 2 else "loop"
     
-    def _sample_type_librosa_safe(self, y: np.ndarray, sr: int) -> str:
+    def _sample_type_librosa_safe(self, y: np.ndarray, sr: int,
+                                  features: Optional[SpectralFeatureContext] = None) -> str:
         """Safe librosa-based sample type detection."""
         try:
             import librosa
             
             # Use only safe librosa functions
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+            onset_env = (features or SpectralFeatureContext(y, sr, self.hop_length)).onset_envelope
             onsets = librosa.onset.onset_detect(onset_envelope=onset_env, sr=sr)
             
             return "one-shot" if len(onsets) <= 2 else "loop"
@@ -455,8 +476,10 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Safe aubio analysis failed: {e}")
             return "one-shot"
     
-    def _classify_category_universal(self, file_path: str, y: np.ndarray, sr: int) -> str:
+    def _classify_category_universal(self, file_path: str, y: np.ndarray, sr: int,
+                                     features: Optional[SpectralFeatureContext] = None) -> str:
         """Universal category classification with improved drum detection."""
+        features = features or SpectralFeatureContext(y, sr, self.hop_length)
         methods_results = []
         
         # Method 1: Enhanced filename analysis
@@ -464,13 +487,13 @@ class UniversalAudioAnalyzer:
         methods_results.append(filename_result)
         
         # Method 2: Safe frequency analysis
-        frequency_result = self._classify_by_frequency_safe(y, sr)
+        frequency_result = self._classify_by_frequency_safe(y, sr, features)
         methods_results.append(frequency_result)
         
         # Method 3: Enhanced spectral analysis
         if self.available_methods['librosa'] and self.config['use_advanced_features']:
             try:
-                spectral_result = self._classify_by_spectral_features_enhanced(y, sr)
+                spectral_result = self._classify_by_spectral_features_enhanced(y, sr, features)
                 methods_results.append(spectral_result)
             except Exception as e:
                 logger.warning(f"Enhanced spectral analysis failed: {e}")
@@ -485,48 +508,33 @@ class UniversalAudioAnalyzer:
             return max(category_votes, key=category_votes.get)
         
         # Fallback: if no clear category, try to infer from audio characteristics
-        return self._fallback_classification(y, sr)
+        return self._fallback_classification(y, sr, features)
 
     def _classify_by_filename_enhanced(self, file_path: str) -> str:
         """Enhanced filename classification with better drum detection."""
-        path_lower = file_path.lower()
+        hits = keyword_matcher.scan(file_path)
         
         # First check for specific drum types
-        for drum_type, keywords in self.drum_type_keywords.items():
-            if any(keyword in path_lower for keyword in keywords):
-                return "Drums"
+        if hits.any('drum_type'):
+            return "Drums"
         
         # Then check general categories
-        for category, keywords in self.category_keywords.items():
-            if any(keyword in path_lower for keyword in keywords):
-                return category
-        
-        return "unknown"
+        return hits.first('category', "unknown")
 
-    def _classify_by_frequency_safe(self, y: np.ndarray, sr: int) -> str:
+    def _classify_by_frequency_safe(self, y: np.ndarray, sr: int,
+                                    features: Optional[SpectralFeatureContext] = None) -> str:
         """Safe frequency content analysis with kick vs 808 detection."""
         import numpy as np
         
         try:
-            fft = np.fft.fft(y)
-            magnitude = np.abs(fft)
-            freqs = np.fft.fftfreq(len(y), 1/sr)
-            
-            positive_freqs = freqs[:len(freqs)//2]
-            positive_magnitude = magnitude[:len(magnitude)//2]
+            features = features or SpectralFeatureContext(y, sr, self.hop_length)
             
             # Calculate energy in frequency bands
-            sub_bass_mask = positive_freqs < 100    # Sub-bass (808 territory)
-            bass_mask = (positive_freqs >= 100) & (positive_freqs < 250)    # Bass/kick fundamentals
-            low_mid_mask = (positive_freqs >= 250) & (positive_freqs < 1000)  # Low mids
-            mid_mask = (positive_freqs >= 1000) & (positive_freqs < 4000)     # Mids
-            high_mask = positive_freqs >= 4000      # Highs
-            
-            sub_bass_energy = np.sum(positive_magnitude[sub_bass_mask])
-            bass_energy = np.sum(positive_magnitude[bass_mask])
-            low_mid_energy = np.sum(positive_magnitude[low_mid_mask])
-            mid_energy = np.sum(positive_magnitude[mid_mask])
-            high_energy = np.sum(positive_magnitude[high_mask])
+            sub_bass_energy = features.band_energy(None, 100)    # Sub-bass (808 territory)
+            bass_energy = features.band_energy(100, 250)         # Bass/kick fundamentals
+            low_mid_energy = features.band_energy(250, 1000)     # Low mids
+            mid_energy = features.band_energy(1000, 4000)        # Mids
+            high_energy = features.band_energy(4000, None)       # Highs
             
             total_energy = sub_bass_energy + bass_energy + low_mid_energy + mid_energy + high_energy
             
@@ -541,28 +549,25 @@ class UniversalAudioAnalyzer:
             # Enhanced classification with better hi-hat detection
             if low_freq_ratio > 0.6:  # Dominant low frequency content
                 # Use enhanced kick vs 808 detection for low frequency samples
-                duration = len(y) / sr
+                duration = features.duration
                 
                 # Simple heuristics for when librosa isn't available
-                # Calculate spectral centroid manually
-                if np.sum(positive_magnitude) > 0:
-                    spectral_centroid = np.sum(positive_freqs * positive_magnitude) / np.sum(positive_magnitude)
-                else:
-                    spectral_centroid = 0
+                # Spectral centroid of the full spectrum
+                spectral_centroid = features.fft_centroid
                 
                 # Simple onset detection
-                onset_strength = self._estimate_onset_strength_safe(y)
+                onset_strength = self._estimate_onset_strength_safe(y, features)
                 
                 # Use the kick vs 808 classifier
-                if self._is_kick_vs_808(y, sr, duration, onset_strength, spectral_centroid):
+                if self._is_kick_vs_808(y, sr, duration, onset_strength, spectral_centroid, features):
                     return "Drums"  # Likely a kick
                 else:
                     return "Bass"   # Likely an 808 or bass
             elif high_ratio > 0.4:
                 # Check if this might be a hi-hat before classifying as FX
                 # Hi-hats often have high frequency content but short duration and sharp transients
-                duration = len(y) / sr
-                onset_strength = self._estimate_onset_strength_safe(y)
+                duration = features.duration
+                onset_strength = self._estimate_onset_strength_safe(y, features)
                 
                 # Hi-hats are typically short (< 1 second) with strong onsets
                 if duration < 1.0 and onset_strength > 0.3:
@@ -578,62 +583,52 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Frequency analysis failed: {e}")
             return "unknown"
     
-    def _estimate_onset_strength_safe(self, y: np.ndarray) -> float:
+    def _estimate_onset_strength_safe(self, y: np.ndarray, features: Optional[SpectralFeatureContext] = None) -> float:
         """Estimate onset strength without librosa."""
         import numpy as np
         
         try:
             # Simple energy-based onset detection
-            window_size = self.hop_length
-            energy_diff = []
-            prev_energy = 0
-            
-            for i in range(0, len(y) - window_size, window_size):
-                window = y[i:i + window_size]
-                energy = np.sum(window**2)
-                
-                if i > 0:
-                    diff = max(0, energy - prev_energy)
-                    energy_diff.append(diff)
-                
-                prev_energy = energy
+            features = features or SpectralFeatureContext(y, self.sr, self.hop_length)
+            energy_diff = features.frame_energy.flux
             
             if len(energy_diff) == 0:
                 return 0.0
             
             # Normalize and return average onset strength
-            energy_diff = np.array(energy_diff)
             return float(np.mean(energy_diff)) if len(energy_diff) > 0 else 0.0
             
         except Exception as e:
             logger.warning(f"Safe onset strength estimation failed: {e}")
             return 0.0
     
-    def _classify_by_spectral_features_enhanced(self, y: np.ndarray, sr: int) -> str:
+    def _classify_by_spectral_features_enhanced(self, y: np.ndarray, sr: int,
+                                                features: Optional[SpectralFeatureContext] = None) -> str:
         """Enhanced spectral features analysis with improved kick vs 808 detection."""
         try:
-            import librosa
             import numpy as np
             
-            # Calculate multiple features
-            spectral_centroid = np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))
-            zero_crossing_rate = np.mean(librosa.feature.zero_crossing_rate(y))
-            spectral_rolloff = np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr))
+            features = features or SpectralFeatureContext(y, sr, self.hop_length)
+            
+            # Calculate multiple features (all derived from one shared STFT)
+            spectral_centroid = np.mean(features.spectral_centroid)
+            zero_crossing_rate = np.mean(features.zero_crossing_rate)
+            spectral_rolloff = np.mean(features.spectral_rolloff)
             
             # Calculate additional features for better classification
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+            mfccs = features.mfcc
             mfcc_mean = np.mean(mfccs, axis=1)
             
             # Calculate onset strength for percussive detection
-            onset_strength = np.mean(librosa.onset.onset_strength(y=y, sr=sr))
+            onset_strength = np.mean(features.onset_envelope)
             
             # Duration for kick vs 808 distinction
-            duration = len(y) / sr
+            duration = features.duration
             
             # Enhanced classification with kick vs 808 distinction and better hi-hat detection
             if spectral_centroid < 600:  # Very low frequency content
                 # Distinguish between kicks and 808s based on multiple factors
-                if self._is_kick_vs_808(y, sr, duration, onset_strength, spectral_centroid):
+                if self._is_kick_vs_808(y, sr, duration, onset_strength, spectral_centroid, features):
                     return "Drums"  # This is likely a kick
                 else:
                     return "Bass"   # This is likely an 808 or bass
@@ -660,7 +655,8 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Enhanced spectral features analysis failed: {e}")
             return "unknown"
     
-    def _is_kick_vs_808(self, y: np.ndarray, sr: int, duration: float, onset_strength: float, spectral_centroid: float) -> bool:
+    def _is_kick_vs_808(self, y: np.ndarray, sr: int, duration: float, onset_strength: float, spectral_centroid: float,
+                        features: Optional[SpectralFeatureContext] = None) -> bool:
         """Determine if a low-frequency sample is a kick drum vs an 808/bass.
         
         Returns True if it's likely a kick, False if it's likely an 808/bass.
@@ -711,16 +707,11 @@ class UniversalAudioAnalyzer:
             
             # Factor 5: Harmonic content analysis
             # 808s often have more sustained harmonics
-            fft = np.fft.fft(y)
-            magnitude = np.abs(fft)
-            freqs = np.fft.fftfreq(len(y), 1/sr)
-            
-            positive_freqs = freqs[:len(freqs)//2]
-            positive_magnitude = magnitude[:len(magnitude)//2]
+            features = features or SpectralFeatureContext(y, sr, self.hop_length)
             
             # Check for harmonic peaks (808s often have multiple harmonics)
-            sub_bass_energy = np.sum(positive_magnitude[positive_freqs < 100])
-            bass_energy = np.sum(positive_magnitude[(positive_freqs >= 100) & (positive_freqs < 250)])
+            sub_bass_energy = features.band_energy(None, 100)
+            bass_energy = features.band_energy(100, 250)
             
             total_low_energy = sub_bass_energy + bass_energy
             if total_low_energy > 0:
@@ -738,39 +729,35 @@ class UniversalAudioAnalyzer:
             # Fallback: short duration = kick, long = 808
             return duration < 2.0
     
-    def _classify_hihat_type(self, y: np.ndarray, sr: int, file_path: str) -> str:
+    def _classify_hihat_type(self, y: np.ndarray, sr: int, file_path: str,
+                             features: Optional[SpectralFeatureContext] = None) -> str:
         """Classify whether a hi-hat is closed or open based on audio characteristics and filename."""
         try:
             import numpy as np
             
             # First check filename for explicit indicators
-            file_lower = file_path.lower()
+            hits = keyword_matcher.scan(file_path)
             
             # Check for explicit closed hi-hat indicators
-            closed_keywords = ['closed hat', 'closehat', 'closed_hat', 'chh', 'cl hat', 'clhat', 'close hat']
-            if any(keyword in file_lower for keyword in closed_keywords):
+            if hits.matches('drum_type', 'closed_hihat'):
                 return "Closed Hi-Hats"
             
             # Check for explicit open hi-hat indicators
-            open_keywords = ['open hat', 'openhat', 'open_hat', 'ohh', 'op hat', 'ophat']
-            if any(keyword in file_lower for keyword in open_keywords):
+            if hits.matches('drum_type', 'open_hihat'):
                 return "Open Hi-Hats"
             
             # If no explicit indicators, analyze audio characteristics
-            duration = len(y) / sr
+            features = features or SpectralFeatureContext(y, sr, self.hop_length)
+            duration = features.duration
             
             # Calculate spectral characteristics
-            fft = np.fft.fft(y)
-            magnitude = np.abs(fft)
-            freqs = np.fft.fftfreq(len(y), 1/sr)
-            
-            positive_freqs = freqs[:len(freqs)//2]
-            positive_magnitude = magnitude[:len(magnitude)//2]
+            positive_freqs = features.positive_freqs
+            positive_magnitude = features.positive_magnitude
             
             # Energy in different frequency bands
             high_freq_energy = np.sum(positive_magnitude[positive_freqs > 8000])  # Very high frequencies
             mid_high_energy = np.sum(positive_magnitude[(positive_freqs >= 4000) & (positive_freqs <= 8000)])
-            total_energy = np.sum(positive_magnitude)
+            total_energy = features.total_magnitude
             
             if total_energy == 0:
                 return "Closed Hi-Hats"  # Default fallback
@@ -807,8 +794,7 @@ class UniversalAudioAnalyzer:
             # Factor 4: Spectral centroid (closed hi-hats tend to be brighter/higher)
             if self.available_methods['librosa']:
                 try:
-                    import librosa
-                    spectral_centroid = np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))
+                    spectral_centroid = np.mean(features.spectral_centroid)
                     if spectral_centroid > 10000:  # Very bright = closed
                         decay_indicators -= 1
                     elif spectral_centroid < 6000:  # Less bright = open
@@ -826,25 +812,21 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Hi-hat type classification failed: {e}")
             return "Closed Hi-Hats"  # Safe default
 
-    def _fallback_classification(self, y: np.ndarray, sr: int) -> str:
+    def _fallback_classification(self, y: np.ndarray, sr: int,
+                                 features: Optional[SpectralFeatureContext] = None) -> str:
         """Fallback classification based on basic audio characteristics."""
         import numpy as np
         
         try:
             # Calculate basic energy distribution
-            fft = np.fft.fft(y)
-            magnitude = np.abs(fft)
-            freqs = np.fft.fftfreq(len(y), 1/sr)
-            
-            positive_freqs = freqs[:len(freqs)//2]
-            positive_magnitude = magnitude[:len(magnitude)//2]
+            features = features or SpectralFeatureContext(y, sr, self.hop_length)
             
             # Energy in different bands
-            sub_bass = np.sum(positive_magnitude[positive_freqs < 100])
-            bass = np.sum(positive_magnitude[(positive_freqs >= 100) & (positive_freqs < 300)])
-            low_mid = np.sum(positive_magnitude[(positive_freqs >= 300) & (positive_freqs < 1000)])
-            mid = np.sum(positive_magnitude[(positive_freqs >= 1000) & (positive_freqs < 4000)])
-            high = np.sum(positive_magnitude[positive_freqs >= 4000])
+            sub_bass = features.band_energy(None, 100)
+            bass = features.band_energy(100, 300)
+            low_mid = features.band_energy(300, 1000)
+            mid = features.band_energy(1000, 4000)
+            high = features.band_energy(4000, None)
             
             total_energy = sub_bass + bass + low_mid + mid + high
             
@@ -870,15 +852,18 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Fallback classification failed: {e}")
             return "Melodic"  # Ultimate fallback
     
-    def _detect_bpm_universal(self, y: np.ndarray, sr: int) -> float:
+    def _detect_bpm_universal(self, y: np.ndarray, sr: int,
+                              features: Optional[SpectralFeatureContext] = None) -> float:
         """Universal BPM detection using multiple methods."""
         import numpy as np
         
+        features = features or SpectralFeatureContext(y, sr, self.hop_length)
+        
         bpm_results = []
         
         # Method 1: Safe autocorrelation (always available)
         try:
-            bpm_safe = self._detect_bpm_safe(y, sr)
+            bpm_safe = self._detect_bpm_safe(y, sr, features)
             if bpm_safe > 0:
                 bpm_results.append(bpm_safe)
         except Exception as e:
@@ -888,7 +873,7 @@ class UniversalAudioAnalyzer:
         if self.available_methods['librosa'] and self.config['use_advanced_features']:
             try:
                 import librosa
-                tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+                tempo, _ = librosa.beat.beat_track(onset_envelope=features.tempo_onset_envelope, sr=sr)
                 if tempo > 0:
                     bpm_results.append(tempo)
             except Exception as e:
@@ -905,32 +890,29 @@ class UniversalAudioAnalyzer:
         
         return float(np.median(bpm_results)) if bpm_results else 0.0
     
-    def _detect_bpm_safe(self, y: np.ndarray, sr: int) -> float:
+    def _detect_bpm_safe(self, y: np.ndarray, sr: int, features: Optional[SpectralFeatureContext] = None) -> float:
         """Safe BPM detection using autocorrelation."""
         import numpy as np
         
         try:
             window_size = self.hop_length
-            onset_strength = []
-            
-            for i in range(0, len(y) - window_size, window_size):
-                window = y[i:i + window_size]
-                energy = np.sum(window**2)
-                onset_strength.append(energy)
+            features = features or SpectralFeatureContext(y, sr, window_size)
+            onset_strength = features.frame_energy.energy
             
             if len(onset_strength) < 4:
                 return 0.0
             
-            onset_strength = np.array(onset_strength)
-            autocorr = np.correlate(onset_strength, onset_strength, mode='full')
-            autocorr = autocorr[len(autocorr)//2:]
-            
             min_period = int(60 / 200 * sr / window_size)  # 200 BPM max
             max_period = int(60 / 60 * sr / window_size)   # 60 BPM min
             
-            if max_period >= len(autocorr):
+            if max_period >= len(onset_strength):
                 return 0.0
             
+            # Only the lags up to the slowest tempo are needed: O(frames * lags)
+            # instead of a full autocorrelation, whatever the file's length
+            autocorr = np.array([np.dot(onset_strength[:len(onset_strength) - lag], onset_strength[lag:])
+                                 for lag in range(max_period)])
+            
             search_range = autocorr[min_period:max_period]
             if len(search_range) == 0:
                 return 0.0
@@ -977,13 +959,15 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Safe aubio BPM detection failed: {e}")
             return 0.0
     
-    def _detect_key_universal(self, y: np.ndarray, sr: int) -> str:
+    def _detect_key_universal(self, y: np.ndarray, sr: int,
+                              features: Optional[SpectralFeatureContext] = None) -> str:
         """Universal key detection."""
+        features = features or SpectralFeatureContext(y, sr, self.hop_length)
         key_results = []
         
         # Method 1: Safe pitch analysis (always available)
         try:
-            key_safe = self._detect_key_safe(y, sr)
+            key_safe = self._detect_key_safe(y, sr, features)
             if key_safe != "unknown":
                 key_results.append(key_safe)
         except Exception as e:
@@ -992,7 +976,7 @@ class UniversalAudioAnalyzer:
         # Method 2: librosa chroma (if available and safe)
         if self.available_methods['librosa'] and self.config['use_advanced_features']:
             try:
-                key_chroma = self._detect_key_chroma_safe(y, sr)
+                key_chroma = self._detect_key_chroma_safe(y, sr, features)
                 if key_chroma != "unknown":
                     key_results.append(key_chroma)
             except Exception as e:
@@ -1006,25 +990,16 @@ class UniversalAudioAnalyzer:
         key_counts = Counter(key_results)
         return key_counts.most_common(1)[0][0]
     
-    def _detect_key_safe(self, y: np.ndarray, sr: int) -> str:
+    def _detect_key_safe(self, y: np.ndarray, sr: int,
+                         features: Optional[SpectralFeatureContext] = None) -> str:
         """Safe key detection using basic pitch analysis."""
         import numpy as np
         
         try:
-            fft = np.fft.fft(y)
-            magnitude = np.abs(fft)
-            freqs = np.fft.fftfreq(len(y), 1/sr)
-            
-            positive_freqs = freqs[:len(freqs)//2]
-            positive_magnitude = magnitude[:len(magnitude)//2]
+            features = features or SpectralFeatureContext(y, sr, self.hop_length)
+            dominant_freq = features.dominant_frequency
             
-            if len(positive_magnitude) == 0:
-                return "unknown"
-            
-            peak_idx = np.argmax(positive_magnitude)
-            dominant_freq = positive_freqs[peak_idx]
-            
-            if dominant_freq <= 0:
+            if dominant_freq is None or dominant_freq <= 0:
                 return "unknown"
             
             # Convert to note
@@ -1041,13 +1016,13 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Safe key detection failed: {e}")
             return "unknown"
     
-    def _detect_key_chroma_safe(self, y: np.ndarray, sr: int) -> str:
+    def _detect_key_chroma_safe(self, y: np.ndarray, sr: int,
+                                features: Optional[SpectralFeatureContext] = None) -> str:
         """Safe chroma-based key detection using librosa."""
         try:
-            import librosa
             import numpy as np
             
-            chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+            chroma = (features or SpectralFeatureContext(y, sr, self.hop_length)).chroma
             chroma_mean = np.mean(chroma, axis=1)
             chroma_mean = chroma_mean / np.sum(chroma_mean)
             
@@ -1068,49 +1043,34 @@ class UniversalAudioAnalyzer:
             logger.warning(f"Chroma key detection failed: {e}")
             return "unknown"
     
-    def _analyze_characteristics_universal(self, y: np.ndarray, sr: int) -> Dict:
+    def _analyze_characteristics_universal(self, y: np.ndarray, sr: int,
+                                           features: Optional[SpectralFeatureContext] = None) -> Dict:
         """Universal characteristic analysis."""
         import numpy as np
         
+        features = features or SpectralFeatureContext(y, sr, self.hop_length)
         characteristics = {}
         
         try:
             # Basic characteristics (always available)
-            characteristics["duration"] = len(y) / sr
+            characteristics["duration"] = features.duration
             characteristics["sample_rate"] = sr
             characteristics["cpu_type"] = self.config['cpu_type']
             
             # Safe characteristics
-            rms = np.sqrt(np.mean(y**2))
-            characteristics["rms_mean"] = float(rms)
-            
-            zero_crossings = np.where(np.diff(np.signbit(y)))[0]
-            zcr = len(zero_crossings) / len(y)
-            characteristics["zero_crossing_rate"] = float(zcr)
+            characteristics["rms_mean"] = float(features.rms)
+            characteristics["zero_crossing_rate"] = float(features.zero_crossing_fraction)
             
             # Safe spectral analysis
-            fft = np.fft.fft(y)
-            magnitude = np.abs(fft)
-            freqs = np.fft.fftfreq(len(y), 1/sr)
-            
-            positive_freqs = freqs[:len(freqs)//2]
-            positive_magnitude = magnitude[:len(magnitude)//2]
-            
-            if np.sum(positive_magnitude) > 0:
-                spectral_centroid = np.sum(positive_freqs * positive_magnitude) / np.sum(positive_magnitude)
-                characteristics["spectral_centroid"] = float(spectral_centroid)
-            else:
-                characteristics["spectral_centroid"] = 0.0
+            characteristics["spectral_centroid"] = float(features.fft_centroid)
             
             # Advanced characteristics (if available)
             if self.available_methods['librosa'] and self.config['use_advanced_features']:
                 try:
-                    import librosa
-                    
-                    spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
+                    spectral_rolloff = features.spectral_rolloff
                     characteristics["spectral_rolloff_mean"] = float(np.mean(spectral_rolloff))
                     
-                    spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)
+                    spectral_bandwidth = features.spectral_bandwidth
                     characteristics["spectral_bandwidth_mean"] = float(np.mean(spectral_bandwidth))
                     
                 except Exception as e:
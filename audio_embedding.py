@@ -0,0 +1,148 @@
+import logging
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+from spectral_features import SpectralFeatureContext
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump whenever the embedding layout changes; samples analyzed with another
+# version are left out of similarity search until they are re-analyzed.
+# 2: computed from the analyzed signal alone, never from whole-file summaries
+EMBEDDING_VERSION = 2
+
+# Framing of the MFCC statistics (librosa's defaults)
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 40
+N_MFCC = 13
+
+# Only the start of long loops is described; it is what the user hears first
+MAX_SECONDS = 30.0
+
+# Band edges (Hz) of the energy distribution part of the embedding
+BAND_EDGES = [0, 60, 250, 500, 2000, 4000, 8000, None]
+
+# 13 MFCC means + 13 MFCC deviations, 4 spectral shape stats, 7 band
+# energy shares and 5 temporal stats
+EMBEDDING_SIZE = 2 * N_MFCC + 4 + (len(BAND_EDGES) - 1) + 5
+
+# Spectral shape and band shares: independent of level, and nearly unchanged
+# by padding and resampling, unlike the MFCC and temporal parts
+SPECTRAL_PROFILE = slice(2 * N_MFCC, 2 * N_MFCC + 4 + (len(BAND_EDGES) - 1))
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sr: int) -> np.ndarray:
+    """Triangular mel filters of shape (N_MELS, N_FFT // 2 + 1), Slaney style."""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+    
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+    
+    fft_freqs = np.fft.rfftfreq(N_FFT, 1 / sr)
+    edges = mel_to_hz(np.linspace(hz_to_mel(0), hz_to_mel(sr / 2), N_MELS + 2))
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (fft_freqs - lower) / (center - lower)
+    falling = (upper - fft_freqs) / (upper - center)
+    filters = np.maximum(0, np.minimum(rising, falling))
+    # Equal area per filter
+    return (filters * (2.0 / (upper - lower))).astype(np.float32)
+
+@lru_cache(maxsize=1)
+def _dct_matrix() -> np.ndarray:
+    """Orthonormal DCT-II basis mapping N_MELS log energies to N_MFCC + 1 cepstral coefficients."""
+    n = np.arange(N_MELS)
+    basis = np.cos(np.pi / N_MELS * (n[None, :] + 0.5) * np.arange(N_MFCC + 1)[:, None])
+    basis *= np.sqrt(2.0 / N_MELS)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+def mel_power_frames(y: np.ndarray, sr: int) -> np.ndarray:
+    """
+    Mel-band power of each STFT frame (N_FFT window, HOP_LENGTH hop).
+    
+    Args:
+        y: Mono float32 signal; zero-padded to one frame if shorter
+        sr: Sample rate of the signal
+    
+    Returns:
+        Array of shape (n_frames, N_MELS)
+    """
+    if len(y) < N_FFT:
+        y = np.pad(y, (0, N_FFT - len(y)))
+    frames = np.lib.stride_tricks.sliding_window_view(y, N_FFT)[::HOP_LENGTH]
+    power = np.abs(np.fft.rfft(frames * np.hanning(N_FFT).astype(np.float32), axis=1)) ** 2
+    return power @ _mel_filterbank(sr).T
+
+def _mfcc_stats(y: np.ndarray, sr: int) -> np.ndarray:
+    """Mean and standard deviation of MFCCs 1..N_MFCC (c0, the level, is dropped)."""
+    log_mel = np.log10(np.maximum(mel_power_frames(y, sr), 1e-10))
+    mfcc = (log_mel @ _dct_matrix().T)[:, 1:]
+    return np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)])
+
+def _spectral_shape(features: SpectralFeatureContext) -> List[float]:
+    """Centroid, bandwidth and 85% rolloff relative to Nyquist, plus flatness."""
+    freqs, magnitude = features.positive_freqs, features.positive_magnitude
+    total = features.total_magnitude
+    if total <= 0 or len(freqs) == 0:
+        return [0.0, 0.0, 0.0, 0.0]
+    
+    nyquist = features.sr / 2
+    centroid = features.fft_centroid
+    bandwidth = np.sqrt(np.sum(magnitude * (freqs - centroid) ** 2) / total)
+    rolloff = freqs[min(np.searchsorted(np.cumsum(magnitude), 0.85 * total), len(freqs) - 1)]
+    flatness = np.exp(np.mean(np.log(magnitude + 1e-10))) / (total / len(magnitude))
+    return [centroid / nyquist, bandwidth / nyquist, rolloff / nyquist, float(flatness)]
+
+def _band_shares(features: SpectralFeatureContext) -> List[float]:
+    """Share of the spectral magnitude in each band of BAND_EDGES."""
+    total = features.total_magnitude
+    if total <= 0:
+        return [0.0] * (len(BAND_EDGES) - 1)
+    return [features.band_energy(low, high) / total for low, high in zip(BAND_EDGES[:-1], BAND_EDGES[1:])]
+
+def _temporal_stats(features: SpectralFeatureContext) -> List[float]:
+    """Zero crossing rate, crest factor, attack time, level variation and length of features.y."""
+    y = features.y
+    rms = features.frame_energy.rms
+    signal_rms = np.sqrt(np.mean(y ** 2)) if len(y) else 0.0
+    
+    zcr = np.count_nonzero(np.diff(np.signbit(y))) / len(y) if len(y) else 0.0
+    crest = np.log1p(np.max(np.abs(y)) / signal_rms) if signal_rms > 0 else 0.0
+    attack = np.log1p(np.argmax(rms) * features.frame_energy.frame_length / features.sr) if len(rms) else 0.0
+    variation = np.std(rms) / np.mean(rms) if len(rms) and np.mean(rms) > 0 else 0.0
+    return [float(zcr), float(crest), float(attack), float(variation), float(np.log1p(len(y) / features.sr))]
+
+def compute_embedding(features: SpectralFeatureContext) -> List[float]:
+    """
+    Fixed-length description of how a sample sounds, for similarity search.
+    Combines MFCC means and deviations (timbre and its movement), spectral
+    shape, band energy shares and a few envelope statistics. Only numpy is
+    used, so the embedding is the same whichever analysis backends exist.
+    
+    Every part describes the same audio: the first MAX_SECONDS of the
+    analyzed signal (the analysis window of a long file). The caller passes
+    a context without a whole-file summary, so a sound gets the same
+    embedding whatever the length of the file it was cut from.
+    
+    Args:
+        features: Summary-free spectral features of the analyzed signal
+    
+    Returns:
+        EMBEDDING_SIZE floats; compare after per-dimension standardization
+    """
+    max_samples = int(MAX_SECONDS * features.sr)
+    if len(features.y) > max_samples:
+        features = SpectralFeatureContext(features.y[:max_samples], features.sr, features.hop_length)
+    
+    embedding = np.concatenate([
+        _mfcc_stats(np.asarray(features.y, dtype=np.float32), features.sr),
+        _spectral_shape(features),
+        _band_shares(features),
+        _temporal_stats(features)
+    ])
+    return [float(value) for value in np.nan_to_num(embedding, nan=0.0, posinf=0.0, neginf=0.0)]
@@ -0,0 +1,157 @@
+import struct
+import logging
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bits per sample of soundfile subtypes, for formats probed through soundfile.info
+SUBTYPE_BIT_DEPTHS = {
+    "PCM_S8": 8, "PCM_U8": 8, "PCM_16": 16, "PCM_24": 24, "PCM_32": 32,
+    "FLOAT": 32, "DOUBLE": 64, "ALAC_16": 16, "ALAC_20": 20, "ALAC_24": 24, "ALAC_32": 32
+}
+
+# fmt chunk format tag whose extension carries the valid bits per sample
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+def _format_info(format_name: str, sample_rate: float, channels: int,
+                 bit_depth: Optional[int], frames: Optional[int]) -> Optional[Dict]:
+    """Assemble a probe result; None if the header is implausible."""
+    if sample_rate <= 0 or channels <= 0:
+        return None
+    return {
+        "format": format_name,
+        "sample_rate": int(round(sample_rate)),
+        "channels": channels,
+        "bit_depth": bit_depth,
+        "frames": frames,
+        "duration": frames / sample_rate if frames is not None else None
+    }
+
+def _probe_wav(f: BinaryIO, riff_id: bytes, file_size: int) -> Optional[Dict]:
+    """Read fmt and the data chunk size of a RIFF/RF64 WAVE file, seeking over other chunks."""
+    fmt = None
+    data_size = None
+    ds64_data_size = None
+    
+    position = 12
+    while position + 8 <= file_size:
+        f.seek(position)
+        chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+        if chunk_id == b"fmt ":
+            fmt = f.read(min(chunk_size, 40))
+        elif chunk_id == b"ds64":
+            # RF64: 64-bit RIFF and data sizes replace the 0xFFFFFFFF placeholders
+            ds64_data_size = struct.unpack("<QQ", f.read(16))[1]
+        elif chunk_id == b"data":
+            data_size = ds64_data_size if riff_id != b"RIFF" and chunk_size == 0xFFFFFFFF else chunk_size
+            # Truncated files: count only the bytes actually present
+            data_size = min(data_size, file_size - position - 8)
+        if fmt is not None and data_size is not None:
+            break
+        position += 8 + chunk_size + (chunk_size & 1)
+    
+    if fmt is None or len(fmt) < 16:
+        return None
+    format_tag, channels, sample_rate, _, block_align, bit_depth = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 20:
+        # Valid bits per sample (e.g. 20 or 24 bits in a 32-bit container)
+        bit_depth = struct.unpack("<H", fmt[18:20])[0] or bit_depth
+    
+    frames = data_size // block_align if data_size is not None and block_align else None
+    return _format_info("WAV" if riff_id == b"RIFF" else "RF64", sample_rate, channels, bit_depth or None, frames)
+
+def _extended_to_float(data: bytes) -> float:
+    """Decode an 80-bit IEEE 754 extended float (AIFF sample rates)."""
+    exponent, mantissa = struct.unpack(">HQ", data)
+    sign = -1.0 if exponent & 0x8000 else 1.0
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+def _probe_aiff(f: BinaryIO, form_type: bytes, file_size: int) -> Optional[Dict]:
+    """Read the COMM chunk of an AIFF/AIFF-C file."""
+    position = 12
+    while position + 8 <= file_size:
+        f.seek(position)
+        chunk_id, chunk_size = struct.unpack(">4sI", f.read(8))
+        if chunk_id == b"COMM":
+            comm = f.read(18)
+            if len(comm) < 18:
+                return None
+            channels, frames, bit_depth = struct.unpack(">hIh", comm[:8])
+            sample_rate = _extended_to_float(comm[8:18])
+            return _format_info("AIFF" if form_type == b"AIFF" else "AIFC", sample_rate, channels,
+                                bit_depth or None, frames)
+        position += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+def _probe_flac(f: BinaryIO, offset: int) -> Optional[Dict]:
+    """Read the STREAMINFO block that follows the fLaC marker."""
+    f.seek(offset + 4)
+    block_header = f.read(4)
+    if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+        return None
+    info = f.read(34)
+    if len(info) < 34:
+        return None
+    # 20 bits sample rate, 3 bits channels - 1, 5 bits bits per sample - 1, 36 bits total samples
+    packed = int.from_bytes(info[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    bit_depth = ((packed >> 36) & 0x1F) + 1
+    frames = packed & 0xFFFFFFFFF
+    return _format_info("FLAC", sample_rate, channels, bit_depth, frames or None)
+
+def _probe_soundfile(file_path: Path) -> Optional[Dict]:
+    """Header probe through libsndfile, for the formats not parsed here."""
+    try:
+        import soundfile as sf
+        info = sf.info(str(file_path))
+    except Exception:
+        return None
+    return _format_info(info.format, info.samplerate, info.channels,
+                        SUBTYPE_BIT_DEPTHS.get(info.subtype), info.frames or None)
+
+def probe_audio_header(file_path: Union[str, Path]) -> Optional[Dict]:
+    """
+    Read a file's audio format from its header, without decoding any audio.
+    WAV/RF64, AIFF/AIFF-C and FLAC headers are parsed directly, reading a
+    few hundred bytes at most; other formats go through soundfile.info
+    when libsndfile supports them.
+    
+    Args:
+        file_path: Path to the audio file
+    
+    Returns:
+        Dict with format, sample_rate, channels, bit_depth, frames and duration
+        (bit_depth, frames and duration may be None), or None if the format
+        could not be read
+    """
+    file_path = Path(file_path)
+    try:
+        with open(file_path, "rb") as f:
+            file_size = f.seek(0, 2)
+            f.seek(0)
+            head = f.read(12)
+            
+            if head[:4] in (b"RIFF", b"RF64", b"BW64") and head[8:12] == b"WAVE":
+                result = _probe_wav(f, head[:4], file_size)
+            elif head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+                result = _probe_aiff(f, head[8:12], file_size)
+            elif head[:4] == b"fLaC":
+                result = _probe_flac(f, 0)
+            elif head[:3] == b"ID3" and len(head) >= 10:
+                # ID3v2 tag in front of the stream (FLAC files occasionally have one)
+                tag_size = 10 + ((head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9])
+                f.seek(tag_size)
+                result = _probe_flac(f, tag_size) if f.read(4) == b"fLaC" else None
+            else:
+                result = None
+    except (OSError, struct.error) as e:
+        logger.debug(f"Could not read header of {file_path}: {e}")
+        return None
+    
+    return result if result is not None else _probe_soundfile(file_path)
@@ -1,27 +1,243 @@
 import os
 import logging
+import threading
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Optional, Callable
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QUrl
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput, QAudioDevice, QMediaDevices, QAudioFormat
-from PyQt6.QtWidgets import QApplication
+from typing import Dict, Iterable, Optional, Callable, Tuple
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QUrl, QBuffer, QByteArray, QIODevice
+from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput, QAudioDevice, QMediaDevices, QAudioFormat, QAudioSink, QAudio
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class PreviewBuffer:
+    """Decoded 16-bit interleaved PCM of one sample, ready for a QAudioSink."""
+    
+    __slots__ = ("file_path", "signature", "pcm", "sample_rate", "channels", "frames")
+    
+    def __init__(self, file_path: str, signature: Tuple[int, int], pcm: QByteArray,
+                 sample_rate: int, channels: int, frames: int):
+        self.file_path = file_path
+        self.signature = signature  # (mtime_ns, size) of the decoded file
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = frames
+    
+    @property
+    def nbytes(self) -> int:
+        return self.pcm.size()
+    
+    @property
+    def bytes_per_frame(self) -> int:
+        return self.channels * 2
+    
+    @property
+    def duration_ms(self) -> int:
+        return int(self.frames * 1000 / self.sample_rate)
+
+class PreviewBufferPool:
+    """
+    Size-bounded LRU pool of decoded one-shots.
+    Short samples are decoded once with soundfile, converted to a format the
+    output device accepts and kept as PCM, so auditioning them again (or
+    for the first time, after a prefetch) needs no file access or decoding.
+    Decoding only happens on the prefetch thread, never on the caller's.
+    Prefetches run on one background thread, newest request first, since
+    during fast browsing only the rows around the current one matter.
+    """
+    
+    # Longer samples are streamed by QMediaPlayer instead
+    MAX_PREVIEW_SECONDS = 6.0
+    
+    # Prefetch requests kept waiting; older ones are dropped
+    MAX_QUEUED_PREFETCHES = 16
+    
+    def __init__(self, target_format: Callable[[int, int], Tuple[int, int]], max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            target_format: Maps a file's (sample_rate, channels) to the
+                (sample_rate, channels) to decode it to
+            max_bytes: PCM bytes kept before the least recently used buffers are evicted
+        """
+        self.target_format = target_format
+        self.max_bytes = max_bytes
+        self._buffers: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._unpreviewable: Dict[str, Tuple[int, int]] = {}  # Too long or undecodable
+        self._lock = threading.Lock()
+        
+        self._queue: deque = deque(maxlen=self.MAX_QUEUED_PREFETCHES)
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+    
+    @staticmethod
+    def _signature(file_path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def get(self, file_path: str) -> Optional[PreviewBuffer]:
+        """Pooled buffer of a file, if it is pooled and the file has not changed since."""
+        signature = self._signature(file_path)
+        with self._lock:
+            buffer = self._buffers.get(file_path)
+            if buffer is None:
+                return None
+            if buffer.signature != signature:
+                self._discard(file_path)
+                return None
+            self._buffers.move_to_end(file_path)
+            return buffer
+    
+    def prefetch(self, file_paths: Iterable[str]):
+        """Decode files into the pool in the background, the last one given first."""
+        with self._lock:
+            for file_path in file_paths:
+                if file_path and file_path not in self._buffers and file_path not in self._queue:
+                    self._queue.append(file_path)
+            if not self._queue:
+                return
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._prefetch_loop, name="preview-prefetch", daemon=True)
+                self._worker.start()
+        self._wake.set()
+    
+    def clear(self):
+        """Drop every pooled buffer."""
+        with self._lock:
+            self._buffers.clear()
+            self._unpreviewable.clear()
+            self._queue.clear()
+            self._bytes = 0
+    
+    def _prefetch_loop(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                if not self._queue:
+                    self._wake.clear()
+                    continue
+                file_path = self._queue.pop()
+            if self.get(file_path) is None:
+                self._decode(file_path)
+    
+    def _decode(self, file_path: str) -> Optional[PreviewBuffer]:
+        """Decode a short file into the pool."""
+        if (signature := self._signature(file_path)) is None:
+            return None
+        with self._lock:
+            if self._unpreviewable.get(file_path) == signature:
+                return None
+        
+        try:
+            info = sf.info(file_path)
+            if info.frames <= 0 or info.frames > self.MAX_PREVIEW_SECONDS * info.samplerate:
+                raise ValueError("not a one-shot")
+            data, file_rate = sf.read(file_path, dtype="float32", always_2d=True)
+        except Exception as e:
+            # Long files and formats soundfile cannot read go through QMediaPlayer
+            logger.debug(f"No preview buffer for {file_path}: {e}")
+            with self._lock:
+                self._unpreviewable[file_path] = signature
+            return None
+        
+        sample_rate, channels = self.target_format(file_rate, data.shape[1])
+        
+        if channels == 1 and data.shape[1] > 1:
+            data = data.mean(axis=1, keepdims=True)
+        elif data.shape[1] == 1 and channels > 1:
+            data = np.repeat(data, channels, axis=1)
+        elif data.shape[1] > channels:
+            data = data[:, :channels]
+        if sample_rate != file_rate and len(data) > 1:
+            # Linear interpolation: adequate for auditioning
+            positions = np.arange(int(len(data) * sample_rate / file_rate)) * (file_rate / sample_rate)
+            data = np.stack([np.interp(positions, np.arange(len(data)), data[:, c]) for c in range(channels)], axis=1)
+        
+        pcm = (np.clip(data, -1.0, 1.0) * 32767).astype("<i2")
+        buffer = PreviewBuffer(file_path, signature, QByteArray(pcm.tobytes()), sample_rate, channels, len(pcm))
+        
+        with self._lock:
+            self._discard(file_path)
+            self._buffers[file_path] = buffer
+            self._bytes += buffer.nbytes
+            while self._bytes > self.max_bytes and len(self._buffers) > 1:
+                _, evicted = self._buffers.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return buffer
+    
+    def _discard(self, file_path: str):
+        """Remove one buffer. Caller holds the lock."""
+        if (buffer := self._buffers.pop(file_path, None)) is not None:
+            self._bytes -= buffer.nbytes
+
 class AudioPlayer(QObject):
     """
     Universal audio player for WAVFin Sample Manager.
     Handles playback of audio samples with progress tracking and volume control.
+    
+    Loading is asynchronous: load_file starts the load and returns, and the
+    outcome arrives through mediaStatusChanged as media_loaded or
+    load_failed. Every request gets a new generation number, so a load
+    superseded by a newer one (arrow-key browsing) is dropped rather than
+    waited for, and play() during a load starts playback once it is ready.
+    
+    Short samples already in the PreviewBufferPool (prefetched, or heard
+    before) bypass QMediaPlayer: they are played from decoded PCM through a
+    QAudioSink, which loads instantly and starts sounding within the sink's
+    small buffer. Other files stream through QMediaPlayer.
     """
     
+    # Load states
+    LOAD_IDLE = "idle"
+    LOAD_LOADING = "loading"
+    LOAD_READY = "ready"
+    LOAD_FAILED = "failed"
+    
+    # Attempts per file before the load is reported as failed
+    MAX_LOAD_ATTEMPTS = 3
+    
+    # Time one attempt may take before it is retried (ms)
+    LOAD_TIMEOUT_MS = 2000
+    
+    # Pause before retrying an attempt that failed (ms)
+    RETRY_DELAY_MS = 100
+    
+    # Audio buffered ahead by the preview sink; bounds time from play() to sound (ms)
+    PREVIEW_LATENCY_MS = 10
+    
+    # Interval of position updates during preview playback (ms)
+    PREVIEW_POSITION_INTERVAL_MS = 30
+    
+    # Sample rates tried for preview playback without resampling
+    PREVIEW_SAMPLE_RATES = (22050, 32000, 44100, 48000, 88200, 96000)
+    
+    # Statuses at which the source is ready to play
+    READY_STATUSES = (
+        QMediaPlayer.MediaStatus.LoadedMedia,
+        QMediaPlayer.MediaStatus.BufferingMedia,
+        QMediaPlayer.MediaStatus.BufferedMedia
+    )
+    
     # Signals for UI updates
     position_changed = pyqtSignal(int)  # Current position in ms
     duration_changed = pyqtSignal(int)  # Total duration in ms
     playback_state_changed = pyqtSignal(int)  # QMediaPlayer.PlaybackState
     volume_changed = pyqtSignal(float)  # Volume level 0.0-1.0
     error_occurred = pyqtSignal(str)  # Error message
+    media_loaded = pyqtSignal(str)  # File path, ready to play
+    load_failed = pyqtSignal(str)  # File path that could not be loaded
     
     def __init__(self):
         super().__init__()
@@ -41,12 +257,28 @@ class AudioPlayer(QObject):
         self.media_player.durationChanged.connect(self.duration_changed.emit)
         self.media_player.playbackStateChanged.connect(self.playback_state_changed.emit)
         self.media_player.errorOccurred.connect(self._handle_error)
+        self.media_player.mediaStatusChanged.connect(self._on_media_status_changed)
         self.audio_output.volumeChanged.connect(self.volume_changed.emit)
         
         # Current file info
         self.current_file = None
         self.is_loaded = False
-        self._loading = False  # Prevent multiple simultaneous loads
+        
+        # Load state machine
+        self.load_state = self.LOAD_IDLE
+        self._load_generation = 0  # Incremented by every load request
+        self._load_url = QUrl()
+        self._load_attempt = 0
+        self._play_when_loaded = False
+        self._last_error = ""
+        
+        # Watchdog for an attempt that never reaches a final status
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.timeout.connect(self._on_load_timeout)
+        
+        # In-memory playback of short samples
+        self._init_preview()
         
         # Supported formats with better compatibility
         self.supported_formats = {
@@ -62,6 +294,146 @@ class AudioPlayer(QObject):
         
         logger.info("AudioPlayer initialized with enhanced format support and low frequency optimization")
     
+    def _init_preview(self):
+        """Set up the decoded-PCM preview path, if soundfile and an output device are available."""
+        self.preview_pool: Optional[PreviewBufferPool] = None
+        self._preview: Optional[PreviewBuffer] = None  # Buffer being auditioned
+        self._preview_sink: Optional[QAudioSink] = None
+        self._preview_sink_format: Optional[Tuple[int, int]] = None
+        self._preview_io = QBuffer(self)
+        self._preview_state = QMediaPlayer.PlaybackState.StoppedState
+        self._preview_offset_ms = 0  # Position the sink started from
+        
+        self._preview_position_timer = QTimer(self)
+        self._preview_position_timer.setInterval(self.PREVIEW_POSITION_INTERVAL_MS)
+        self._preview_position_timer.timeout.connect(lambda: self.position_changed.emit(self.get_position()))
+        
+        if not SOUNDFILE_AVAILABLE:
+            logger.info("soundfile not available, previews play through QMediaPlayer")
+            return
+        
+        self._preview_device = self._get_default_audio_device()
+        if self._preview_device.isNull():
+            return
+        
+        # Formats the device takes as-is, probed once here on the GUI thread
+        preferred = self._preview_device.preferredFormat()
+        self._preview_default_rate = preferred.sampleRate()
+        self._preview_rates = set()
+        self._preview_channels = set()
+        for rate in self.PREVIEW_SAMPLE_RATES:
+            if self._preview_device.isFormatSupported(self._preview_format(rate, 2)):
+                self._preview_rates.add(rate)
+        for channels in (1, 2):
+            if self._preview_device.isFormatSupported(self._preview_format(self._preview_default_rate, channels)):
+                self._preview_channels.add(channels)
+        if not self._preview_channels:
+            logger.info("Output device does not take 16-bit PCM, previews play through QMediaPlayer")
+            return
+        
+        self.preview_pool = PreviewBufferPool(self._preview_target_format)
+    
+    @staticmethod
+    def _preview_format(sample_rate: int, channels: int) -> QAudioFormat:
+        audio_format = QAudioFormat()
+        audio_format.setSampleRate(sample_rate)
+        audio_format.setChannelCount(channels)
+        audio_format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+        return audio_format
+    
+    def _preview_target_format(self, sample_rate: int, channels: int) -> Tuple[int, int]:
+        """Playback (sample_rate, channels) for a file; called from the decoding thread."""
+        if channels not in self._preview_channels:
+            channels = 2 if 2 in self._preview_channels else 1
+        if sample_rate not in self._preview_rates:
+            sample_rate = self._preview_default_rate
+        return sample_rate, channels
+    
+    def prefetch_previews(self, file_paths: Iterable[str]):
+        """
+        Decode samples that are likely to be auditioned next (e.g. the rows
+        around the current one) into the preview pool in the background.
+        
+        Args:
+            file_paths: Files to prefetch, most likely next last
+        """
+        if self.preview_pool is not None:
+            self.preview_pool.prefetch(file_paths)
+    
+    def _load_preview(self, preview: PreviewBuffer):
+        """Make a decoded buffer the current source; it is ready immediately."""
+        self._load_timer.stop()
+        self._load_url = QUrl()
+        self._preview = preview
+        self._preview_offset_ms = 0
+        
+        audio_format = (preview.sample_rate, preview.channels)
+        if self._preview_sink is None or self._preview_sink_format != audio_format:
+            if self._preview_sink is not None:
+                self._preview_sink.stop()
+                self._preview_sink.deleteLater()
+            self._preview_sink = QAudioSink(self._preview_device, self._preview_format(*audio_format), self)
+            self._preview_sink.setBufferSize(
+                max(256, preview.sample_rate * self.PREVIEW_LATENCY_MS // 1000) * preview.bytes_per_frame
+            )
+            self._preview_sink.stateChanged.connect(self._on_preview_sink_state_changed)
+            self._preview_sink_format = audio_format
+        self._preview_sink.setVolume(self.audio_output.volume())
+        
+        self.load_state = self.LOAD_READY
+        self.is_loaded = True
+        self.duration_changed.emit(preview.duration_ms)
+        self.position_changed.emit(0)
+        logger.debug(f"Loaded from preview pool: {Path(preview.file_path).name}")
+        self.media_loaded.emit(self.current_file)
+    
+    def _start_preview(self, position_ms: int, paused: bool = False):
+        """Play the preview buffer from a position, or cue it there paused."""
+        preview = self._preview
+        frame = min(preview.frames, position_ms * preview.sample_rate // 1000)
+        
+        self._preview_sink.stop()
+        self._preview_io.close()
+        self._preview_io.setData(preview.pcm)
+        self._preview_io.open(QIODevice.OpenModeFlag.ReadOnly)
+        self._preview_io.seek(frame * preview.bytes_per_frame)
+        self._preview_offset_ms = frame * 1000 // preview.sample_rate
+        self._preview_sink.start(self._preview_io)
+        
+        if paused:
+            self._preview_sink.suspend()
+            self._set_preview_state(QMediaPlayer.PlaybackState.PausedState)
+        else:
+            self._set_preview_state(QMediaPlayer.PlaybackState.PlayingState)
+    
+    def _stop_preview(self):
+        """Stop preview playback and rewind."""
+        if self._preview_sink is not None:
+            self._preview_sink.stop()
+        self._preview_offset_ms = 0
+        self._set_preview_state(QMediaPlayer.PlaybackState.StoppedState)
+    
+    def _set_preview_state(self, state):
+        if state == QMediaPlayer.PlaybackState.PlayingState:
+            self._preview_position_timer.start()
+        else:
+            self._preview_position_timer.stop()
+        if state != self._preview_state:
+            self._preview_state = state
+            self.playback_state_changed.emit(state.value)
+    
+    def _on_preview_sink_state_changed(self, state):
+        """The sink goes idle once the whole buffer has been played."""
+        if state == QAudio.State.IdleState and self._preview_state == QMediaPlayer.PlaybackState.PlayingState:
+            self._stop_preview()
+            self.position_changed.emit(0)
+    
+    def _playback_state(self):
+        """Playback state of whichever path is playing the current file."""
+        if self._preview is not None:
+            return self._preview_state
+        return self.media_player.playbackState()
+    
     def _configure_audio_output(self):
         """Configure audio output for optimal low frequency reproduction."""
         try:
@@ -166,44 +538,43 @@ class AudioPlayer(QObject):
     
     def load_file(self, file_path: str) -> bool:
         """
-        Load an audio file for playback with enhanced format support and sample rate handling.
+        Start loading an audio file for playback, with enhanced format support.
         Includes special handling for low frequency samples.
+        The call returns as soon as the request is made; media_loaded or
+        load_failed follows. A newer request supersedes this one.
         
         Args:
             file_path: Path to the audio file
             
         Returns:
-            bool: True if file loaded successfully, False otherwise
+            bool: True if loading started, False if the file was rejected
         """
-        if self._loading:
-            logger.warning("Already loading a file, skipping")
-            return False
-            
+        # Any load still in flight is stale from here on
+        self._load_generation += 1
+        self._load_timer.stop()
+        self._play_when_loaded = False
+        
         try:
-            self._loading = True
             file_path = Path(file_path)
             
             if not file_path.exists():
                 logger.error(f"Audio file not found: {file_path}")
-                self.error_occurred.emit(f"File not found: {file_path.name}")
+                self._fail_load(f"File not found: {file_path.name}", str(file_path))
                 return False
             
             # Check format support
             file_ext = file_path.suffix.lower()
             if file_ext not in self.supported_formats:
                 logger.error(f"Unsupported audio format: {file_ext}")
-                self.error_occurred.emit(f"Unsupported format: {file_ext}. Supported: {', '.join(self.supported_formats.keys())}")
+                self._fail_load(f"Unsupported format: {file_ext}. Supported: {', '.join(self.supported_formats.keys())}", str(file_path))
                 return False
             
             # Stop current playback and reset
             self.stop()
             self.is_loaded = False
             
-            # Ensure clean state
-            QApplication.processEvents()
-            
             # Special handling for bass-heavy samples (likely 808s, kicks, etc.)
-            if is_bass_sample := self._is_bass_sample(file_path):
+            if self._is_bass_sample(file_path):
                 logger.info(f"Detected bass sample, applying optimizations: {file_path.name}")
                 self._optimize_for_bass_playback()
             
@@ -213,28 +584,116 @@ class AudioPlayer(QObject):
             # Verify URL is valid
             if not file_url.isValid():
                 logger.error(f"Invalid file URL: {file_url}")
-                self.error_occurred.emit("Invalid file path")
+                self._fail_load("Invalid file path", str(file_path))
                 return False
             
-            logger.info(f"Loading {self.supported_formats[file_ext]} file: {file_path.name}")
+            self.current_file = str(file_path)
             
-            # Set source with retry mechanism for problematic files
-            success = self._set_source_with_retry(file_url, file_ext)
-            if not success:
-                return False
+            # One-shots play from decoded memory. A miss is never decoded here (this
+            # runs on the GUI thread): the file streams through QMediaPlayer and is
+            # queued for the prefetch thread so the next audition is pooled
+            if self.preview_pool is not None:
+                if (preview := self.preview_pool.get(self.current_file)) is not None:
+                    self._load_preview(preview)
+                    return True
+                self.preview_pool.prefetch([self.current_file])
+            self._preview = None
             
-            self.current_file = str(file_path)
-            self.is_loaded = True
+            logger.info(f"Loading {self.supported_formats[file_ext]} file: {file_path.name}")
             
-            logger.info(f"Successfully loaded: {file_path.name}")
+            self.load_state = self.LOAD_LOADING
+            self._load_url = file_url
+            self._load_attempt = 0
+            self._last_error = ""
+            self._start_load_attempt(self._load_generation)
             return True
             
         except Exception as e:
             logger.error(f"Error loading audio file {file_path}: {e}")
-            self.error_occurred.emit(f"Error loading file: {str(e)}")
+            self._fail_load(f"Error loading file: {str(e)}", str(file_path))
             return False
-        finally:
-            self._loading = False
+    
+    def _start_load_attempt(self, generation: int):
+        """Hand the pending source to the media player; the outcome arrives via mediaStatusChanged."""
+        if generation != self._load_generation or self.load_state != self.LOAD_LOADING:
+            return
+        
+        self._load_attempt += 1
+        self._load_timer.start(self.LOAD_TIMEOUT_MS)
+        
+        if self.media_player.source() == self._load_url:
+            # Same file again: setSource would be a no-op and emit nothing
+            if self._load_attempt == 1:
+                status = self.media_player.mediaStatus()
+                if status in self.READY_STATUSES:
+                    self._finish_load()
+                    return
+                if status == QMediaPlayer.MediaStatus.LoadingMedia:
+                    # Still loading from an earlier request; its status updates now count for this one
+                    return
+            self.media_player.setSource(QUrl())
+        self.media_player.setSource(self._load_url)
+    
+    def _on_media_status_changed(self, status):
+        """Advance the load state machine on media status updates."""
+        if self.load_state != self.LOAD_LOADING or self.media_player.source() != self._load_url:
+            return
+        
+        if status in self.READY_STATUSES:
+            self._finish_load()
+        elif status == QMediaPlayer.MediaStatus.InvalidMedia:
+            self._retry_or_fail("format may not be supported")
+    
+    def _on_load_timeout(self):
+        """An attempt produced no final status in time."""
+        if self.load_state == self.LOAD_LOADING:
+            self._retry_or_fail("timed out")
+    
+    def _retry_or_fail(self, reason: str):
+        """Schedule another attempt of the current load, or give up on it."""
+        self._load_timer.stop()
+        if self._load_attempt < self.MAX_LOAD_ATTEMPTS:
+            logger.warning(f"Load attempt {self._load_attempt} {reason}, retrying...")
+            generation = self._load_generation
+            QTimer.singleShot(self.RETRY_DELAY_MS, lambda: self._start_load_attempt(generation))
+            return
+        
+        logger.error(f"Failed to set media source after all retries ({reason})")
+        message = self._last_error or "Failed to load audio file - format may not be supported"
+        self._fail_load(message, self.current_file)
+    
+    def _finish_load(self):
+        """The pending source is ready: report it and start any requested playback."""
+        self._load_timer.stop()
+        self.load_state = self.LOAD_READY
+        self.is_loaded = True
+        logger.info(f"Successfully loaded: {Path(self.current_file).name}")
+        self.media_loaded.emit(self.current_file)
+        
+        if self._play_when_loaded:
+            self._play_when_loaded = False
+            self.play()
+    
+    def _fail_load(self, message: str, file_path: Optional[str]):
+        """Abandon the current load and report why."""
+        self._load_timer.stop()
+        self.load_state = self.LOAD_FAILED
+        self.is_loaded = False
+        if self._preview is not None:
+            self._stop_preview()
+            self._preview = None
+        self._play_when_loaded = False
+        self.error_occurred.emit(message)
+        self.load_failed.emit(file_path or "")
+    
+    def is_loading(self) -> bool:
+        """
+        Check if a file is being loaded.
+        
+        Returns:
+            bool: True while a load request is pending
+        """
+        return self.load_state == self.LOAD_LOADING
     
     def _is_bass_sample(self, file_path: Path) -> bool:
         """Detect if a sample is likely bass-heavy based on filename and path."""
@@ -268,43 +727,6 @@ class AudioPlayer(QObject):
         except Exception as e:
             logger.warning(f"Failed to apply bass optimizations: {e}")
     
-    def _set_source_with_retry(self, file_url: QUrl, file_ext: str, max_retries: int = 3) -> bool:
-        """Set media source with retry mechanism for better reliability."""
-        for attempt in range(max_retries):
-            try:
-                self.media_player.setSource(file_url)
-                
-                # Wait for media to be recognized with timeout
-                import time
-                timeout = 2.0  # 2 second timeout
-                start_time = time.time()
-                
-                while time.time() - start_time < timeout:
-                    QApplication.processEvents()
-                    # Check if source was set successfully
-                    if self.media_player.source() == file_url:
-                        return True
-                    time.sleep(0.01)
-                
-                # If we get here, the source wasn't set properly
-                if attempt < max_retries - 1:
-                    logger.warning(f"Source setting attempt {attempt + 1} failed, retrying...")
-                    time.sleep(0.1)  # Brief pause before retry
-                else:
-                    logger.error("Failed to set media source after all retries")
-                    self.error_occurred.emit("Failed to load audio file - format may not be supported")
-                    return False
-                    
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(f"Source setting attempt {attempt + 1} failed with error: {e}, retrying...")
-                else:
-                    logger.error(f"Failed to set media source: {e}")
-                    self.error_occurred.emit(f"Failed to load audio file: {str(e)}")
-                    return False
-        
-        return False
-    
     def play(self) -> bool:
         """
         Start or resume playback with improved reliability.
@@ -312,18 +734,28 @@ class AudioPlayer(QObject):
         Returns:
             bool: True if playback started, False otherwise
         """
+        if self.load_state == self.LOAD_LOADING:
+            # Start as soon as the file is ready
+            self._play_when_loaded = True
+            return True
+        
         if not self.is_loaded:
             logger.warning("No audio file loaded")
             return False
         
-        if self._loading:
-            logger.warning("File still loading, cannot play yet")
-            return False
-        
         try:
             # Ensure we're not already playing
             if self.is_playing():
                 return True
+            
+            if self._preview is not None:
+                if self._preview_state == QMediaPlayer.PlaybackState.PausedState:
+                    self._preview_sink.resume()
+                    self._set_preview_state(QMediaPlayer.PlaybackState.PlayingState)
+                else:
+                    self._start_preview(self._preview_offset_ms)
+                logger.debug("Preview playback started")
+                return True
                 
             self.media_player.play()
             logger.debug("Playback started")
@@ -344,6 +776,13 @@ class AudioPlayer(QObject):
     
     def pause(self):
         """Pause playback."""
+        self._play_when_loaded = False
+        if self._preview is not None:
+            if self._preview_state == QMediaPlayer.PlaybackState.PlayingState:
+                # Resume from where the sink is, not from where it started
+                self._preview_sink.suspend()
+                self._set_preview_state(QMediaPlayer.PlaybackState.PausedState)
+            return
         self._safe_media_operation(
             self.media_player.pause,
             "pausing playback",
@@ -352,6 +791,9 @@ class AudioPlayer(QObject):
     
     def stop(self):
         """Stop playback and reset position."""
+        self._play_when_loaded = False
+        if self._preview is not None:
+            self._stop_preview()
         self._safe_media_operation(
             self.media_player.stop,
             "stopping playback", 
@@ -365,10 +807,16 @@ class AudioPlayer(QObject):
         Returns:
             bool: True if now playing, False if paused/stopped
         """
+        if self.load_state == self.LOAD_LOADING:
+            if self._play_when_loaded:
+                self._play_when_loaded = False
+                return False
+            return self.play()
+        
         if not self.is_loaded:
             return False
         
-        current_state = self.media_player.playbackState()
+        current_state = self._playback_state()
         
         if current_state != QMediaPlayer.PlaybackState.PlayingState:
             return self.play()
@@ -383,7 +831,14 @@ class AudioPlayer(QObject):
         Args:
             position_ms: Position in milliseconds
         """
-        if self.is_loaded:
+        if self.is_loaded and self._preview is not None:
+            state = self._preview_state
+            if state == QMediaPlayer.PlaybackState.StoppedState:
+                self._preview_offset_ms = max(0, min(position_ms, self._preview.duration_ms))
+            else:
+                self._start_preview(max(0, position_ms), paused=state == QMediaPlayer.PlaybackState.PausedState)
+            self.position_changed.emit(self.get_position())
+        elif self.is_loaded:
             try:
                 self.media_player.setPosition(position_ms)
                 logger.debug(f"Position set to {position_ms}ms")
@@ -402,6 +857,8 @@ class AudioPlayer(QObject):
             
             # Set volume on audio output
             self.audio_output.setVolume(volume)
+            if self._preview_sink is not None:
+                self._preview_sink.setVolume(volume)
             
             logger.debug(f"Volume set to {volume:.2f}")
         except Exception as e:
@@ -414,6 +871,11 @@ class AudioPlayer(QObject):
         Returns:
             int: Current position in milliseconds
         """
+        if self._preview is not None:
+            if self._preview_state == QMediaPlayer.PlaybackState.StoppedState:
+                return self._preview_offset_ms
+            played_ms = self._preview_offset_ms + self._preview_sink.processedUSecs() // 1000
+            return min(played_ms, self._preview.duration_ms)
         return self.media_player.position()
     
     def get_duration(self) -> int:
@@ -423,6 +885,8 @@ class AudioPlayer(QObject):
         Returns:
             int: Duration in milliseconds
         """
+        if self._preview is not None:
+            return self._preview.duration_ms
         return self.media_player.duration()
     
     def get_volume(self) -> float:
@@ -441,7 +905,7 @@ class AudioPlayer(QObject):
         Returns:
             bool: True if playing, False otherwise
         """
-        return self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+        return self._playback_state() == QMediaPlayer.PlaybackState.PlayingState
     
     def is_paused(self) -> bool:
         """
@@ -450,7 +914,7 @@ class AudioPlayer(QObject):
         Returns:
             bool: True if paused, False otherwise
         """
-        return self.media_player.playbackState() == QMediaPlayer.PlaybackState.PausedState
+        return self._playback_state() == QMediaPlayer.PlaybackState.PausedState
     
     def is_stopped(self) -> bool:
         """
@@ -459,7 +923,7 @@ class AudioPlayer(QObject):
         Returns:
             bool: True if stopped, False otherwise
         """
-        return self.media_player.playbackState() == QMediaPlayer.PlaybackState.StoppedState
+        return self._playback_state() == QMediaPlayer.PlaybackState.StoppedState
     
     def get_current_file(self) -> Optional[str]:
         """
@@ -488,6 +952,15 @@ class AudioPlayer(QObject):
         else:
             enhanced_message = f"Playback error: {error_string}"
         
+        if self.load_state == self.LOAD_FAILED and self.media_player.source() == self._load_url:
+            # Already reported by _fail_load
+            return
+        if self.load_state == self.LOAD_LOADING:
+            # Reported once the load is retried or given up on
+            logger.warning(f"Media player error while loading: {enhanced_message}")
+            self._last_error = enhanced_message
+            return
+        
         logger.error(f"Media player error: {enhanced_message}")
         self.error_occurred.emit(enhanced_message)
     
@@ -520,6 +993,8 @@ class AudioPlayer(QObject):
         return {
             "current_file": self.current_file,
             "is_loaded": self.is_loaded,
+            "load_state": self.load_state,
+            "preview_playback": self._preview is not None,
             "position_ms": self.get_position(),
             "duration_ms": self.get_duration(),
             "position_formatted": self.format_time(self.get_position()),
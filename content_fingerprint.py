@@ -0,0 +1,99 @@
+import os
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# xxhash is optional; hashlib's blake2b is used when it is not installed
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Bytes read from the start and end of the file (covers headers and trailing chunks)
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 64 * 1024
+
+# Evenly spaced blocks sampled from the middle of the file
+SAMPLED_BLOCKS = 8
+BLOCK_BYTES = 16 * 1024
+
+# Files up to this size are hashed in full
+FULL_HASH_LIMIT = HEAD_BYTES + TAIL_BYTES + SAMPLED_BLOCKS * BLOCK_BYTES
+
+# Read size when hashing a whole file
+FULL_HASH_CHUNK_BYTES = 1024 * 1024
+
+def _new_hasher():
+    """Create the fastest available 128-bit hasher and its algorithm tag."""
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128(), "xxh3"
+    return hashlib.blake2b(digest_size=16), "b2"
+
+def compute_content_fingerprint(file_path: Union[str, Path]) -> Optional[str]:
+    """
+    Compute a fast fingerprint of a file's content.
+    Hashes the file size, the head, the tail and evenly sampled blocks in
+    between, so the cost is bounded no matter how large the file is. Files
+    whose bytes are identical always get the same fingerprint, whatever
+    their path.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Fingerprint string tagged with the hash algorithm, or None if the file
+        cannot be read
+    """
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            hasher, algorithm = _new_hasher()
+            hasher.update(size.to_bytes(8, "little"))
+
+            if size <= FULL_HASH_LIMIT:
+                hasher.update(f.read())
+            else:
+                hasher.update(f.read(HEAD_BYTES))
+
+                middle_start = HEAD_BYTES
+                middle_span = size - TAIL_BYTES - BLOCK_BYTES - middle_start
+                for i in range(SAMPLED_BLOCKS):
+                    f.seek(middle_start + middle_span * i // max(1, SAMPLED_BLOCKS - 1))
+                    hasher.update(f.read(BLOCK_BYTES))
+
+                f.seek(size - TAIL_BYTES)
+                hasher.update(f.read(TAIL_BYTES))
+
+        return f"{algorithm}:{hasher.hexdigest()}"
+
+    except OSError as e:
+        logger.warning(f"Could not fingerprint {file_path}: {e}")
+        return None
+
+def compute_full_content_hash(file_path: Union[str, Path]) -> Optional[str]:
+    """
+    Hash every byte of a file, to confirm that files sharing a fingerprint
+    are identical. Costs a full read, so it is only used on fingerprint matches.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hash string tagged with the hash algorithm, or None if the file
+        cannot be read
+    """
+    try:
+        with open(file_path, "rb") as f:
+            hasher, algorithm = _new_hasher()
+            while chunk := f.read(FULL_HASH_CHUNK_BYTES):
+                hasher.update(chunk)
+        return f"{algorithm}:{hasher.hexdigest()}"
+
+    except OSError as e:
+        logger.warning(f"Could not hash {file_path}: {e}")
+        return None
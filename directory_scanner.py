@@ -0,0 +1,154 @@
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Audio file extensions picked up by directory scans
+AUDIO_EXTENSIONS = {'.wav', '.mp3', '.flac', '.aiff', '.aif', '.m4a', '.ogg', '.wma'}
+
+# (size, mtime_ns, inode) of a file
+FileSignature = Tuple[int, int, int]
+
+def file_signature(stat_result: os.stat_result) -> FileSignature:
+    """Build a file's stat signature from a stat result."""
+    return stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino
+
+def signatures_match(stored: Tuple, current: FileSignature) -> bool:
+    """
+    Compare a stored signature with a fresh one.
+    Inodes are only compared when both are known: os.scandir reports 0 for
+    st_ino on Windows.
+    """
+    stored_size, stored_mtime_ns, stored_inode = stored
+    size, mtime_ns, inode = current
+    if stored_size != size or stored_mtime_ns != mtime_ns:
+        return False
+    return not (stored_inode and inode) or stored_inode == inode
+
+def signature_fields(file_path: Path) -> Dict:
+    """Stat a file once and return its signature as analysis fields."""
+    size, mtime_ns, inode = file_signature(file_path.stat())
+    return {"file_size": size, "file_mtime_ns": mtime_ns, "file_inode": inode}
+
+class DirectoryScanner:
+    """
+    Incremental directory scanner for tracked sample directories.
+    Compares each directory's mtime with the snapshot from the previous scan and
+    only lists directories whose entries changed; unchanged subtrees are walked
+    from the snapshot without touching the disk beyond one stat per directory.
+    Files in listed directories are compared by stat signature, so content
+    changes are detected without reading any audio.
+    """
+    
+    def __init__(self, library_store):
+        self.library_store = library_store
+    
+    def scan(self, root: Path, deep: bool = False) -> Dict:
+        """
+        Find what changed under a tracked root since its last recorded scan.
+        
+        A directory's mtime only changes when entries are added, removed or renamed
+        in it, not when a file is rewritten in place. A quick scan therefore misses
+        in-place edits inside otherwise untouched directories; a deep scan lists
+        every directory and compares every file's signature.
+        
+        Args:
+            root: Tracked directory (resolved)
+            deep: List every directory instead of only the changed ones
+        
+        Returns:
+            Dictionary with:
+                files: every audio file found in the directories that were listed
+                new_files: audio files not in the library yet
+                changed_files: indexed files whose stat signature changed
+                unsigned_files: indexed files without a recorded signature (indexed
+                    before signatures existed); their signature just needs recording
+                removed_files: indexed file keys that no longer exist
+                directories: snapshot to record once the changes are applied
+                directories_listed: number of directories that were listed
+        """
+        root_key = str(root)
+        known_directories = self.library_store.get_scanned_directories(root_key)
+        
+        # Subdirectories of each known directory, for walking unchanged subtrees
+        known_children: Dict[str, List[str]] = {}
+        for path, (parent, _) in known_directories.items():
+            if parent is not None:
+                known_children.setdefault(parent, []).append(path)
+        
+        result = {
+            "files": [],
+            "new_files": [],
+            "changed_files": [],
+            "unsigned_files": [],
+            "removed_files": [],
+            "directories": {},
+            "directories_listed": 0
+        }
+        
+        stack: List[Tuple[str, Optional[str]]] = [(root_key, None)]
+        while stack:
+            directory, parent = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue  # Vanished; its entries are removed below
+            
+            result["directories"][directory] = (parent, mtime_ns)
+            
+            known = known_directories.get(directory)
+            if not deep and known is not None and known[1] == mtime_ns:
+                # Entries unchanged: descend using the snapshot
+                stack.extend((child, directory) for child in known_children.get(directory, []))
+                continue
+            
+            subdirectories = self._list_directory(directory, result)
+            stack.extend((child, directory) for child in subdirectories)
+        
+        # Everything indexed in directories that disappeared is gone
+        vanished = [path for path in known_directories if path not in result["directories"]]
+        for directory in vanished:
+            result["removed_files"].extend(self.library_store.get_file_signatures(directory))
+        
+        return result
+    
+    def _list_directory(self, directory: str, result: Dict) -> List[str]:
+        """List one directory, classify its audio files and return its subdirectories."""
+        result["directories_listed"] += 1
+        indexed = self.library_store.get_file_signatures(directory)
+        subdirectories = []
+        
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                            continue
+                        if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in AUDIO_EXTENSIONS:
+                            continue
+                        
+                        file_path = Path(entry.path)
+                        result["files"].append(file_path)
+                        
+                        if entry.path not in indexed:
+                            result["new_files"].append(file_path)
+                            continue
+                        
+                        stored = indexed.pop(entry.path)
+                        if stored[1] is None:
+                            result["unsigned_files"].append(file_path)
+                        elif not signatures_match(stored, file_signature(entry.stat())):
+                            result["changed_files"].append(file_path)
+                    except OSError as e:
+                        logger.warning(f"Could not stat {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"Error scanning directory {directory}: {e}")
+            return subdirectories
+        
+        # Indexed files that were not listed have been deleted or renamed
+        result["removed_files"].extend(indexed)
+        return subdirectories
@@ -0,0 +1,302 @@
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from audio_embedding import EMBEDDING_VERSION, SPECTRAL_PROFILE
+from content_fingerprint import FULL_HASH_LIMIT, compute_full_content_hash
+from perceptual_hash import NEAR_DUPLICATE_DISTANCE, PERCEPTUAL_HASH_VERSION, hamming_distance, is_distinctive
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Number of set bits of each uint64 value."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).reshape(values.shape)
+
+class DuplicateDetector:
+    """
+    Groups the library into exact-duplicate and near-duplicate clusters.
+    Exact duplicates have identical bytes: they share a content fingerprint,
+    and files too large for the fingerprint to cover in full are confirmed
+    by hashing all of their bytes. Near duplicates have perceptual hashes
+    within a few bits of each other, which catches the same sound
+    re-encoded, resampled, normalized or padded.
+    
+    Candidate pairs come from a bucketed (multi-index) hash table: the 64
+    hash bits are cut into max_distance + 1 bands, and two hashes within
+    max_distance bits must agree on at least one whole band. Only samples
+    sharing a band value are compared, instead of all n² pairs.
+    
+    Near matching only uses distinctive hashes (see is_distinctive), and
+    every candidate pair is confirmed by its durations and the spectral
+    profile of its embeddings before the two samples are grouped.
+    """
+    
+    # Rows compared at once inside one bucket (bounds the pairwise matrix)
+    COMPARE_CHUNK = 1024
+    
+    # Confirmation of near pairs: longest/shortest duration, and Euclidean
+    # distance between the embeddings' spectral profiles (when both have one)
+    MAX_DURATION_RATIO = 1.5
+    MAX_PROFILE_DISTANCE = 0.35
+    
+    # Attributes read per sample: content_hash, perceptual_hash, its version,
+    # file_size, duration
+    ROW_PATHS = [("content_hash",), ("perceptual_hash",), ("perceptual_hash_version",), ("file_size",), ("duration",)]
+    
+    # Attributes read to confirm near pairs
+    PROFILE_PATHS = [("embedding",), ("embedding_version",)]
+    
+    def __init__(self, library_store, max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        """
+        Args:
+            library_store: SampleLibraryStore to search
+            max_distance: Largest Hamming distance between near-duplicate hashes
+        """
+        self.library_store = library_store
+        self.max_distance = max_distance
+    
+    @staticmethod
+    def _row(file_key: str, content_hash, perceptual_hash, version, file_size, duration) -> Tuple:
+        """Normalize a ROW_PATHS row; hashes of another version count as missing."""
+        if version != PERCEPTUAL_HASH_VERSION:
+            perceptual_hash = None
+        return file_key, content_hash, perceptual_hash, file_size, duration
+    
+    def _load(self) -> List[Tuple]:
+        """(file_key, content_hash, perceptual_hash or None, file_size, duration) of every sample."""
+        return [self._row(*row) for row in self.library_store.iter_attribute_rows(self.ROW_PATHS)]
+    
+    def _load_profiles(self, file_keys: List[str]) -> Dict[str, np.ndarray]:
+        """Spectral profiles of the current-version embeddings of some samples."""
+        profiles = {}
+        for file_key, embedding, version in self.library_store.get_attribute_rows(file_keys, self.PROFILE_PATHS):
+            if embedding is not None and version == EMBEDDING_VERSION:
+                profiles[file_key] = np.frombuffer(embedding, dtype=np.float32)[SPECTRAL_PROFILE]
+        return profiles
+    
+    @staticmethod
+    def _exact_key(row: Tuple) -> Optional[str]:
+        """Hash of all of a sample's bytes: the fingerprint itself for files it hashes in full."""
+        _, content_hash, _, file_size, _ = row
+        if not content_hash:
+            return None
+        if file_size is not None and file_size <= FULL_HASH_LIMIT:
+            return content_hash
+        return compute_full_content_hash(row[0])
+    
+    def _exact_keys(self, rows: List[Tuple]) -> Dict[int, str]:
+        """Whole-content hashes of the samples that share a fingerprint with another one."""
+        by_fingerprint: Dict[str, List[int]] = {}
+        for index, row in enumerate(rows):
+            if row[1]:
+                by_fingerprint.setdefault(row[1], []).append(index)
+        
+        keys = {}
+        for indices in by_fingerprint.values():
+            if len(indices) < 2:
+                continue
+            for index in indices:
+                if (key := self._exact_key(rows[index])) is not None:
+                    keys[index] = key
+        return keys
+    
+    def _confirmed(self, row_a: Tuple, row_b: Tuple, profiles: Dict[str, np.ndarray]) -> bool:
+        """Second check of a near pair: similar durations and spectral profiles."""
+        duration_a, duration_b = row_a[4] or 0, row_b[4] or 0
+        if duration_a > 0 and duration_b > 0 and max(duration_a, duration_b) > self.MAX_DURATION_RATIO * min(duration_a, duration_b):
+            return False
+        
+        profile_a, profile_b = profiles.get(row_a[0]), profiles.get(row_b[0])
+        if profile_a is not None and profile_b is not None:
+            return float(np.linalg.norm(profile_a - profile_b)) <= self.MAX_PROFILE_DISTANCE
+        return True
+    
+    def _bands(self) -> List[Tuple[int, int]]:
+        """(shift, mask) of the hash bands used as bucket keys."""
+        count = self.max_distance + 1
+        widths = [64 // count + (1 if i < 64 % count else 0) for i in range(count)]
+        bands, shift = [], 0
+        for width in widths:
+            bands.append((shift, (1 << width) - 1))
+            shift += width
+        return bands
+    
+    def _near_pairs(self, hashes: np.ndarray) -> List[Tuple[int, int]]:
+        """Index pairs of hashes within max_distance bits, found bucket by bucket."""
+        pairs = []
+        for shift, mask in self._bands():
+            keys = (hashes >> np.uint64(shift)) & np.uint64(mask)
+            order = np.argsort(keys, kind="stable")
+            boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+            for bucket in np.split(order, boundaries):
+                if len(bucket) < 2:
+                    continue
+                bucket_hashes = hashes[bucket]
+                for start in range(0, len(bucket), self.COMPARE_CHUNK):
+                    chunk = bucket_hashes[start:start + self.COMPARE_CHUNK]
+                    distances = _popcount(chunk[:, None] ^ bucket_hashes[None, :])
+                    rows, columns = np.nonzero(distances <= self.max_distance)
+                    rows += start
+                    keep = rows < columns
+                    pairs.extend(zip(bucket[rows[keep]].tolist(), bucket[columns[keep]].tolist()))
+        return pairs
+    
+    def find_groups(self) -> List[Dict]:
+        """
+        Cluster the library into duplicate groups.
+        
+        Returns:
+            Groups with at least two members, most wasted disk space first.
+            Each group has an 'id', a 'kind' ('exact' when every member has
+            identical bytes, confirmed over the whole content, otherwise
+            'near'), 'wasted_bytes' (size of all but the largest member) and
+            'members': dicts with file_path, file_size, duration, content_hash
+            and the hash 'distance' to the first member (None without a
+            perceptual hash)
+        """
+        rows = self._load()
+        parent = list(range(len(rows)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        def union(a: int, b: int):
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+        
+        # Identical bytes: a shared fingerprint only samples large files, so
+        # they are grouped by the hash of their whole content
+        exact_keys = self._exact_keys(rows)
+        first_with_key: Dict[str, int] = {}
+        for index, key in exact_keys.items():
+            union(first_with_key.setdefault(key, index), index)
+        
+        # Same sound: candidate pairs of distinctive hashes, confirmed one by one
+        hashed = [index for index, row in enumerate(rows) if row[2] is not None and is_distinctive(row[2])]
+        hashes = np.array([rows[index][2] for index in hashed], dtype=np.int64).view(np.uint64)
+        pairs = [(hashed[a], hashed[b]) for a, b in self._near_pairs(hashes)]
+        profiles = self._load_profiles(sorted({rows[index][0] for pair in pairs for index in pair}))
+        for a, b in pairs:
+            if self._confirmed(rows[a], rows[b], profiles):
+                union(a, b)
+        
+        clusters: Dict[int, List[int]] = {}
+        for index in range(len(rows)):
+            clusters.setdefault(find(index), []).append(index)
+        
+        groups = []
+        for members in clusters.values():
+            if len(members) < 2:
+                continue
+            members.sort(key=lambda index: rows[index][0])
+            reference = rows[members[0]][2]
+            member_keys = {exact_keys.get(index) for index in members}
+            sizes = [rows[index][3] or 0 for index in members]
+            groups.append({
+                "kind": "exact" if len(member_keys) == 1 and None not in member_keys else "near",
+                "wasted_bytes": sum(sizes) - max(sizes),
+                "members": [
+                    {
+                        "file_path": rows[index][0],
+                        "file_size": rows[index][3],
+                        "duration": rows[index][4],
+                        "content_hash": rows[index][1],
+                        "distance": (hamming_distance(reference, rows[index][2])
+                                     if reference is not None and rows[index][2] is not None else None)
+                    }
+                    for index in members
+                ]
+            })
+        
+        groups.sort(key=lambda group: (-group["wasted_bytes"], group["members"][0]["file_path"]))
+        for group_id, group in enumerate(groups, 1):
+            group["id"] = group_id
+        logger.info(f"Found {len(groups)} duplicate groups in {len(rows)} samples")
+        return groups
+    
+    def duplicates_of(self, file_key: str) -> List[Dict]:
+        """
+        Samples that duplicate one sample, exact copies first.
+        A shared fingerprint only counts as an exact copy once the whole
+        content is confirmed identical; otherwise the near check applies.
+        
+        Returns:
+            Dicts with file_path, kind ('exact' or 'near') and distance
+        """
+        found = self.library_store.get_attribute_rows([file_key], self.ROW_PATHS)
+        if not found:
+            return []
+        target = self._row(*found[0])
+        _, content_hash, perceptual_hash, _, _ = target
+        if perceptual_hash is not None and not is_distinctive(perceptual_hash):
+            perceptual_hash = None
+        
+        # Only samples in the target's buckets (or with its fingerprint) are read
+        candidates = [
+            self._row(*row) for row in self.library_store.duplicate_candidate_rows(
+                content_hash, perceptual_hash, self._bands(), self.ROW_PATHS
+            ) if row[0] != file_key
+        ]
+        profiles = self._load_profiles([file_key] + [row[0] for row in candidates]) if perceptual_hash is not None else {}
+        
+        # The whole content is only hashed when a candidate shares the fingerprint
+        shares_fingerprint = content_hash and any(row[1] == content_hash for row in candidates)
+        target_key = self._exact_key(target) if shares_fingerprint else None
+        
+        matches = []
+        for row in candidates:
+            other_key, other_content, other_hash, _, _ = row
+            distance = (hamming_distance(perceptual_hash, other_hash)
+                        if perceptual_hash is not None and other_hash is not None else None)
+            if target_key is not None and other_content == content_hash and self._exact_key(row) == target_key:
+                matches.append({"file_path": other_key, "kind": "exact", "distance": distance})
+            elif (distance is not None and distance <= self.max_distance and is_distinctive(other_hash)
+                  and self._confirmed(target, row, profiles)):
+                matches.append({"file_path": other_key, "kind": "near", "distance": distance})
+        
+        matches.sort(key=lambda match: (match["kind"] != "exact", match["distance"] or 0, match["file_path"]))
+        return matches
+    
+    def export(self, groups: List[Dict], output_path: Union[str, Path]) -> int:
+        """
+        Write duplicate groups to a report file.
+        A .json path receives the groups as returned by find_groups; any
+        other path is written as CSV with one row per group member.
+        
+        Args:
+            groups: Groups from find_groups
+            output_path: Report file to create
+        
+        Returns:
+            Number of member rows written
+        """
+        output_path = Path(output_path)
+        rows = sum(len(group["members"]) for group in groups)
+        
+        if output_path.suffix.lower() == ".json":
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(groups, f, indent=2)
+            return rows
+        
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["group", "kind", "wasted_bytes", "file_path", "file_size", "duration", "distance"])
+            for group in groups:
+                for member in group["members"]:
+                    writer.writerow([
+                        group["id"], group["kind"], group["wasted_bytes"], member["file_path"],
+                        member["file_size"], member["duration"],
+                        "" if member["distance"] is None else member["distance"]
+                    ])
+        return rows
@@ -0,0 +1,131 @@
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class _VerificationWorker(QObject):
+    """Checks indexed files against the filesystem off the GUI thread, one directory listing at a time."""
+    
+    entries_removed = pyqtSignal(list)  # file keys removed from the index
+    
+    def __init__(self, sample_manager, ttl_seconds: float, max_directories_per_pass: int):
+        super().__init__()
+        self.sample_manager = sample_manager
+        self.ttl_seconds = ttl_seconds
+        self.max_directories_per_pass = max_directories_per_pass
+        
+        # Directory -> monotonic time of its last verification
+        self._verified_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def verify_due(self):
+        """Verify the directories whose TTL has expired. Invoked through a queued signal."""
+        store = self.sample_manager.library_store
+        now = time.monotonic()
+        
+        with self._lock:
+            due = [directory for directory in store.distinct_directories()
+                   if now - self._verified_at.get(directory, float("-inf")) >= self.ttl_seconds]
+        # Least recently verified first, so large libraries are covered across passes
+        due.sort(key=lambda directory: self._verified_at.get(directory, float("-inf")))
+        
+        missing = []
+        for directory in due[:self.max_directories_per_pass]:
+            if (directory_missing := self._missing_in_directory(directory)) is not None:
+                missing.extend(directory_missing)
+                with self._lock:
+                    self._verified_at[directory] = time.monotonic()
+        
+        if missing:
+            store.delete_many(missing)
+            for file_key in missing:
+                logger.info(f"Removing invalid cache entry: {file_key}")
+            self.entries_removed.emit(missing)
+    
+    def expire(self, directory: Optional[str] = None):
+        """Force a directory (or every directory) to be verified on the next pass."""
+        with self._lock:
+            if directory is None:
+                self._verified_at.clear()
+            else:
+                self._verified_at.pop(directory, None)
+    
+    def _missing_in_directory(self, directory: str) -> Optional[List[str]]:
+        """
+        Indexed files of a directory that no longer exist.
+        One directory listing replaces a resolve() and exists() per file.
+        
+        Returns:
+            Missing file keys, or None if the directory could not be checked
+        """
+        indexed = self.sample_manager.library_store.get_file_signatures(directory)
+        try:
+            with os.scandir(directory) as entries:
+                present = {entry.name for entry in entries}
+        except FileNotFoundError:
+            present = set()
+        except OSError as e:
+            logger.warning(f"Could not verify {directory}: {e}")
+            return None
+        
+        return [file_key for file_key in indexed if os.path.basename(file_key) not in present]
+
+class ExistenceVerifier(QObject):
+    """
+    Background verifier that drops index entries whose files were deleted.
+    Each indexed directory is re-checked at most once per TTL, so reading the
+    library (get_samples) never has to touch the filesystem.
+    """
+    
+    # Signals for UI updates
+    entries_removed = pyqtSignal(list)  # file keys removed from the index
+    _verify_requested = pyqtSignal()
+    
+    def __init__(self, sample_manager, ttl_seconds: float = 300.0, check_interval_ms: int = 30000,
+                 max_directories_per_pass: int = 500, parent: Optional[QObject] = None):
+        """
+        Args:
+            sample_manager: UniversalSampleManager whose index is verified
+            ttl_seconds: Minimum time between two checks of the same directory
+            check_interval_ms: How often to look for directories whose TTL expired
+            max_directories_per_pass: Upper bound on directories listed per pass
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        
+        self._check_timer = QTimer(self)
+        self._check_timer.setInterval(check_interval_ms)
+        self._check_timer.timeout.connect(self.verify_now)
+        
+        self._thread = QThread(self)
+        self._worker = _VerificationWorker(sample_manager, ttl_seconds, max_directories_per_pass)
+        self._worker.moveToThread(self._thread)
+        self._verify_requested.connect(self._worker.verify_due)
+        self._worker.entries_removed.connect(self.entries_removed)
+        self._thread.finished.connect(self._worker.deleteLater)
+    
+    def start(self):
+        """Run a first pass over every directory, then keep checking periodically."""
+        self._thread.start()
+        self._check_timer.start()
+        self.verify_now()
+    
+    def stop(self):
+        """Stop verifying and wait for a running pass to finish."""
+        self._check_timer.stop()
+        self._thread.quit()
+        self._thread.wait()
+    
+    def verify_now(self):
+        """Queue a pass over the directories that are due."""
+        self._verify_requested.emit()
+    
+    def expire(self, directory: Optional[str] = None):
+        """Mark a directory (or all of them) for re-verification on the next pass."""
+        self._worker.expire(directory)
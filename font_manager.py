@@ -1,6 +1,6 @@
 import os
-from PyQt6.QtGui import QFontDatabase, QFont, QIcon
-from PyQt6.QtCore import QStandardPaths
+from PyQt6.QtGui import QFontDatabase, QFont, QIcon, QPixmap, QPainter, QColor, QGuiApplication
+from PyQt6.QtCore import QStandardPaths, Qt
 import logging
 
 logger = logging.getLogger(__name__)
@@ -130,7 +130,13 @@ class FontManager:
         return self.fonts_loaded and self.funnel_family in QFontDatabase.families()
 
 class MaterialSymbolsIcon:
-    """Material Symbols icon manager using the loaded font."""
+    """
+    Material Symbols icon manager using the loaded font.
+    Rendered glyphs are cached process-wide: pixmaps per (symbol, size,
+    color, device pixel ratio) and QIcons per (symbol, size, color, screen
+    pixel ratios), so building a tree or list reuses one QIcon per glyph
+    instead of rasterizing it for every row.
+    """
     
     # Material Symbols Unicode mappings
     SYMBOLS = {
@@ -144,6 +150,7 @@ class MaterialSymbolsIcon:
         'INFO': '\ue88e',
         'PLAY': '\ue037',
         'PAUSE': '\ue034',
+        'CLOSE': '\ue5cd',
         'VOLUME': '\ue050',
         'VOLUME_MUTE': '\ue04f',
         'DOCUMENT': '\ue873',
@@ -158,22 +165,43 @@ class MaterialSymbolsIcon:
         'EDIT': '\ue3c9'
     }
     
-    def __init__(self, symbol_name, size=24):
+    # Default glyph color (white for dark theme)
+    DEFAULT_COLOR = (255, 255, 255, 255)
+    
+    # Process-wide render caches (GUI thread only)
+    _pixmap_cache = {}
+    _icon_cache = {}
+    
+    def __init__(self, symbol_name, size=24, color=None):
         self.symbol_name = symbol_name
         self.size = size
+        self.color = tuple(color) if color is not None else self.DEFAULT_COLOR
         self.font_manager = get_font_manager()
     
     def icon(self):
-        """Create a QIcon from the Material Symbol."""
+        """Get the QIcon of the Material Symbol, with a pixmap for every screen's pixel ratio."""
         if not self.font_manager.material_symbols_loaded:
             # Fallback to a simple text-based icon
             return QIcon()
         
-        from PyQt6.QtGui import QPixmap, QPainter, QColor
-        from PyQt6.QtCore import Qt
+        ratios = _screen_pixel_ratios()
+        key = (self.symbol_name, self.size, self.color, ratios)
+        if (icon := self._icon_cache.get(key)) is None:
+            icon = QIcon()
+            for ratio in ratios:
+                icon.addPixmap(self.pixmap(ratio))
+            self._icon_cache[key] = icon
+        return icon
+    
+    def pixmap(self, device_pixel_ratio=1.0):
+        """Get the symbol rendered for a device pixel ratio (cached)."""
+        key = (self.symbol_name, self.size, self.color, device_pixel_ratio)
+        if (pixmap := self._pixmap_cache.get(key)) is not None:
+            return pixmap
         
-        # Create a pixmap
-        pixmap = QPixmap(self.size, self.size)
+        # Render at physical resolution so HiDPI screens get sharp glyphs
+        physical_size = max(1, round(self.size * device_pixel_ratio))
+        pixmap = QPixmap(physical_size, physical_size)
         pixmap.fill(Qt.GlobalColor.transparent)
         
         # Create painter
@@ -182,11 +210,9 @@ class MaterialSymbolsIcon:
         
         # Set up font
         font = QFont(self.font_manager.material_symbols_family)
-        font.setPixelSize(self.size)
+        font.setPixelSize(physical_size)
         painter.setFont(font)
-        
-        # Set color (white for dark theme)
-        painter.setPen(QColor(255, 255, 255))
+        painter.setPen(QColor(*self.color))
         
         # Draw the symbol
         symbol_char = self.SYMBOLS.get(self.symbol_name, '\ue88e')  # Default to info icon
@@ -194,12 +220,40 @@ class MaterialSymbolsIcon:
         
         painter.end()
         
-        return QIcon(pixmap)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        self._pixmap_cache[key] = pixmap
+        return pixmap
+    
+    @classmethod
+    def prewarm(cls, sizes=(14, 16, 18, 20, 24), color=None):
+        """
+        Render every symbol at the given sizes ahead of time (call once the fonts are loaded).
+        
+        Returns:
+            Number of icons in the cache
+        """
+        for symbol_name in cls.SYMBOLS:
+            for size in sizes:
+                cls(symbol_name, size, color).icon()
+        return len(cls._icon_cache)
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop every cached pixmap and icon (e.g. after the symbol font changed)."""
+        cls._pixmap_cache.clear()
+        cls._icon_cache.clear()
+
+def _screen_pixel_ratios():
+    """Distinct device pixel ratios of the connected screens, always including 1.0."""
+    ratios = {1.0}
+    if QGuiApplication.instance() is not None:
+        ratios.update(screen.devicePixelRatio() for screen in QGuiApplication.screens())
+    return tuple(sorted(ratios))
 
 # Icon creation functions to replace FluentIcon usage
-def MaterialIcon(symbol_name, size=24):
+def MaterialIcon(symbol_name, size=24, color=None):
     """Create a Material Symbols icon."""
-    return MaterialSymbolsIcon(symbol_name, size)
+    return MaterialSymbolsIcon(symbol_name, size, color)
 
 # Global font manager instance - will be initialized when first accessed
 font_manager = None
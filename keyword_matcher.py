@@ -0,0 +1,225 @@
+import re
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Ordered (label, keywords) rules; a plain dict is read in insertion order
+KeywordRules = Union[Dict[str, List[str]], List[Tuple[str, List[str]]]]
+
+# Category classification mappings
+CATEGORY_KEYWORDS = {
+    'Bass': ['bass', '808', 'sub', 'low'],
+    'Drums': ['kick', 'snare', 'hat', 'hh', 'cymbal', 'perc', 'drum', 'clap', 'tom', 'rim', 'crash', 'ride'],
+    'FX': ['fx', 'effect', 'sweep', 'riser', 'impact', 'ambient', 'foley'],
+    'Melodic': ['lead', 'melody', 'synth', 'key', 'pad', 'pluck', 'chord'],
+    'Vocals': ['vocal', 'voice', 'chop', 'phrase', 'word']
+}
+
+# Improved drum type detection with separated hi-hat types
+DRUM_TYPE_KEYWORDS = {
+    'kick': ['kick', 'bd', 'bassdrum'],
+    'snare': ['snare', 'sd'],
+    'clap': ['clap', 'handclap'],
+    'closed_hihat': ['closed hat', 'closehat', 'closed_hat', 'chh', 'cl hat', 'clhat', 'close hat'],
+    'open_hihat': ['open hat', 'openhat', 'open_hat', 'ohh', 'op hat', 'ophat'],
+    'hihat': ['hat', 'hh', 'hihat', 'hi-hat', 'hi_hat'],  # Generic hi-hat fallback
+    'cymbal': ['cymbal', 'crash', 'ride', 'splash'],
+    'percussion': ['perc', 'shaker', 'tambourine', 'conga', 'tom', 'rim']
+}
+
+# Keywords matched against file names and paths for each browsable subcategory
+SUBCATEGORY_KEYWORDS = {
+    'kicks': ['kick', 'bd', 'bassdrum', 'bass drum'],
+    'snares': ['snare', 'sd', 'snr'],
+    'claps': ['clap', 'handclap', 'hand clap'],
+    'closed hi-hats': ['closed hat', 'closehat', 'closed_hat', 'chh', 'cl hat', 'clhat', 'close hat'],
+    'open hi-hats': ['open hat', 'openhat', 'open_hat', 'ohh', 'op hat', 'ophat'],
+    'hi-hats': ['hat', 'hh', 'hihat', 'hi-hat', 'hi hat'],  # Fallback for generic hi-hats
+    'cymbals': ['cymbal', 'crash', 'ride', 'splash'],
+    'percussion': ['perc', 'shaker', 'tambourine', 'conga', 'bongo', 'cowbell'],
+    '808': ['808', 'eight', 'sub bass'],
+    'bass loops': ['bass loop', 'bassloop', 'bass'],
+    'electric bass': ['electric bass', 'e-bass'],
+    'synth bass': ['synth bass', 'synthbass'],
+    'melodic loops': ['melodic loop', 'melody loop', 'melodic', 'hook', 'verse', 'bridge'],
+    'keys': ['piano', 'key', 'keys'],
+    'synth leads': ['synth', 'lead'],
+    'pads': ['pad', 'string'],
+    'plucks': ['pluck'],
+    'vocal loops': ['vocal loop', 'vox loop'],
+    'chops': ['chop', 'vocal chop'],
+    'one-shots': ['one shot', 'oneshot', 'hit'],
+    'phrases': ['phrase', 'word', 'lyric'],
+    'risers': ['riser', 'sweep', 'uplifter'],
+    'impacts': ['impact', 'hit', 'stab'],
+    'ambient': ['ambient', 'atmosphere', 'texture'],
+    'foley': ['foley', 'sound effect'],
+    'downlifters': ['downlifter', 'down'],
+    'full loops': ['drum loop', 'drumloop', 'loop']
+}
+
+# Subcategory picked from a file name within each category; the first matching rule wins
+CATEGORY_SUBCATEGORY_RULES = {
+    'drums': [
+        ("Kicks", ['kick', 'bd', 'bassdrum']),
+        ("Snares", ['snare', 'sd', 'snr']),
+        ("Claps", ['clap', 'handclap']),
+        ("Closed Hi-Hats", ['closed hat', 'closehat', 'closed_hat', 'chh', 'cl hat', 'clhat', 'close hat']),
+        ("Open Hi-Hats", ['open hat', 'openhat', 'open_hat', 'ohh', 'op hat', 'ophat']),
+        ("Closed Hi-Hats", ['hat', 'hh', 'hihat', 'hi-hat', 'hi hat']),  # Generic hi-hats default to closed
+        ("Cymbals", ['cymbal', 'crash', 'ride', 'splash']),
+        ("Percussion", ['perc', 'shaker', 'tambourine'])
+    ],
+    'bass': [
+        ("808", ['808', 'eight']),
+        ("Electric Bass", ['electric bass', 'e-bass']),
+        ("Synth Bass", ['synth bass', 'synthbass'])
+    ],
+    'melodic': [
+        ("Keys", ['piano', 'key', 'keys']),
+        ("Synth Leads", ['synth', 'lead']),
+        ("Pads", ['pad', 'string']),
+        ("Plucks", ['pluck'])
+    ],
+    'fx': [
+        ("Risers", ['riser', 'sweep']),
+        ("Impacts", ['impact', 'hit', 'stab']),
+        ("Ambient", ['ambient', 'atmosphere']),
+        ("Foley", ['foley', 'sound effect']),
+        ("Downlifters", ['downlifter', 'down'])
+    ],
+    'vocals': [
+        ("Chops", ['chop', 'vocal chop']),
+        ("Phrases", ['phrase', 'word', 'lyric']),
+        ("One-Shots", ['one shot', 'oneshot', 'hit'])
+    ]
+}
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie of the keywords.
+    At any position it follows the text as far as the trie allows and matches
+    the longest keyword starting there, without trying alternatives one by one.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def node_pattern(node: Dict) -> str:
+        branches = [re.escape(char) + node_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: longer continuations are tried first
+        return f'(?:{body})?' if '' in node else body
+    
+    return node_pattern(trie)
+
+class KeywordHits:
+    """
+    Keywords found in one text, with lookups by rule group.
+    Membership tests replace the per-group `any(keyword in text ...)` scans.
+    """
+    
+    def __init__(self, matcher: 'KeywordMatcher', keywords: Set[str]):
+        self.matcher = matcher
+        self.keywords = keywords
+        
+        # Group -> indexes and labels of its rules with at least one keyword present
+        self._rules_hit: Dict[str, Set[int]] = {}
+        self._labels_hit: Dict[str, Set[str]] = {}
+        for keyword in keywords:
+            for group, index in matcher._keyword_rules.get(keyword, ()):
+                self._rules_hit.setdefault(group, set()).add(index)
+                self._labels_hit.setdefault(group, set()).add(matcher.groups[group][index][0])
+    
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.keywords
+    
+    def matches(self, group: str, label: str) -> bool:
+        """Check whether any rule of the group with this label matched."""
+        return label in self._labels_hit.get(group, ())
+    
+    def any(self, group: str) -> bool:
+        """Check whether any rule of the group matched."""
+        return bool(self._rules_hit.get(group))
+    
+    def labels(self, group: str) -> List[str]:
+        """Labels of the matched rules of a group, in rule order."""
+        rules = self.matcher.groups[group]
+        labels = []
+        for index in sorted(self._rules_hit.get(group, ())):
+            if rules[index][0] not in labels:
+                labels.append(rules[index][0])
+        return labels
+    
+    def first(self, group: str, default: Optional[str] = None) -> Optional[str]:
+        """Label of the first matched rule of a group, mirroring an if/elif chain."""
+        if indexes := self._rules_hit.get(group):
+            return self.matcher.groups[group][min(indexes)][0]
+        return default
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher for filename classification.
+    All keywords of all rule groups are compiled into one trie-shaped regex,
+    so a single pass over the lowercased text finds every category and
+    subcategory keyword it contains. The regex reports the longest keyword
+    at each position; keywords contained in it are added from a precomputed
+    table, which makes the result identical to testing each keyword with `in`.
+    """
+    
+    def __init__(self, groups: Dict[str, KeywordRules]):
+        """
+        Args:
+            groups: Rule group name -> ordered (label, keywords) rules
+        """
+        self.groups: Dict[str, List[Tuple[str, List[str]]]] = {
+            name: list(rules.items()) if isinstance(rules, dict) else list(rules)
+            for name, rules in groups.items()
+        }
+        
+        # Keyword -> (group, rule index) of every rule listing it
+        self._keyword_rules: Dict[str, List[Tuple[str, int]]] = {}
+        for name, rules in self.groups.items():
+            for index, (_, keywords) in enumerate(rules):
+                for keyword in keywords:
+                    self._keyword_rules.setdefault(keyword.lower(), []).append((name, index))
+        
+        keywords = sorted(self._keyword_rules)
+        # Every keyword occurring inside another one (e.g. 'hat' in 'closed hat')
+        self._contained: Dict[str, Set[str]] = {
+            keyword: {other for other in keywords if other in keyword} for keyword in keywords
+        }
+        self._pattern = re.compile(f'(?=({_trie_pattern(keywords)}))') if keywords else None
+        
+        logger.debug(f"Compiled {len(keywords)} keywords from {len(self.groups)} rule groups")
+    
+    def scan(self, text: str) -> KeywordHits:
+        """
+        Find every keyword contained in a text (matched case-insensitively).
+        
+        Args:
+            text: File name or path
+        
+        Returns:
+            KeywordHits for the text
+        """
+        found: Set[str] = set()
+        if self._pattern is not None and text:
+            for longest in set(self._pattern.findall(text.lower())):
+                found |= self._contained[longest]
+        return KeywordHits(self, found)
+
+# Global instance shared by the analyzer (index time) and the sample manager (query time)
+keyword_matcher = KeywordMatcher({
+    'category': CATEGORY_KEYWORDS,
+    'drum_type': DRUM_TYPE_KEYWORDS,
+    'subcategory': SUBCATEGORY_KEYWORDS,
+    **{f'{category}_subcategory': rules for category, rules in CATEGORY_SUBCATEGORY_RULES.items()}
+})
@@ -0,0 +1,90 @@
+import logging
+import threading
+from typing import List
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class LibraryImportWorker(QObject):
+    """
+    Runs the scan -> index -> analyze pipeline for a batch of directories.
+    Meant to be moved onto a QThread so the GUI stays responsive. Per-file
+    progress of this import is reported through file_progress rather than
+    the sample manager's analysis_progress, which library refreshes on other
+    threads also emit.
+    """
+    
+    # Signals for UI updates
+    directory_started = pyqtSignal(str)  # directory_path
+    directory_finished = pyqtSignal(str, int)  # directory_path, new_files
+    directory_failed = pyqtSignal(str, str)  # directory_path, error_message
+    file_progress = pyqtSignal(int, int)  # current, total (files of the current directory)
+    pause_changed = pyqtSignal(bool)  # paused
+    finished = pyqtSignal(int, bool)  # total_new_files, cancelled
+    
+    def __init__(self, sample_manager, directories: List[str], auto_analyze: bool = True):
+        super().__init__()
+        self.sample_manager = sample_manager
+        self.directories = list(directories)
+        self.auto_analyze = auto_analyze
+        
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+    
+    def run(self):
+        """Import every directory in turn. Invoked from QThread.started."""
+        total_new_files = 0
+        
+        for directory in self.directories:
+            if self._should_stop():
+                break
+            
+            self.directory_started.emit(directory)
+            try:
+                new_files = self.sample_manager.add_directory_to_index(
+                    directory, auto_analyze=self.auto_analyze, should_stop=self._should_stop,
+                    progress=self.file_progress.emit
+                )
+                total_new_files += new_files
+                self.directory_finished.emit(directory, new_files)
+            except Exception as e:
+                logger.error(f"Failed to import from {directory}: {e}")
+                self.directory_failed.emit(directory, str(e))
+        
+        cancelled = self._cancelled.is_set()
+        if cancelled:
+            logger.info(f"Import cancelled after {total_new_files} new files")
+        self.finished.emit(total_new_files, cancelled)
+    
+    def cancel(self):
+        """Stop after the files currently being analyzed. Safe to call from any thread."""
+        self._cancelled.set()
+        self._running.set()  # Wake a paused worker so it can exit
+    
+    def pause(self):
+        """Hold the import at the next file boundary."""
+        if self._running.is_set() and not self._cancelled.is_set():
+            self._running.clear()
+            self.pause_changed.emit(True)
+    
+    def resume(self):
+        """Continue a paused import."""
+        if not self._running.is_set():
+            self._running.set()
+            self.pause_changed.emit(False)
+    
+    def is_paused(self) -> bool:
+        """Check if the import is currently paused."""
+        return not self._running.is_set()
+    
+    def is_cancelled(self) -> bool:
+        """Check if the import has been cancelled."""
+        return self._cancelled.is_set()
+    
+    def _should_stop(self) -> bool:
+        """Block while paused, then report whether the import was cancelled."""
+        self._running.wait()
+        return self._cancelled.is_set()
@@ -0,0 +1,158 @@
+import os
+import logging
+import threading
+from typing import Dict, List, Optional, Set
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QThread, QTimer, pyqtSignal
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class _DirectorySyncWorker(QObject):
+    """Runs incremental directory refreshes (including analysis) off the GUI thread."""
+    
+    synced = pyqtSignal(str, object)  # directory_path, refresh stats (None if the directory was removed)
+    
+    def __init__(self, sample_manager):
+        super().__init__()
+        self.sample_manager = sample_manager
+        self._stopping = threading.Event()
+    
+    def sync(self, directories: List[str]):
+        """Refresh each tracked directory in turn. Invoked through a queued signal."""
+        for directory in directories:
+            if self._stopping.is_set():
+                break
+            try:
+                stats = self.sample_manager.refresh_directory(directory, should_stop=self._stopping.is_set)
+            except Exception as e:
+                logger.error(f"Failed to sync {directory}: {e}")
+                continue
+            self.synced.emit(directory, stats)
+    
+    def stop(self):
+        """Stop after the files currently being analyzed."""
+        self._stopping.set()
+
+class LibraryWatcher(QObject):
+    """
+    Keeps the index in sync with the tracked directories while the app runs.
+    Every indexed directory is watched with QFileSystemWatcher (inotify, FSEvents
+    or ReadDirectoryChangesW depending on the platform). Bursts of create, delete
+    and rename events are debounced and coalesced per tracked directory, then
+    applied as one incremental refresh on a background thread, which also
+    analyzes the new files. Directories the OS refuses to watch (for example
+    when the inotify watch limit is reached) are polled instead.
+    """
+    
+    # Signals for UI updates
+    index_updated = pyqtSignal(str, dict)  # directory_path, refresh stats
+    _sync_requested = pyqtSignal(list)  # tracked directories to refresh
+    
+    def __init__(self, sample_manager, debounce_ms: int = 1000, poll_interval_ms: int = 60000,
+                 parent: Optional[QObject] = None):
+        """
+        Args:
+            sample_manager: UniversalSampleManager whose tracked directories are watched
+            debounce_ms: Quiet period after the last event before a refresh runs
+            poll_interval_ms: Refresh interval for directories that cannot be watched
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.sample_manager = sample_manager
+        
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        
+        # Watched directory -> tracked directory it belongs to
+        self._watched_roots: Dict[str, str] = {}
+        self._pending_roots: Set[str] = set()
+        self._polled_roots: Set[str] = set()
+        
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self._flush_pending)
+        
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self._poll_unwatched)
+        
+        self._thread = QThread(self)
+        self._worker = _DirectorySyncWorker(sample_manager)
+        self._worker.moveToThread(self._thread)
+        self._sync_requested.connect(self._worker.sync)
+        self._worker.synced.connect(self._on_directory_synced)
+        self._thread.finished.connect(self._worker.deleteLater)
+    
+    def start(self):
+        """Start watching and catch up on changes made while the app was closed."""
+        self._thread.start()
+        self.update_watch_list()
+        self._sync_requested.emit(sorted(self.sample_manager.get_tracked_directories()))
+    
+    def stop(self):
+        """Stop watching and wait for a running refresh to finish."""
+        self._debounce_timer.stop()
+        self._poll_timer.stop()
+        self._worker.stop()
+        self._thread.quit()
+        self._thread.wait()
+    
+    def update_watch_list(self):
+        """Watch exactly the tracked directories and their indexed subdirectories."""
+        desired: Dict[str, str] = {}
+        for root in self.sample_manager.get_tracked_directories():
+            desired[root] = root
+            for directory in self.sample_manager.get_indexed_subdirectories(root):
+                desired.setdefault(directory, root)
+        
+        if stale := [path for path in self._watched_roots if path not in desired]:
+            self._watcher.removePaths(stale)
+        
+        added = [path for path in desired if path not in self._watched_roots]
+        failed = set(self._watcher.addPaths(added)) if added else set()
+        
+        self._watched_roots = {path: root for path, root in desired.items() if path not in failed}
+        self._polled_roots = {desired[path] for path in failed}
+        if failed:
+            logger.warning(f"Could not watch {len(failed)} directories; polling them instead")
+        
+        if self._polled_roots and not self._poll_timer.isActive():
+            self._poll_timer.start()
+        elif not self._polled_roots:
+            self._poll_timer.stop()
+    
+    def _root_for(self, path: str) -> Optional[str]:
+        """Find the tracked directory a watched path belongs to."""
+        if (root := self._watched_roots.get(path)) is not None:
+            return root
+        return self._watched_roots.get(os.path.normpath(path))
+    
+    def _on_directory_changed(self, path: str):
+        """Queue the owning tracked directory and restart the quiet period."""
+        if (root := self._root_for(path)) is None:
+            return
+        self._pending_roots.add(root)
+        self._debounce_timer.start()
+    
+    def _poll_unwatched(self):
+        """Refresh directories that could not be watched."""
+        self._pending_roots.update(self._polled_roots)
+        self._flush_pending()
+    
+    def _flush_pending(self):
+        """Hand the coalesced set of changed directories to the background worker."""
+        if not self._pending_roots:
+            return
+        roots = sorted(self._pending_roots)
+        self._pending_roots.clear()
+        self._sync_requested.emit(roots)
+    
+    def _on_directory_synced(self, directory: str, stats: Optional[Dict]):
+        """Pick up new or removed subdirectories and report index changes."""
+        self.update_watch_list()
+        if stats is None:
+            self.index_updated.emit(directory, {"removed_directory": True})
+        elif stats["new_files"] or stats["removed_files"] or stats["updated_files"]:
+            self.index_updated.emit(directory, stats)
@@ -0,0 +1,85 @@
+import logging
+from typing import Optional
+
+import numpy as np
+
+from audio_embedding import mel_power_frames
+from frame_energy import FrameEnergy
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Bump whenever the hash changes; hashes of another version are not compared
+PERCEPTUAL_HASH_VERSION = 1
+
+# The hash describes this much audio after the first onset
+MAX_SECONDS = 4.0
+
+# Leading audio quieter than this relative to the peak is skipped (dB)
+ONSET_THRESHOLD_DB = -40.0
+
+# Energy grid: 9 frequency bands x 9 time slices give 8 x 8 = 64 difference bits
+HASH_BANDS = 9
+HASH_SLICES = 9
+
+# Hamming distance up to which two hashes count as the same sound
+NEAR_DUPLICATE_DISTANCE = 4
+
+# Hashes with fewer set (or clear) bits than this are too uniform to tell
+# sounds apart: low tonal one-shots (sines, 808s, kicks) have one band above
+# the 40 dB floor, so their hashes are all (nearly) zero
+MIN_HASH_BITS = 2 * NEAR_DUPLICATE_DISTANCE
+
+def compute_perceptual_hash(y: np.ndarray, sr: int, hop_length: int = 512) -> Optional[int]:
+    """
+    Compute a 64-bit perceptual hash of a sample's sound.
+    Leading silence is skipped, the next few seconds are reduced to a grid
+    of log band energies over evenly divided time slices, and each bit is the
+    sign of a band-energy difference across neighbouring bands and slices
+    (the Haitsma-Kalker scheme). The bits depend only on the spectral shape
+    and its evolution, so gain changes, resampling, format conversion and
+    padding with silence leave the hash (nearly) unchanged.
+    
+    Args:
+        y: Mono audio signal
+        sr: Sample rate of the signal
+        hop_length: Frame length used to find the first onset
+    
+    Returns:
+        Hash as a signed 64-bit integer (SQLite's INTEGER range), or None for
+        silent or empty audio
+    """
+    y = np.asarray(y, dtype=np.float32)
+    rms = FrameEnergy(y, hop_length).rms
+    if len(y) == 0 or not np.any(y):
+        return None
+    
+    # Skip leading silence so trimmed and untrimmed copies line up
+    if len(rms) and (peak := np.max(rms)) > 0:
+        start = int(np.argmax(rms >= peak * 10 ** (ONSET_THRESHOLD_DB / 20))) * hop_length
+    else:
+        start = 0
+    segment = y[start:start + int(MAX_SECONDS * sr)]
+    
+    mel = mel_power_frames(segment, sr)
+    if len(mel) < HASH_SLICES:
+        mel = np.repeat(mel, -(-HASH_SLICES // len(mel)), axis=0)
+    # Group mel bands into the hash bands and frames into the time slices
+    bands = np.stack([part.sum(axis=1) for part in np.array_split(mel, HASH_BANDS, axis=1)], axis=1)
+    grid = np.stack([part.sum(axis=0) for part in np.array_split(bands, HASH_SLICES, axis=0)])
+    # Cells more than 40 dB below the loudest are equally silent, so the
+    # noise floor of a decayed tail does not produce random bits
+    grid = np.log10(np.maximum(grid, grid.max() * 1e-4 + 1e-20))
+    
+    band_slope = grid[:, :-1] - grid[:, 1:]
+    bits = (band_slope[1:] - band_slope[:-1]) > 0
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big", signed=True)
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin((a ^ b) & 0xFFFFFFFFFFFFFFFF).count("1")
+
+def is_distinctive(perceptual_hash: int) -> bool:
+    """Whether a hash has enough structure to be used for near-duplicate matching."""
+    set_bits = hamming_distance(perceptual_hash, 0)
+    return MIN_HASH_BITS <= set_bits <= 64 - MIN_HASH_BITS
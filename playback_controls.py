@@ -165,6 +165,8 @@ class PlaybackControls(QWidget):
         self.audio_player.playback_state_changed.connect(self.on_playback_state_changed)
         self.audio_player.volume_changed.connect(self.on_audio_volume_changed)
         self.audio_player.error_occurred.connect(self.on_playback_error)
+        self.audio_player.media_loaded.connect(self.on_media_loaded)
+        self.audio_player.load_failed.connect(self.on_load_failed)
     
     def setup_keyboard_shortcuts(self):
         """Setup keyboard shortcuts for playback control."""
@@ -179,28 +181,42 @@ class PlaybackControls(QWidget):
         self.right_shortcut = QShortcut(QKeySequence(Qt.Key.Key_Right), self)
         self.right_shortcut.activated.connect(lambda: self.seek_relative(5000))  # +5 seconds
     
-    def load_sample(self, file_path: str) -> bool:
+    def load_sample(self, file_path: str, autoplay: bool = False) -> bool:
         """
-        Load a sample for playback.
+        Start loading a sample for playback. The player loads it in the
+        background; file_loaded is emitted once it is ready.
         
         Args:
             file_path: Path to the audio file
+            autoplay: Start playback as soon as the sample is loaded
             
         Returns:
-            bool: True if loaded successfully
+            bool: True if loading started
         """
+        # Set first: samples in the preview pool report media_loaded from within load_file
+        self.current_sample_path = file_path
+        self.sample_info_label.setText(f"Loading: {Path(file_path).name}")
+        self.set_enabled(True)
         if not self.audio_player.load_file(file_path):
-            self.current_sample_path = None
-            self.sample_info_label.setText("Failed to load sample")
-            self.set_enabled(False)
             return False
-            
-        self.current_sample_path = file_path
+        
+        if autoplay:
+            self.audio_player.play()
+        return True
+    
+    def on_media_loaded(self, file_path: str):
+        """Handle a sample becoming ready to play."""
+        if file_path != self.current_sample_path:
+            return
         self.sample_info_label.setText(f"Loaded: {Path(file_path).name}")
-        self.set_enabled(True)
         self.file_loaded.emit(file_path)
         logger.info(f"Sample loaded in playback controls: {Path(file_path).name}")
-        return True
+    
+    def on_load_failed(self, file_path: str):
+        """Handle a sample that could not be loaded."""
+        self.current_sample_path = None
+        self.sample_info_label.setText("Failed to load sample")
+        self.set_enabled(False)
     
     def toggle_playback(self):
         """Toggle play/pause."""
@@ -0,0 +1,898 @@
+import os
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from search_index import SampleSearchIndex
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SampleLibraryStore:
+    """
+    SQLite-backed library store for sample analyses and tracked directories.
+    Every write touches only the affected rows and runs in its own transaction,
+    so the library never has to be serialized or loaded as a whole.
+    """
+
+    SCHEMA_VERSION = 5
+
+    # Analysis fields stored in dedicated columns: (field name, SQL type, value kind)
+    COLUMNS = [
+        ("file_name", "TEXT", "text"),
+        ("directory", "TEXT", "text"),
+        ("file_size", "INTEGER", "int"),
+        ("duration", "REAL", "real"),
+        ("sample_rate", "INTEGER", "int"),
+        ("sample_type", "TEXT", "text"),
+        ("category", "TEXT", "text"),
+        ("bpm", "REAL", "real"),
+        ("key", "TEXT", "text"),
+        ("overall_confidence", "REAL", "real"),
+        ("error", "TEXT", "text"),
+        ("cpu_type", "TEXT", "text"),
+        ("analyzed", "INTEGER", "bool"),
+        ("analyzer_version", "TEXT", "text"),
+        ("analysis_timestamp", "INTEGER", "int"),
+        ("hihat_subcategory", "TEXT", "text"),
+        ("manual_override", "INTEGER", "bool"),
+        ("manual_category", "TEXT", "text"),
+        ("manual_subcategory", "TEXT", "text"),
+        ("manual_key", "TEXT", "text"),
+        ("analysis_methods", "TEXT", "json"),
+        ("characteristics", "TEXT", "json"),
+        ("confidence_scores", "TEXT", "json"),
+        ("content_hash", "TEXT", "text"),
+        ("file_mtime_ns", "INTEGER", "int"),
+        ("file_inode", "INTEGER", "int"),
+        ("embedding", "BLOB", "vector"),
+        ("perceptual_hash", "INTEGER", "int"),
+    ]
+
+    # Fields that are always present in an analysis even when their value is None
+    ALWAYS_PRESENT = {"error"}
+
+    # How many writes happen between journal size checks
+    JOURNAL_CHECK_INTERVAL = 64
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        
+        # Write-ahead journal state
+        self.journal_enabled = False
+        self.compaction_threshold = 0
+        self._writes_since_check = 0
+        self._compaction_thread = None
+        
+        # Maps (file_key, analysis) to the (category, subcategory) pairs the sample
+        # belongs to; set by the owner to maintain the subcategory index
+        self._subcategory_resolver = None
+        
+        # Objects notified after sample rows change (see add_change_listener)
+        self._change_listeners = []
+        
+        self._column_names = [name for name, _, _ in self.COLUMNS]
+        self._column_kinds = {name: kind for name, _, kind in self.COLUMNS}
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._create_schema()
+        self.search_index = SampleSearchIndex(self._conn)
+
+        # Prebuilt statements
+        all_columns = ["file_path"] + self._column_names + ["extra"]
+        self._select_columns = ", ".join(f'"{name}"' for name in all_columns)
+        placeholders = ", ".join("?" for _ in all_columns)
+        self._upsert_sql = f'INSERT OR REPLACE INTO samples ({self._select_columns}) VALUES ({placeholders})'
+
+        self._ensure_search_index()
+
+    def _create_schema(self):
+        """Create tables and indexes if they do not exist yet."""
+        column_defs = ",\n".join(f'    "{name}" {sql_type}' for name, sql_type, _ in self.COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS samples (
+                    "file_path" TEXT PRIMARY KEY,
+                {column_defs},
+                    "extra" TEXT
+                )
+            """)
+            # Columns added after a library was created are appended in place
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(samples)")}
+            for name, sql_type, _ in self.COLUMNS:
+                if name not in existing:
+                    self._conn.execute(f'ALTER TABLE samples ADD COLUMN "{name}" {sql_type}')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_samples_category ON samples(lower(category))")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_samples_manual_category ON samples(lower(manual_category))")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_samples_directory ON samples(directory)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_samples_content_hash ON samples(content_hash)")
+            # Inverted index of browsable (category, subcategory) nodes to their samples
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sample_subcategories "
+                "(category TEXT, subcategory TEXT, file_path TEXT, "
+                "PRIMARY KEY (category, subcategory, file_path)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sample_subcategories_file ON sample_subcategories(file_path)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS tracked_directories (path TEXT PRIMARY KEY)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scanned_directories "
+                "(root TEXT, path TEXT, parent TEXT, mtime_ns INTEGER, PRIMARY KEY (root, path))"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('schema_version', ?)",
+                (str(self.SCHEMA_VERSION),)
+            )
+
+    def _encode(self, file_key: str, analysis: Dict) -> Tuple:
+        """Convert an analysis dict into a row tuple."""
+        row = [file_key]
+        for name in self._column_names:
+            value = analysis.get(name)
+            kind = self._column_kinds[name]
+            if value is None:
+                row.append(None)
+            elif kind == "json":
+                row.append(json.dumps(value, separators=(",", ":")))
+            elif kind == "vector":
+                row.append(np.asarray(value, dtype=np.float32).tobytes())
+            elif kind == "bool":
+                row.append(1 if value else 0)
+            elif kind == "int":
+                row.append(int(value))
+            elif kind == "real":
+                row.append(float(value))
+            else:
+                row.append(str(value))
+
+        extra = {k: v for k, v in analysis.items() if k not in self._column_kinds and k != "file_path"}
+        row.append(json.dumps(extra, separators=(",", ":")) if extra else None)
+        return tuple(row)
+
+    def _decode(self, row: Tuple) -> Dict:
+        """Convert a row tuple back into an analysis dict."""
+        analysis = {"file_path": row[0]}
+        for name, value in zip(self._column_names, row[1:-1]):
+            if value is None:
+                if name in self.ALWAYS_PRESENT:
+                    analysis[name] = None
+                continue
+            kind = self._column_kinds[name]
+            if kind == "json":
+                analysis[name] = json.loads(value)
+            elif kind == "vector":
+                analysis[name] = np.frombuffer(value, dtype=np.float32).tolist()
+            elif kind == "bool":
+                analysis[name] = bool(value)
+            else:
+                analysis[name] = value
+
+        if row[-1]:
+            analysis.update(json.loads(row[-1]))
+        return analysis
+
+    # Sample rows
+
+    def get(self, file_key: str) -> Optional[Dict]:
+        """Fetch a single analysis by its file key."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._select_columns} FROM samples WHERE file_path = ?", (file_key,)
+            ).fetchone()
+        return self._decode(row) if row else None
+
+    def put(self, file_key: str, analysis: Dict):
+        """Insert or replace a single analysis."""
+        row = self._encode(file_key, analysis)
+        memberships = self._resolve_subcategories([(file_key, analysis)])
+        with self._lock, self._conn:
+            self._conn.execute(self._upsert_sql, row)
+            self._write_subcategories([file_key], memberships)
+            self.search_index.write([(file_key, analysis)])
+        self._note_write()
+        self._notify("samples_written", [(file_key, analysis)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict]]):
+        """Insert or replace several analyses in one transaction."""
+        items = list(items)
+        rows = [self._encode(file_key, analysis) for file_key, analysis in items]
+        if not rows:
+            return
+        memberships = self._resolve_subcategories(items)
+        with self._lock, self._conn:
+            self._conn.executemany(self._upsert_sql, rows)
+            self._write_subcategories([file_key for file_key, _ in items], memberships)
+            self.search_index.write(items)
+        self._note_write(len(rows))
+        self._notify("samples_written", items)
+
+    def delete(self, file_key: str) -> bool:
+        """Delete a single analysis. Returns True if a row was removed."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM samples WHERE file_path = ?", (file_key,))
+            self._conn.execute("DELETE FROM sample_subcategories WHERE file_path = ?", (file_key,))
+            self.search_index.delete([file_key])
+        self._note_write()
+        if cursor.rowcount > 0:
+            self._notify("samples_deleted", [file_key])
+        return cursor.rowcount > 0
+
+    def delete_many(self, file_keys: Iterable[str]) -> int:
+        """Delete several analyses in one transaction. Returns the number removed."""
+        keys = [(file_key,) for file_key in file_keys]
+        if not keys:
+            return 0
+        with self._lock, self._conn:
+            cursor = self._conn.executemany("DELETE FROM samples WHERE file_path = ?", keys)
+            removed = cursor.rowcount
+            self._conn.executemany("DELETE FROM sample_subcategories WHERE file_path = ?", keys)
+            self.search_index.delete(file_key for file_key, in keys)
+        self._note_write(len(keys))
+        self._notify("samples_deleted", [file_key for file_key, in keys])
+        return removed
+
+    def delete_under_directory(self, directory: str) -> int:
+        """Delete every analysis whose path starts with the given directory."""
+        with self._lock, self._conn:
+            removed_keys = self._keys_for_listeners(
+                "SELECT file_path FROM samples WHERE substr(file_path, 1, ?) = ?", [(len(directory), directory)]
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM samples WHERE substr(file_path, 1, ?) = ?", (len(directory), directory)
+            )
+            removed = cursor.rowcount
+            self._conn.execute(
+                "DELETE FROM sample_subcategories WHERE substr(file_path, 1, ?) = ?", (len(directory), directory)
+            )
+            self.search_index.delete_under_directory(directory)
+        self._note_write(removed)
+        self._notify("samples_deleted", removed_keys)
+        return removed
+
+    def delete_in_directories(self, directories: Iterable[str]) -> int:
+        """Delete every analysis directly inside the given directories (not recursive)."""
+        rows = [(directory,) for directory in directories]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            removed_keys = self._keys_for_listeners("SELECT file_path FROM samples WHERE directory = ?", rows)
+            self._conn.executemany(
+                "DELETE FROM sample_subcategories WHERE file_path IN "
+                "(SELECT file_path FROM samples WHERE directory = ?)", rows
+            )
+            self.search_index.delete_in_directories(rows)
+            removed = self._conn.executemany("DELETE FROM samples WHERE directory = ?", rows).rowcount
+        self._note_write(removed)
+        self._notify("samples_deleted", removed_keys)
+        return removed
+
+    def replace_all(self, items: Iterable[Tuple[str, Dict]]):
+        """Replace the whole sample table in one transaction."""
+        items = list(items)
+        rows = [self._encode(file_key, analysis) for file_key, analysis in items]
+        memberships = self._resolve_subcategories(items)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM samples")
+            self._conn.execute("DELETE FROM sample_subcategories")
+            self.search_index.clear()
+            self._conn.executemany(self._upsert_sql, rows)
+            self._write_subcategories([], memberships)
+            self.search_index.write(items)
+        self._note_write(len(rows) + 1)
+        self._notify("samples_cleared")
+        self._notify("samples_written", items)
+
+    def clear(self):
+        """Delete all analyses and tracked directories."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM samples")
+            self._conn.execute("DELETE FROM sample_subcategories")
+            self.search_index.clear()
+            self._conn.execute("DELETE FROM tracked_directories")
+            self._conn.execute("DELETE FROM scanned_directories")
+        self._notify("samples_cleared")
+
+    def contains(self, file_key: str) -> bool:
+        """Check whether an analysis exists for the file key."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM samples WHERE file_path = ?", (file_key,)).fetchone()
+        return row is not None
+
+    def count(self) -> int:
+        """Number of stored analyses."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+
+    def keys(self) -> List[str]:
+        """All stored file keys."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT file_path FROM samples")]
+
+    def get_many(self, file_keys: List[str]) -> List[Tuple[str, Dict]]:
+        """Fetch several analyses, in the order of the given keys (unknown keys are skipped)."""
+        rows = {}
+        with self._lock:
+            for start in range(0, len(file_keys), 500):
+                chunk = file_keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                for row in self._conn.execute(
+                    f"SELECT {self._select_columns} FROM samples WHERE file_path IN ({placeholders})", chunk
+                ):
+                    rows[row[0]] = row
+        return [(file_key, self._decode(rows[file_key])) for file_key in file_keys if file_key in rows]
+
+    def search(self, query: str, limit: int = 200) -> List[Tuple[str, Dict]]:
+        """
+        Full-text search over file names, directories, categories, types, keys and tags.
+
+        Args:
+            query: Free text as typed (prefix and fuzzy matched)
+            limit: Maximum number of results
+
+        Returns:
+            (file_key, analysis) pairs, best match first
+        """
+        with self._lock:
+            file_keys = self.search_index.search(query, limit)
+        return self.get_many(file_keys)
+
+    def iter_samples(self, category: Optional[str] = None, batch_size: int = 500,
+                     subcategory: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream (file_key, analysis) pairs without materializing the whole table.
+
+        Args:
+            category: Optional effective category (manual override first) to filter on
+            batch_size: Number of rows decoded per fetch
+            subcategory: Optional subcategory to look up in the subcategory index
+                (only meaningful for subcategories the resolver indexes)
+        """
+        where, params = self._sample_filter(category, subcategory)
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(f"SELECT {self._select_columns} FROM samples{where}", params)
+            rows = cursor.fetchmany(batch_size)
+        while rows:
+            for row in rows:
+                yield row[0], self._decode(row)
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+
+    def sample_names(self, category: Optional[str] = None,
+                     subcategory: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """
+        (file_key, file_name) of the samples iter_samples would yield, without decoding analyses.
+        Lets views list a large query and fetch full analyses only for the rows they need.
+        """
+        where, params = self._sample_filter(category, subcategory)
+        with self._lock:
+            return self._conn.execute(f"SELECT file_path, file_name FROM samples{where}", params).fetchall()
+
+    def _sample_filter(self, category: Optional[str], subcategory: Optional[str]) -> Tuple[str, Tuple]:
+        """WHERE clause and parameters selecting an effective category and/or indexed subcategory."""
+        if subcategory:
+            sql = " WHERE file_path IN (SELECT file_path FROM sample_subcategories WHERE subcategory = ?"
+            params: Tuple = (subcategory.lower(),)
+            if category:
+                sql += " AND category = ?"
+                params += (category.lower(),)
+            return sql + ")", params
+        if category:
+            return (" WHERE (manual_override = 1 AND lower(manual_category) = ?)"
+                    " OR (COALESCE(manual_override, 0) = 0 AND lower(category) = ?)"), (category.lower(), category.lower())
+        return "", ()
+
+    def distinct_categories(self) -> List[str]:
+        """All distinct analyzed categories."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT category FROM samples WHERE category IS NOT NULL"
+            )]
+
+    def category_counts(self) -> Dict[str, int]:
+        """Number of distinct samples under each indexed category, keyed in lower case."""
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT category, COUNT(DISTINCT file_path) FROM sample_subcategories GROUP BY category"
+            ).fetchall())
+
+    def _attribute_expressions(self, paths: List[Tuple[str, ...]]) -> str:
+        """SELECT list reading attribute paths from their columns or the extra JSON."""
+        expressions = []
+        for path in paths:
+            if path[0] not in self._column_kinds:
+                expressions.append(f"json_extract(extra, '$.{'.'.join(path)}')")
+            elif len(path) == 1:
+                expressions.append(f'"{path[0]}"')
+            else:
+                expressions.append(f"json_extract(\"{path[0]}\", '$.{'.'.join(path[1:])}')")
+        return ", ".join(expressions)
+
+    def get_attribute_rows(self, file_keys: List[str], paths: List[Tuple[str, ...]]) -> List[Tuple]:
+        """
+        A few attributes of some samples, like iter_attribute_rows.
+
+        Returns:
+            (file_key, *values) tuples of the keys that exist, in no particular order
+        """
+        rows = []
+        with self._lock:
+            for start in range(0, len(file_keys), 500):
+                chunk = file_keys[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows.extend(self._conn.execute(
+                    f"SELECT file_path, {self._attribute_expressions(paths)} FROM samples "
+                    f"WHERE file_path IN ({placeholders})", chunk
+                ).fetchall())
+        return rows
+
+    def duplicate_candidate_rows(self, content_hash: Optional[str], perceptual_hash: Optional[int],
+                                 hash_bands: List[Tuple[int, int]], paths: List[Tuple[str, ...]]) -> List[Tuple]:
+        """
+        Samples that may duplicate one sample: those with the same content
+        fingerprint or sharing at least one band of its perceptual hash.
+        Each band is looked up through an expression index created on first
+        use, so no other rows are read.
+
+        Args:
+            content_hash: Content fingerprint to match, or None
+            perceptual_hash: Perceptual hash whose bands are matched, or None
+            hash_bands: (shift, mask) of each hash band
+            paths: Attribute paths to return, as in iter_attribute_rows
+
+        Returns:
+            (file_key, *values) tuples
+        """
+        conditions, parameters = [], []
+        if content_hash:
+            conditions.append("content_hash = ?")
+            parameters.append(content_hash)
+        if perceptual_hash is not None:
+            for shift, mask in hash_bands:
+                conditions.append(f"((perceptual_hash >> {shift}) & {mask}) = ?")
+                parameters.append((perceptual_hash >> shift) & mask)
+        if not conditions:
+            return []
+
+        with self._lock:
+            if perceptual_hash is not None:
+                with self._conn:
+                    for shift, mask in hash_bands:
+                        self._conn.execute(
+                            f"CREATE INDEX IF NOT EXISTS idx_samples_hash_band_{shift}_{mask} "
+                            f"ON samples(((perceptual_hash >> {shift}) & {mask}))"
+                        )
+            return self._conn.execute(
+                f"SELECT file_path, {self._attribute_expressions(paths)} FROM samples WHERE {' OR '.join(conditions)}",
+                parameters
+            ).fetchall()
+
+    def iter_attribute_rows(self, paths: List[Tuple[str, ...]], batch_size: int = 5000) -> Iterator[Tuple]:
+        """
+        Stream a few attributes of every sample without decoding whole rows.
+
+        Args:
+            paths: Attribute paths, e.g. ("bpm",) or ("characteristics", "rms_mean");
+                fields without a dedicated column are read from the extra JSON
+            batch_size: Number of rows per fetch
+
+        Returns:
+            Iterator of (file_key, *values) tuples
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute(f"SELECT file_path, {self._attribute_expressions(paths)} FROM samples")
+            rows = cursor.fetchmany(batch_size)
+        while rows:
+            yield from rows
+            with self._lock:
+                rows = cursor.fetchmany(batch_size)
+
+    def subcategory_counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of samples per indexed (category, subcategory) node, keyed in lower case."""
+        counts: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for category, subcategory, count in self._conn.execute(
+                "SELECT category, subcategory, COUNT(*) FROM sample_subcategories GROUP BY category, subcategory"
+            ):
+                counts.setdefault(category, {})[subcategory] = count
+        return counts
+
+    def find_by_content_hash(self, content_hash: str, exclude_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        Find an analyzed, error-free entry for the given content fingerprint.
+
+        Args:
+            content_hash: Fingerprint from compute_content_fingerprint
+            exclude_key: File key to skip (usually the file being looked up)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._select_columns} FROM samples "
+                "WHERE content_hash = ? AND file_path != ? AND analyzed = 1 AND error IS NULL "
+                "LIMIT 1",
+                (content_hash, exclude_key or "")
+            ).fetchone()
+        return self._decode(row) if row else None
+
+    def distinct_directories(self) -> List[str]:
+        """All directories that contain indexed files."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT directory FROM samples WHERE directory IS NOT NULL"
+            )]
+
+    def has_unanalyzed_unknowns(self) -> bool:
+        """Check for entries that were never analyzed and have no category."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM samples WHERE category = 'unknown' AND COALESCE(analyzed, 0) = 0 LIMIT 1"
+            ).fetchone()
+        return row is not None
+
+    def has_relative_keys(self) -> bool:
+        """
+        Check for file keys that are not absolute paths (left by old caches).
+        On POSIX absolute keys all sort under "/", so this is two range probes
+        of the primary key index; on Windows the drive/UNC pattern is matched
+        in SQL without loading any keys.
+        """
+        if os.name == "nt":
+            query = ("SELECT 1 FROM samples WHERE NOT (file_path GLOB '[A-Za-z]:[\\/]*' "
+                     "OR file_path GLOB '[\\/][\\/]*') LIMIT 1")
+        else:
+            query = "SELECT 1 FROM samples WHERE file_path < '/' OR file_path >= '0' LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query).fetchone()
+        return row is not None
+
+    def get_file_signatures(self, directory: str) -> Dict[str, Tuple[Optional[int], Optional[int], Optional[int]]]:
+        """Stat signatures (size, mtime_ns, inode) of the files directly inside a directory."""
+        with self._lock:
+            return {row[0]: tuple(row[1:]) for row in self._conn.execute(
+                "SELECT file_path, file_size, file_mtime_ns, file_inode FROM samples WHERE directory = ?",
+                (directory,)
+            )}
+
+    # Subcategory index
+
+    def set_subcategory_resolver(self, resolver: Callable[[str, Dict], Iterable[Tuple[str, str]]], version: str):
+        """
+        Install the function that decides which (category, subcategory) nodes a
+        sample belongs to. Every write keeps the subcategory index in step with
+        the sample table; the index is rebuilt once whenever the resolver version
+        differs from the one it was built with.
+
+        Args:
+            resolver: Maps (file_key, analysis) to lower-case (category, subcategory) pairs
+            version: Identifier of the resolver's rules
+        """
+        self._subcategory_resolver = resolver
+        if self.get_meta("subcategory_index_version") != version:
+            self.rebuild_subcategory_index()
+            self.set_meta("subcategory_index_version", version)
+
+    def rebuild_subcategory_index(self) -> int:
+        """
+        Recompute the subcategory index from every stored analysis.
+
+        Returns:
+            Number of index entries written
+        """
+        memberships = []
+        for batch in self._iter_sample_batches():
+            memberships.extend(self._resolve_subcategories(batch))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sample_subcategories")
+            self._write_subcategories([], memberships)
+        logger.info(f"Built subcategory index with {len(memberships)} entries")
+        return len(memberships)
+
+    def _iter_sample_batches(self, batch_size: int = 500) -> Iterator[List[Tuple[str, Dict]]]:
+        """Stream the sample table in decoded batches."""
+        batch = []
+        for item in self.iter_samples(batch_size=batch_size):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _resolve_subcategories(self, items: Iterable[Tuple[str, Dict]]) -> List[Tuple[str, str, str]]:
+        """Index rows (category, subcategory, file_key) for the given analyses."""
+        if self._subcategory_resolver is None:
+            return []
+        return [(category, subcategory, file_key)
+                for file_key, analysis in items
+                for category, subcategory in self._subcategory_resolver(file_key, analysis)]
+
+    def _write_subcategories(self, file_keys: List[str], memberships: List[Tuple[str, str, str]]):
+        """Replace the index rows of the given files. Must run inside a transaction."""
+        if self._subcategory_resolver is None:
+            return
+        self._conn.executemany("DELETE FROM sample_subcategories WHERE file_path = ?", [(k,) for k in file_keys])
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO sample_subcategories (category, subcategory, file_path) VALUES (?, ?, ?)",
+            memberships
+        )
+
+    # Change notifications
+
+    def add_change_listener(self, listener):
+        """
+        Register an object to be told about sample row changes after they commit.
+        The listener implements samples_written(items), samples_deleted(file_keys)
+        and samples_cleared(). Calls happen on the writing thread.
+        """
+        self._change_listeners.append(listener)
+
+    def _notify(self, event: str, *args):
+        """Call an event handler on every change listener."""
+        for listener in self._change_listeners:
+            try:
+                getattr(listener, event)(*args)
+            except Exception as e:
+                logger.error(f"Change listener {type(listener).__name__}.{event} failed: {e}")
+
+    def _keys_for_listeners(self, sql: str, params: List[Tuple]) -> List[str]:
+        """Collect the keys a bulk delete will remove, if anyone listens for them."""
+        if not self._change_listeners:
+            return []
+        return [row[0] for args in params for row in self._conn.execute(sql, args)]
+
+    # Search index
+
+    def _ensure_search_index(self):
+        """Build the search index for libraries created before it existed or indexed by an older version."""
+        if not self.search_index.available:
+            return
+        if self.get_meta("search_index_version") == self.search_index.VERSION:
+            return
+
+        indexed = 0
+        with self._lock, self._conn:
+            self.search_index.clear()
+        for batch in self._iter_sample_batches():
+            with self._lock, self._conn:
+                self.search_index.write(batch)
+            indexed += len(batch)
+        self.set_meta("search_index_version", self.search_index.VERSION)
+        logger.info(f"Built search index for {indexed} samples")
+
+    # Tracked directories
+
+    def get_tracked_directories(self) -> List[str]:
+        """All tracked directory paths."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT path FROM tracked_directories")]
+
+    def set_tracked_directories(self, directories: Iterable[str]):
+        """Replace the tracked directory list."""
+        rows = [(directory,) for directory in directories]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tracked_directories")
+            self._conn.executemany("INSERT OR IGNORE INTO tracked_directories (path) VALUES (?)", rows)
+
+    # Scanned directory snapshots (used for incremental refresh)
+
+    def get_scanned_directories(self, root: str) -> Dict[str, Tuple[Optional[str], int]]:
+        """Directories recorded by the last complete scan of a tracked root: path -> (parent, mtime_ns)."""
+        with self._lock:
+            return {row[0]: (row[1], row[2]) for row in self._conn.execute(
+                "SELECT path, parent, mtime_ns FROM scanned_directories WHERE root = ?", (root,)
+            )}
+
+    def set_scanned_directories(self, root: str, directories: Dict[str, Tuple[Optional[str], int]]):
+        """Replace the directory snapshot of a tracked root."""
+        rows = [(path, root, parent, mtime_ns) for path, (parent, mtime_ns) in directories.items()]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scanned_directories WHERE root = ?", (root,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scanned_directories (path, root, parent, mtime_ns) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def delete_scanned_directories(self, root: str):
+        """Forget the directory snapshot of a tracked root."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scanned_directories WHERE root = ?", (root,))
+
+    # Metadata
+
+    def get_meta(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Read a metadata value."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, name: str, value: str):
+        """Write a metadata value."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def import_legacy_json(self, json_path: Path) -> int:
+        """
+        Import a legacy sample_cache_universal.json file into the store.
+
+        Returns:
+            Number of analyses imported
+        """
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+
+        # Handle both old format (just cache) and new format (cache + directories)
+        if isinstance(data, dict) and "sample_cache" in data:
+            sample_cache = data["sample_cache"]
+            tracked_directories = data.get("tracked_directories", [])
+        else:
+            sample_cache = data
+            tracked_directories = []
+
+        self.put_many(sample_cache.items())
+        self.set_tracked_directories(tracked_directories)
+        return len(sample_cache)
+
+    # Write-ahead journal
+
+    def enable_write_ahead_journal(self, compaction_threshold: int = 8 * 1024 * 1024) -> bool:
+        """
+        Switch the database to write-ahead journaling.
+        Mutations are appended to the journal instead of rewriting database pages,
+        and a background compaction folds the journal back into the database
+        once it grows past the threshold. A crash mid-write leaves the last
+        committed state intact; the journal is replayed on the next open.
+        
+        Args:
+            compaction_threshold: Journal size in bytes that triggers compaction
+            
+        Returns:
+            True if write-ahead journaling is active
+        """
+        with self._lock:
+            mode = self._conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if mode.lower() != "wal":
+                logger.warning(f"Write-ahead journal not supported for {self.db_path}, using {mode} journal")
+                return False
+            
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # Compaction is driven by us, in the background, instead of inline on commit
+            self._conn.execute("PRAGMA wal_autocheckpoint=0")
+        
+        self.journal_enabled = True
+        self.compaction_threshold = compaction_threshold
+        logger.info(f"Write-ahead journal enabled (compaction at {compaction_threshold // 1024} KB)")
+        return True
+
+    def journal_size(self) -> int:
+        """Current size of the write-ahead journal in bytes."""
+        try:
+            return os.path.getsize(f"{self.db_path}-wal")
+        except OSError:
+            return 0
+
+    def _note_write(self, count: int = 1):
+        """Track writes and start compaction once the journal passes the threshold."""
+        if not self.journal_enabled:
+            return
+        
+        # Writers on several threads (import worker, watcher, verifier) share the counter
+        with self._lock:
+            self._writes_since_check += count
+            if self._writes_since_check < self.JOURNAL_CHECK_INTERVAL:
+                return
+            self._writes_since_check = 0
+        
+        if self.journal_size() >= self.compaction_threshold:
+            self.compact_journal_in_background()
+
+    def compact_journal_in_background(self):
+        """Run journal compaction on a background thread unless one is already running."""
+        with self._lock:
+            if self._compaction_thread and self._compaction_thread.is_alive():
+                return
+            self._compaction_thread = threading.Thread(
+                target=self.compact_journal, name="library-journal-compaction", daemon=True
+            )
+            self._compaction_thread.start()
+
+    def compact_journal(self) -> bool:
+        """
+        Fold the write-ahead journal into the database and truncate it.
+        Uses its own connection so readers and writers are not blocked meanwhile.
+        
+        Returns:
+            True if the whole journal was checkpointed
+        """
+        if not self.journal_enabled:
+            return False
+        
+        try:
+            size_before = self.journal_size()
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            try:
+                busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            finally:
+                conn.close()
+            
+            if busy:
+                logger.debug("Journal compaction deferred, database busy")
+                return False
+            logger.info(f"Compacted {size_before // 1024} KB write-ahead journal into {self.db_path.name}")
+            return True
+        except Exception as e:
+            logger.warning(f"Journal compaction failed: {e}")
+            return False
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+class SampleCacheView(MutableMapping):
+    """
+    Dict-like view over a SampleLibraryStore.
+    Reads decode rows on demand and writes go straight to the store,
+    so existing code using ``sample_cache[key]`` keeps working without
+    the whole library being resident in memory.
+
+    Note: returned analyses are copies. Assign them back to persist changes.
+    """
+
+    def __init__(self, store: SampleLibraryStore):
+        self.store = store
+
+    def __getitem__(self, file_key: str) -> Dict:
+        analysis = self.store.get(file_key)
+        if analysis is None:
+            raise KeyError(file_key)
+        return analysis
+
+    def __setitem__(self, file_key: str, analysis: Dict):
+        self.store.put(file_key, analysis)
+
+    def __delitem__(self, file_key: str):
+        if not self.store.delete(file_key):
+            raise KeyError(file_key)
+
+    def __contains__(self, file_key) -> bool:
+        return isinstance(file_key, str) and self.store.contains(file_key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.keys())
+
+    def __len__(self) -> int:
+        return self.store.count()
+
+    def keys(self) -> List[str]:
+        return self.store.keys()
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        return self.store.iter_samples()
+
+    def values(self) -> Iterator[Dict]:
+        return (analysis for _, analysis in self.store.iter_samples())
+
+    def clear(self):
+        self.store.replace_all([])
+
+    def update_entry(self, file_key: str, fields: Dict) -> bool:
+        """Merge fields into a stored analysis. Returns False if the key is unknown."""
+        analysis = self.store.get(file_key)
+        if analysis is None:
+            return False
+        analysis.update(fields)
+        self.store.put(file_key, analysis)
+        return True
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """Materialize the full cache (used for exports)."""
+        return dict(self.store.iter_samples())
@@ -0,0 +1,165 @@
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor, QIcon
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SampleListModel(QAbstractListModel):
+    """
+    Lazy list model over the file keys of a sample query.
+    Rows hold only a file key and a display name; the full analysis behind
+    a row is read from the library when something asks for its UserRole
+    data (selection, playback, context menu) and kept in a small LRU cache.
+    Rows are exposed to the view in pages through canFetchMore/fetchMore,
+    so opening a large subcategory costs one key query, not one item and
+    one icon per sample.
+    
+    Short result lists that already carry extra fields (search results,
+    similarity scores) can be shown as ready-made analyses instead.
+    """
+    
+    # Rows handed to the view per fetchMore call
+    PAGE_SIZE = 500
+    
+    # Analyses kept after being fetched for UserRole data
+    CACHE_SIZE = 256
+    
+    def __init__(self, fetch_analysis: Callable[[str], Optional[Dict]], sample_icon: QIcon, parent=None):
+        """
+        Args:
+            fetch_analysis: Returns the analysis of a file key (e.g. SampleLibraryStore.get)
+            sample_icon: Icon shown next to every sample
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._fetch_analysis = fetch_analysis
+        self._sample_icon = sample_icon
+        
+        self._entries: List[Tuple[str, str]] = []  # (file_key, display name)
+        self._loaded = 0  # Rows exposed to the view so far
+        self._preloaded: Dict[str, Dict] = {}
+        self._cache: OrderedDict = OrderedDict()
+        
+        # Single non-selectable message row shown instead of samples
+        self._placeholder: Optional[Tuple[str, Optional[QIcon]]] = None
+    
+    # Content
+    
+    def set_entries(self, entries: List[Tuple[str, str]]):
+        """Show the samples of a query as (file_key, file_name) pairs, loaded lazily."""
+        self.beginResetModel()
+        self._entries = [(file_key, name or "Unknown") for file_key, name in entries]
+        self._loaded = min(self.PAGE_SIZE, len(self._entries))
+        self._preloaded = {}
+        self._cache.clear()
+        self._placeholder = None
+        self.endResetModel()
+    
+    def set_samples(self, samples: List[Dict]):
+        """Show ready-made analyses (e.g. search results with scores attached)."""
+        self.beginResetModel()
+        self._entries = [(sample.get("file_path", ""), sample.get("file_name", "Unknown")) for sample in samples]
+        self._loaded = min(self.PAGE_SIZE, len(self._entries))
+        self._preloaded = {sample.get("file_path", ""): sample for sample in samples}
+        self._cache.clear()
+        self._placeholder = None
+        self.endResetModel()
+    
+    def set_placeholder(self, text: str, icon: Optional[QIcon] = None):
+        """Replace the samples with a single greyed-out message row."""
+        self.beginResetModel()
+        self._entries = []
+        self._loaded = 0
+        self._preloaded = {}
+        self._cache.clear()
+        self._placeholder = (text, icon)
+        self.endResetModel()
+    
+    def clear(self):
+        """Remove every row."""
+        self.set_entries([])
+    
+    # Row access
+    
+    def file_key(self, row: int) -> Optional[str]:
+        """File key of a row, or None for the placeholder or an invalid row."""
+        if 0 <= row < len(self._entries):
+            return self._entries[row][0]
+        return None
+    
+    def analysis(self, row: int) -> Optional[Dict]:
+        """Full analysis of a row, read from the library on first use."""
+        if (file_key := self.file_key(row)) is None:
+            return None
+        if file_key in self._preloaded:
+            return self._preloaded[file_key]
+        if file_key in self._cache:
+            self._cache.move_to_end(file_key)
+            return self._cache[file_key]
+        
+        analysis = self._fetch_analysis(file_key)
+        if analysis is None:
+            # Removed from the library since the query ran
+            analysis = {"file_path": file_key, "file_name": self._entries[row][1]}
+        self._cache[file_key] = analysis
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return analysis
+    
+    # QAbstractListModel interface
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return 1 if self._placeholder is not None else self._loaded
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        
+        if self._placeholder is not None:
+            text, icon = self._placeholder
+            if role == Qt.ItemDataRole.DisplayRole:
+                return text
+            if role == Qt.ItemDataRole.DecorationRole:
+                return icon
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return QColor(150, 150, 150)
+            if role == Qt.ItemDataRole.UserRole:
+                return {"empty_state": True}
+            return None
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._entries[row][1]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._sample_icon
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._entries[row][0]
+        if role == Qt.ItemDataRole.UserRole:
+            return self.analysis(row)
+        return None
+    
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._placeholder is not None:
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+    
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._placeholder is None and self._loaded < len(self._entries)
+    
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.PAGE_SIZE, len(self._entries) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
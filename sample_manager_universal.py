@@ -2,13 +2,24 @@ import os
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Set
+from typing import Callable, Dict, List, Optional, Tuple, Union, Set
 from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer
 from PyQt6.QtWidgets import QApplication
 from contextlib import suppress
 
 # Import the universal audio analyzer
 from audio_analysis_universal import universal_audio_analyzer
+from sample_library_store import SampleLibraryStore, SampleCacheView
+from analysis_engine import ParallelAnalysisEngine
+from analysis_window import FULL_WINDOW, AnalysisWindowPolicy
+from content_fingerprint import compute_content_fingerprint
+from audio_header import probe_audio_header
+from directory_scanner import DirectoryScanner, signature_fields
+from keyword_matcher import SUBCATEGORY_KEYWORDS, KeywordHits, keyword_matcher
+from attribute_columns import AttributeColumns
+from similarity_index import SimilarityIndex
+from duplicate_detector import DuplicateDetector
+from startup_tracer import startup_tracer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,19 +39,55 @@ class UniversalSampleManager(QObject):
     error_occurred = pyqtSignal(str)
     directory_scanned = pyqtSignal(str, int)  # directory_path, files_found
     
+    # Browsable categories and their subcategories (shown even when empty)
+    DEFAULT_CATEGORIES = {
+        "Bass": ["808", "Bass Loops", "Electric Bass", "Synth Bass"],
+        "Drums": ["Claps", "Closed Hi-Hats", "Cymbals", "Full Loops", "Kicks", "Open Hi-Hats", "Percussion", "Snares"],
+        "FX": ["Ambient", "Downlifters", "Foley", "Impacts", "Risers"],
+        "Melodic": ["Keys", "Melodic Loops", "Pads", "Plucks", "Synth Leads"],
+        "Vocals": ["Chops", "One-Shots", "Phrases", "Vocal Loops"]
+    }
+    
+    # Keywords matched against file names and paths for each subcategory
+    SUBCATEGORY_KEYWORDS = SUBCATEGORY_KEYWORDS
+    
+    # Bump whenever the subcategory matching rules change so the index is rebuilt
+    SUBCATEGORY_INDEX_VERSION = "1"
+    
     def __init__(self):
         super().__init__()
         
-        self.cache_file = Path("sample_cache_universal.json")
+        self.cache_file = Path("sample_cache_universal.json")  # Legacy JSON cache, imported once
+        self.library_file = Path("sample_library_universal.db")
+        
+        # Sample cache with comprehensive analysis results (indexed by absolute file path),
+        # backed by the SQLite library store
+        self.library_store = None
+        self.directory_scanner = None
+        self.sample_cache = None
         
-        # Sample cache with comprehensive analysis results (indexed by absolute file path)
-        self.sample_cache = {}
+        # Write-ahead journal: mutations append to the journal, which is compacted
+        # into the library in the background once it passes the threshold
+        self.use_write_ahead_journal = True
+        self.journal_compaction_threshold = 8 * 1024 * 1024
         
         # Set of directories being tracked for samples
         self.tracked_directories = set()
         
+        # Parallel analysis engine settings (None = one worker per core, 0 = in-process)
+        self.analysis_workers = None
+        self.analysis_max_in_flight = None
+        self.ordered_analysis_delivery = False
+        self._analysis_engine = None
+        
+        # Subcategories kept in the library's subcategory index (lower case)
+        self._indexed_subcategories = set(self.SUBCATEGORY_KEYWORDS) | {
+            subcategory.lower() for subcategories in self.DEFAULT_CATEGORIES.values() for subcategory in subcategories
+        }
+        
         # Load existing cache and tracked directories
-        self.load_cache()
+        with startup_tracer.phase("load_cache"):
+            self.load_cache()
         
         # Check if cache needs migration
         if self._needs_cache_migration():
@@ -64,51 +111,71 @@ class UniversalSampleManager(QObject):
         }
     
     def load_cache(self):
-        """Load sample analysis cache and tracked directories from file."""
+        """Open the sample library store and load tracked directories."""
         try:
-            if self.cache_file.exists():
-                with open(self.cache_file, 'r') as f:
-                    data = json.load(f)
-                
-                # Handle both old format (just cache) and new format (cache + directories)
-                if isinstance(data, dict) and "sample_cache" in data:
-                    self.sample_cache = data["sample_cache"]
-                    self.tracked_directories = set(data.get("tracked_directories", []))
-                else:
-                    # Old format - just the cache
-                    self.sample_cache = data
-                    self.tracked_directories = set()
-                
-                logger.info(f"Loaded {len(self.sample_cache)} cached analyses from {len(self.tracked_directories)} tracked directories")
-            else:
-                self.sample_cache = {}
-                self.tracked_directories = set()
-                logger.info("No existing cache found, starting fresh")
+            self.library_store = SampleLibraryStore(self.library_file)
+            self.sample_cache = SampleCacheView(self.library_store)
+            self.attribute_columns = AttributeColumns(self.library_store)
+            self.similarity_index = SimilarityIndex(self.library_store)
+            self.duplicate_detector = DuplicateDetector(self.library_store)
+            
+            if self.use_write_ahead_journal:
+                self.library_store.enable_write_ahead_journal(self.journal_compaction_threshold)
+            
+            self.library_store.set_subcategory_resolver(self._subcategory_memberships, self.SUBCATEGORY_INDEX_VERSION)
+            
+            self._import_legacy_cache()
+            
+            self.tracked_directories = set(self.library_store.get_tracked_directories())
+            self.directory_scanner = DirectoryScanner(self.library_store)
+            logger.info(f"Opened library with {len(self.sample_cache)} cached analyses from {len(self.tracked_directories)} tracked directories")
         except Exception as e:
             logger.error(f"Error loading cache: {e}")
-            self.sample_cache = {}
+            self.library_store = SampleLibraryStore(":memory:")
+            self.sample_cache = SampleCacheView(self.library_store)
+            self.attribute_columns = AttributeColumns(self.library_store)
+            self.similarity_index = SimilarityIndex(self.library_store)
+            self.duplicate_detector = DuplicateDetector(self.library_store)
+            self.library_store.set_subcategory_resolver(self._subcategory_memberships, self.SUBCATEGORY_INDEX_VERSION)
             self.tracked_directories = set()
+            self.directory_scanner = DirectoryScanner(self.library_store)
+    
+    def _import_legacy_cache(self):
+        """Import the legacy JSON cache into the library store on first run."""
+        if self.library_store.get_meta("legacy_json_imported") or not self.cache_file.exists():
+            return
+        
+        try:
+            imported = self.library_store.import_legacy_json(self.cache_file)
+            logger.info(f"Imported {imported} analyses from legacy cache {self.cache_file}")
+        except Exception as e:
+            logger.error(f"Error importing legacy cache: {e}")
+        finally:
+            self.library_store.set_meta("legacy_json_imported", "1")
     
     def save_cache(self):
-        """Save sample analysis cache and tracked directories to file."""
+        """Persist tracked directories. Sample analyses are written per row as they change."""
         try:
-            data = {
-                "sample_cache": self.sample_cache,
-                "tracked_directories": list(self.tracked_directories)
-            }
-            with open(self.cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Saved {len(self.sample_cache)} analyses and {len(self.tracked_directories)} tracked directories to cache")
+            self.library_store.set_tracked_directories(self.tracked_directories)
+            logger.debug(f"Library holds {len(self.sample_cache)} analyses and {len(self.tracked_directories)} tracked directories")
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
     
-    def add_directory_to_index(self, directory_path: Union[str, Path], auto_analyze: bool = True) -> int:
+    def add_directory_to_index(self, directory_path: Union[str, Path], auto_analyze: bool = True,
+                               should_stop: Optional[Callable[[], bool]] = None,
+                               progress: Optional[Callable[[int, int], None]] = None) -> int:
         """
         Add a directory to the sample index. Scans for audio files and optionally analyzes them.
+        Every file is committed to the library as soon as it is indexed, so a stopped import
+        keeps the work already done.
         
         Args:
             directory_path: Path to directory to scan for samples
             auto_analyze: Whether to automatically analyze samples for better categorization
+            should_stop: Polled between files; returning True ends the import early
+            progress: Called with (current, total) files instead of emitting
+                analysis_progress, so the import's progress is not mixed with
+                refreshes running on other threads
             
         Returns:
             Number of new audio files found and indexed
@@ -122,8 +189,8 @@ class UniversalSampleManager(QObject):
         self.tracked_directories.add(str(directory_path))
         
         # Scan for audio files
-        audio_files = self._get_audio_files_in_directory(directory_path)
-        stats = self._process_audio_files(audio_files, auto_analyze)
+        stats = self._sync_directory(directory_path, auto_analyze, deep=True, should_stop=should_stop,
+                                     progress=progress)
         
         # Save updated cache
         self.save_cache()
@@ -142,91 +209,178 @@ class UniversalSampleManager(QObject):
             return False
         return True
     
-    def _process_audio_files(self, audio_files: List[Path], auto_analyze: bool) -> Dict[str, int]:
-        """Process a list of audio files for indexing."""
+    def _process_audio_files(self, audio_files: List[Path], auto_analyze: bool,
+                             should_stop: Optional[Callable[[], bool]] = None,
+                             progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+        """Process a list of audio files for indexing, reporting progress to analysis_progress by default."""
+        report_progress = progress or self.analysis_progress.emit
         stats = {"new_files": 0, "analyzed_files": 0}
+        total = len(audio_files)
         
-        logger.info(f"Processing {len(audio_files)} audio files")
+        logger.info(f"Processing {total} audio files")
         
-        for i, file_path in enumerate(audio_files):
+        # Index pass: cheap bookkeeping, collects the files that need DSP work
+        pending_analysis = []  # (file_path, is_new)
+        for file_path in audio_files:
+            if should_stop is not None and should_stop():
+                logger.info("Indexing stopped before all files were processed")
+                return stats
+            
             file_key = str(file_path)
             
-            if self._handle_existing_file(file_key, file_path, auto_analyze, stats):
+            if self._handle_existing_file(file_key, file_path, auto_analyze, pending_analysis):
                 continue
             
-            # Add new file to index
-            if self._index_new_file(file_path, auto_analyze, stats):
+            if auto_analyze:
+                if self._reuse_analysis_by_content(file_path):
+                    stats["new_files"] += 1
+                    stats["analyzed_files"] += 1
+                else:
+                    pending_analysis.append((file_path, True))
+            elif self._index_new_file(file_path):
                 stats["new_files"] += 1
+        
+        # Analysis pass: fanned out over the analysis engine
+        completed = total - len(pending_analysis)
+        report_progress(completed, total)
+        
+        is_new_file = {str(file_path): is_new for file_path, is_new in pending_analysis}
+        for file_path, result, error in self._get_analysis_engine().analyze(
+                [str(file_path) for file_path, _ in pending_analysis], ordered=self.ordered_analysis_delivery,
+                should_stop=should_stop):
+            file_path = Path(file_path)
+            is_new = is_new_file[str(file_path)]
+            
+            if error is not None:
+                logger.warning(f"Failed to analyze {file_path}: {error}")
+                if is_new:
+                    # Fall back to basic indexing
+                    self._index_new_file(file_path)
+                    stats["new_files"] += 1
+            else:
+                self._store_analysis_result(file_path, result)
+                if is_new:
+                    stats["new_files"] += 1
+                if not result.get("error"):
+                    stats["analyzed_files"] += 1
             
             # Emit progress signal
-            if i % 10 == 0 or i == len(audio_files) - 1:
-                self.analysis_progress.emit(i + 1, len(audio_files))
+            completed += 1
+            if completed % 10 == 0 or completed == total:
+                report_progress(completed, total)
         
         return stats
     
-    def _handle_existing_file(self, file_key: str, file_path: Path, auto_analyze: bool, stats: Dict[str, int]) -> bool:
+    def _handle_existing_file(self, file_key: str, file_path: Path, auto_analyze: bool, pending_analysis: List[Tuple[Path, bool]]) -> bool:
         """Handle files that are already in cache. Returns True if file was handled and should be skipped."""
-        if file_key not in self.sample_cache:
+        if (cached_entry := self.library_store.get(file_key)) is None:
             return False
             
         if file_path.exists():
-            # File exists, check if it needs analysis
-            if auto_analyze and not self.sample_cache[file_key].get("analyzed", False):
-                try:
-                    result = self.analyze_sample(file_path)
-                    if not result.get("error"):
-                        stats["analyzed_files"] += 1
-                except Exception as e:
-                    logger.warning(f"Failed to analyze existing file {file_path}: {e}")
+            # File exists, queue it if it still needs analysis
+            if auto_analyze and not cached_entry.get("analyzed", False):
+                if not self._reuse_analysis_by_content(file_path, cached_entry.get("content_hash")):
+                    pending_analysis.append((file_path, False))
             return True  # Already indexed
         else:
             # File no longer exists, remove from cache
             del self.sample_cache[file_key]
             return False
     
-    def _index_new_file(self, file_path: Path, auto_analyze: bool, stats: Dict[str, int]) -> bool:
-        """Index a new audio file. Returns True if successful."""
+    def _index_new_file(self, file_path: Path) -> bool:
+        """Index a new audio file without analysis. Returns True if successful."""
         try:
-            file_key = str(file_path)
+            basic_info = self._create_basic_file_info(file_path)
             
-            if auto_analyze:
-                return self._analyze_and_index_file(file_path, file_key, stats)
-            else:
-                # Basic indexing without analysis
-                basic_info = self._create_basic_file_info(file_path)
-                self.sample_cache[file_key] = basic_info
-                return True
-                
+            # Identical audio already analyzed elsewhere: take over its analysis instead
+            if not self._reuse_analysis_by_content(file_path, basic_info["content_hash"]):
+                self.sample_cache[str(file_path)] = basic_info
+            return True
         except Exception as e:
             logger.warning(f"Error indexing file {file_path}: {e}")
             return False
     
-    def _analyze_and_index_file(self, file_path: Path, file_key: str, stats: Dict[str, int]) -> bool:
-        """Analyze and index a single file."""
-        try:
-            analysis_result = universal_audio_analyzer.analyze_sample(str(file_path))
-            
-            # Add file metadata using extracted method
-            self._add_file_metadata_to_analysis(analysis_result, file_path)
-            
-            self.sample_cache[file_key] = analysis_result
-            stats["analyzed_files"] += 1
-            logger.debug(f"Analyzed and indexed: {file_path.name}")
-            return True
+    def _get_analysis_engine(self) -> ParallelAnalysisEngine:
+        """Get the analysis engine, creating it with the configured worker count."""
+        if self._analysis_engine is None:
+            self._analysis_engine = ParallelAnalysisEngine(
+                self.analysis_workers, self.analysis_max_in_flight,
+                universal_audio_analyzer.analysis_window.to_dict()
+            )
+        return self._analysis_engine
+    
+    def set_analysis_workers(self, workers: Optional[int], max_in_flight: Optional[int] = None):
+        """
+        Configure the analysis engine.
+        
+        Args:
+            workers: Worker process count (None = one per core, 0 = analyze in-process)
+            max_in_flight: Bound on queued files (None = twice the worker count)
+        """
+        self.analysis_workers = workers
+        self.analysis_max_in_flight = max_in_flight
+        self.shutdown_analysis()
+    
+    def set_analysis_window(self, policy: AnalysisWindowPolicy):
+        """
+        Change how much of long files is analyzed.
+        Cached analyses of long files made under another window are
+        re-analyzed on their next visit (see _should_use_cached_analysis).
+        
+        Args:
+            policy: Window policy for this process and the worker processes
+        """
+        universal_audio_analyzer.set_analysis_window(policy)
+        self.shutdown_analysis()  # Workers pick the policy up when the pool restarts
+    
+    def shutdown_analysis(self):
+        """Stop the analysis worker processes."""
+        if self._analysis_engine is not None:
+            self._analysis_engine.shutdown()
+            self._analysis_engine = None
+    
+    def _reuse_analysis_by_content(self, file_path: Path, content_hash: Optional[str] = None) -> Optional[Dict]:
+        """
+        Reuse the analysis of byte-identical audio that is indexed under another path.
+        Moved, renamed and duplicated files cost a fingerprint instead of a full analysis.
+        
+        Args:
+            file_path: File that needs an analysis
+            content_hash: Precomputed fingerprint, computed from the file if omitted
             
-        except Exception as e:
-            logger.warning(f"Failed to analyze {file_path}: {e}")
-            # Fall back to basic indexing
-            basic_info = self._create_basic_file_info(file_path)
-            self.sample_cache[file_key] = basic_info
-            return True
+        Returns:
+            The analysis stored for file_path, or None if no reusable analysis exists
+        """
+        content_hash = content_hash or compute_content_fingerprint(file_path)
+        if not content_hash:
+            return None
+        
+        source = self.library_store.find_by_content_hash(content_hash, exclude_key=str(file_path))
+        if not self._should_use_cached_analysis(source):
+            return None
+        
+        # Same audio, new location: only the path-derived fields change
+        source_path = source["file_path"]
+        source.update({
+            "file_path": str(file_path),
+            "file_name": file_path.name,
+            "directory": str(file_path.parent),
+            "content_hash": content_hash,
+            **signature_fields(file_path)
+        })
+        self.sample_cache[str(file_path)] = source
+        
+        logger.info(f"Reused analysis of {Path(source_path).name} for identical file {file_path.name}")
+        return source
     
     def _add_file_metadata_to_analysis(self, analysis_result: Dict, file_path: Path):
         """Add file metadata to analysis result."""
         analysis_result.update({
             "file_name": file_path.name,
-            "file_size": file_path.stat().st_size,
+            **signature_fields(file_path),
             "directory": str(file_path.parent),
+            "content_hash": compute_content_fingerprint(file_path),
+            "audio_format": probe_audio_header(file_path),  # Native format; sample_rate is the analysis rate
             "analysis_timestamp": QTimer().remainingTime(),
             "analyzer_version": "universal_1.0",
             "analyzed": True
@@ -240,13 +394,21 @@ class UniversalSampleManager(QObject):
             logger.info(f"Indexed {stats['new_files']} new files from {directory_path}")
     
     def _create_basic_file_info(self, file_path: Path) -> Dict:
-        """Create basic file info for indexing without analysis."""
+        """
+        Create basic file info for indexing without analysis.
+        Duration and the file's native format come from its header (see
+        audio_header.probe_audio_header), so they are sortable before any
+        audio is decoded.
+        """
+        audio_format = probe_audio_header(file_path)
         return {
             "file_path": str(file_path),
             "file_name": file_path.name,
-            "file_size": file_path.stat().st_size,
+            **signature_fields(file_path),
             "directory": str(file_path.parent),
-            "duration": 0,
+            "content_hash": compute_content_fingerprint(file_path),
+            "audio_format": audio_format,
+            "duration": (audio_format or {}).get("duration") or 0,
             "sample_type": "unknown",
             "category": "unknown",
             "bpm": 0,
@@ -272,63 +434,117 @@ class UniversalSampleManager(QObject):
             self.tracked_directories.remove(directory_path)
             
             # Remove all samples from this directory from cache
-            files_to_remove = [
-                file_path for file_path in self.sample_cache.keys()
-                if file_path.startswith(directory_path)
-            ]
-            
-            for file_path in files_to_remove:
-                del self.sample_cache[file_path]
+            removed_count = self.library_store.delete_under_directory(directory_path)
+            self.library_store.delete_scanned_directories(directory_path)
             
             self.save_cache()
-            logger.info(f"Removed directory {directory_path} and {len(files_to_remove)} samples from index")
+            logger.info(f"Removed directory {directory_path} and {removed_count} samples from index")
     
-    def refresh_index(self) -> Dict[str, int]:
+    def refresh_index(self, deep: bool = False) -> Dict[str, int]:
         """
-        Refresh the entire index by rescanning all tracked directories.
+        Refresh the index of all tracked directories incrementally.
+        Only directories whose mtime changed since the last scan are listed, and only
+        files whose stat signature changed are re-analyzed. When nothing moved this
+        costs one stat per directory.
         
+        Args:
+            deep: Also list unchanged directories to catch files rewritten in place
+            
         Returns:
             Dictionary with statistics about the refresh operation
         """
-        # Clean up non-existent files first
-        files_to_remove = [file_path for file_path in self.sample_cache.keys() 
-                          if not Path(file_path).exists()]
-        
-        for file_path in files_to_remove:
-            del self.sample_cache[file_path]
-
         stats = {
             "directories_scanned": 0,
             "new_files": 0,
-            "removed_files": len(files_to_remove),
+            "removed_files": 0,
             "updated_files": 0
         }
         
-        # Rescan all tracked directories
         tracked_dirs = list(self.tracked_directories)  # Copy to avoid modification during iteration
         for directory in tracked_dirs:
-            directory_path = Path(directory)
-            if directory_path.exists():
-                new_files = self.add_directory_to_index(directory_path)
-                stats["new_files"] += new_files
-                stats["directories_scanned"] += 1
-            else:
-                # Directory no longer exists, remove it
-                self.remove_directory_from_index(directory)
+            if (directory_stats := self.refresh_directory(directory, deep=deep)) is None:
+                continue
+            stats["new_files"] += directory_stats["new_files"]
+            stats["removed_files"] += directory_stats["removed_files"]
+            stats["updated_files"] += directory_stats["updated_files"]
+            stats["directories_scanned"] += 1
         
         logger.info(f"Index refresh complete: {stats}")
         return stats
     
-    def _get_audio_files_in_directory(self, directory_path: Path) -> List[Path]:
-        """Get all audio files in a directory recursively."""
-        audio_extensions = {'.wav', '.mp3', '.flac', '.aiff', '.aif', '.m4a', '.ogg', '.wma'}
+    def refresh_directory(self, directory: Union[str, Path], deep: bool = False,
+                          should_stop: Optional[Callable[[], bool]] = None) -> Optional[Dict[str, int]]:
+        """
+        Incrementally refresh one tracked directory, analyzing new and changed files.
+        A tracked directory that no longer exists is removed from the index.
         
-        try:
-            return [file_path for file_path in directory_path.rglob('*')
-                   if file_path.is_file() and file_path.suffix.lower() in audio_extensions]
-        except Exception as e:
-            logger.warning(f"Error scanning directory {directory_path}: {e}")
-            return []
+        Args:
+            directory: Tracked directory path
+            deep: Also list unchanged directories to catch files rewritten in place
+            should_stop: Polled between files; returning True ends the refresh early
+            
+        Returns:
+            Refresh statistics, or None if the directory was removed
+        """
+        directory_path = Path(directory)
+        if not directory_path.exists():
+            self.remove_directory_from_index(directory)
+            return None
+        
+        stats = self._sync_directory(directory_path, auto_analyze=True, deep=deep, should_stop=should_stop)
+        if stats["new_files"] or stats["removed_files"] or stats["updated_files"]:
+            self.directory_scanned.emit(str(directory_path), stats["new_files"])
+        return stats
+    
+    def get_indexed_subdirectories(self, directory: str) -> List[str]:
+        """Get the directories recorded by the last complete scan of a tracked directory."""
+        return list(self.library_store.get_scanned_directories(directory))
+    
+    def _sync_directory(self, directory_path: Path, auto_analyze: bool, deep: bool,
+                        should_stop: Optional[Callable[[], bool]] = None,
+                        progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+        """
+        Bring the index of one tracked directory up to date with the filesystem.
+        
+        Args:
+            directory_path: Tracked directory (resolved)
+            auto_analyze: Whether to analyze new and changed files
+            deep: List every directory (full import) instead of only changed ones
+            should_stop: Polled between files; returning True ends the sync early
+            progress: Per-file progress callback (None = analysis_progress)
+            
+        Returns:
+            Dictionary with new_files, analyzed_files, removed_files and updated_files
+        """
+        scan = self.directory_scanner.scan(directory_path, deep=deep)
+        
+        removed_files = self.library_store.delete_many(scan["removed_files"])
+        
+        # Entries indexed before signatures were stored: record them, nothing to re-analyze
+        for file_path in scan["unsigned_files"]:
+            with suppress(OSError):
+                self.sample_cache.update_entry(str(file_path), signature_fields(file_path))
+        
+        # Contents changed: the old analysis and fingerprint no longer apply
+        for file_path in scan["changed_files"]:
+            with suppress(OSError):
+                self.sample_cache.update_entry(str(file_path), {
+                    **signature_fields(file_path),
+                    "content_hash": None,
+                    "analyzed": False
+                })
+        
+        audio_files = scan["files"] if deep else scan["new_files"] + scan["changed_files"]
+        stats = self._process_audio_files(audio_files, auto_analyze, should_stop, progress)
+        stats["removed_files"] = removed_files
+        stats["updated_files"] = len(scan["changed_files"])
+        
+        # Record the snapshot only after a complete pass, so a stopped import is rescanned
+        if should_stop is None or not should_stop():
+            self.library_store.set_scanned_directories(str(directory_path), scan["directories"])
+        
+        logger.debug(f"Synced {directory_path}: listed {scan['directories_listed']} of {len(scan['directories'])} directories")
+        return stats
     
     def get_audio_files(self) -> List[Path]:
         """Get all audio files currently in the index."""
@@ -346,43 +562,55 @@ class UniversalSampleManager(QObject):
         file_key = str(file_path)
         
         # Check cache first
-        if self._should_use_cached_analysis(file_key):
+        cached_result = self.library_store.get(file_key)
+        if self._should_use_cached_analysis(cached_result):
             logger.info(f"Using cached analysis for {file_path.name}")
-            return self.sample_cache[file_key]
+            return cached_result
+        
+        # Moved, renamed or duplicated audio keeps its analysis
+        if (reused_result := self._reuse_analysis_by_content(file_path)) is not None:
+            return reused_result
         
         # Perform new analysis
         try:
             logger.info(f"Analyzing {file_path.name} with universal analyzer...")
             result = universal_audio_analyzer.analyze_sample(str(file_path))
-            
-            # Add additional metadata using extracted method
-            self._add_file_metadata_to_analysis(result, file_path)
-            
-            # Cache the result
-            self.sample_cache[file_key] = result
-            
-            # Update statistics
-            self._update_analysis_statistics(result)
-            
-            # Emit signal for UI update
-            self.sample_analyzed.emit(str(file_path), result)
-            
-            logger.info(f"Analysis complete for {file_path.name}: {result['sample_type']}, {result['category']}")
-            return result
+            return self._store_analysis_result(file_path, result)
             
         except Exception as e:
             return self._create_error_result(file_path, e)
     
-    def _should_use_cached_analysis(self, file_key: str) -> bool:
+    def _store_analysis_result(self, file_path: Path, result: Dict) -> Dict:
+        """Add file metadata to a fresh analysis, cache it and notify listeners."""
+        # Add additional metadata using extracted method
+        self._add_file_metadata_to_analysis(result, file_path)
+        
+        # Cache the result
+        self.sample_cache[str(file_path)] = result
+        
+        # Update statistics
+        self._update_analysis_statistics(result)
+        
+        # Emit signal for UI update
+        self.sample_analyzed.emit(str(file_path), result)
+        
+        logger.info(f"Analysis complete for {file_path.name}: {result['sample_type']}, {result['category']}")
+        return result
+    
+    def _should_use_cached_analysis(self, cached_result: Optional[Dict]) -> bool:
         """Check if cached analysis should be used."""
-        if file_key not in self.sample_cache:
+        if cached_result is None:
             return False
             
-        cached_result = self.sample_cache[file_key]
         # Check if cache is from same CPU type and has all required fields
-        return (cached_result.get('cpu_type') == self.system_info['cpu_type'] and
+        if not (cached_result.get('cpu_type') == self.system_info['cpu_type'] and
                 all(key in cached_result for key in ['sample_type', 'category', 'bpm', 'key']) and
-                cached_result.get('analyzed', False))
+                cached_result.get('analyzed', False)):
+            return False
+        
+        # Only comparable if analyzed over the same window (results before windows were whole-file)
+        window = universal_audio_analyzer.analysis_window.describe(cached_result.get('duration') or 0)
+        return cached_result.get('analysis_window', FULL_WINDOW) == window
     
     def _update_analysis_statistics(self, result: Dict):
         """Update analysis statistics based on result."""
@@ -435,11 +663,25 @@ class UniversalSampleManager(QObject):
             self.analysis_complete.emit()
             return
         
-        logger.info(f"Starting analysis of {len(audio_files)} files...")
+        total = len(audio_files)
+        logger.info(f"Starting analysis of {total} files...")
+        
+        # Cached analyses are reused; only the rest is sent to the analysis engine
+        to_analyze = [file_path for file_path in audio_files
+                      if not self._should_use_cached_analysis(self.library_store.get(str(file_path)))
+                      and self._reuse_analysis_by_content(file_path) is None]
+        completed = total - len(to_analyze)
+        self.analysis_progress.emit(completed, total)
         
-        for i, file_path in enumerate(audio_files):
-            self.analysis_progress.emit(i + 1, len(audio_files))
-            self.analyze_sample(file_path)
+        for file_path, result, error in self._get_analysis_engine().analyze(
+                [str(file_path) for file_path in to_analyze], ordered=self.ordered_analysis_delivery):
+            if error is not None:
+                self._create_error_result(Path(file_path), error)
+            else:
+                self._store_analysis_result(Path(file_path), result)
+            
+            completed += 1
+            self.analysis_progress.emit(completed, total)
             
             # Process events to keep UI responsive
             QApplication.processEvents()
@@ -452,18 +694,25 @@ class UniversalSampleManager(QObject):
     
     def get_samples(self, category: Optional[str] = None, 
                    subcategory: Optional[str] = None) -> List[Dict]:
-        """Get samples with optional filtering and file existence checking."""
+        """
+        Get samples with optional filtering.
+        This is a pure index query; entries of deleted files are pruned in the
+        background by the ExistenceVerifier rather than checked here.
+        Browsable subcategories are answered from the subcategory index; any
+        other subcategory falls back to matching every sample of the category.
+        """
         # Ensure cache is migrated
         self._ensure_cache_migrated()
         
+        if subcategory and subcategory.lower() in self._indexed_subcategories:
+            samples = [analysis for _, analysis in
+                       self.library_store.iter_samples(category=category, subcategory=subcategory)]
+            samples.sort(key=lambda x: x.get('file_name', '').lower())
+            return samples
+        
         samples = []
-        invalid_keys = []
         
-        for file_key, analysis in self.sample_cache.items():
-            # Check if the file actually exists
-            if not self._validate_file_existence(file_key, analysis, invalid_keys):
-                continue
-            
+        for file_key, analysis in self.library_store.iter_samples(category=category):
             # Apply filters
             if not self._passes_category_filter(analysis, category):
                 continue
@@ -473,31 +722,57 @@ class UniversalSampleManager(QObject):
             
             samples.append(analysis)
         
-        # Clean up invalid entries
-        self._cleanup_invalid_entries(invalid_keys)
-        
         # Sort by file name for consistent display
         samples.sort(key=lambda x: x.get('file_name', '').lower())
         
         return samples
     
-    def _validate_file_existence(self, file_key: str, analysis: Dict, invalid_keys: List[str]) -> bool:
-        """Validate if file exists and update analysis if needed."""
-        try:
-            file_path = Path(file_key).resolve()
-            
-            # If file doesn't exist, mark for removal
-            if not file_path.exists():
-                invalid_keys.append(file_key)
-                return False
-            
-            # Update file_path in analysis if needed
-            analysis['file_path'] = str(file_path)
-            return True
-            
-        except Exception:
-            invalid_keys.append(file_key)
-            return False
+    def get_sample_entries(self, category: Optional[str] = None,
+                           subcategory: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Get the (file_key, file_name) pairs get_samples would return, in the same order.
+        Indexed subcategories are listed straight from the subcategory index
+        without decoding any analysis, so views can show large subcategories
+        and fetch analyses only for the rows on screen.
+        """
+        if not (subcategory and subcategory.lower() in self._indexed_subcategories):
+            return [(analysis['file_path'], analysis.get('file_name', ''))
+                    for analysis in self.get_samples(category, subcategory)]
+        
+        self._ensure_cache_migrated()
+        entries = [(file_key, file_name or '') for file_key, file_name in
+                   self.library_store.sample_names(category=category, subcategory=subcategory)]
+        entries.sort(key=lambda entry: entry[1].lower())
+        return entries
+    
+    def _subcategory_memberships(self, file_key: str, analysis: Dict) -> List[Tuple[str, str]]:
+        """
+        Resolve the browsable (category, subcategory) nodes a sample appears under.
+        Used by the library store to maintain its subcategory index on every write.
+        
+        Returns:
+            Lower-case (category, subcategory) pairs
+        """
+        # Same view of the analysis that get_samples filters on
+        analysis = {k: v for k, v in analysis.items() if v is not None}
+        analysis['file_path'] = file_key
+        
+        if analysis.get('manual_override'):
+            category = analysis.get('manual_category', '').lower()
+        else:
+            category = analysis.get('category', '').lower()
+        
+        hits = self._filename_keyword_hits(analysis)
+        return [(category, subcategory) for subcategory in self._indexed_subcategories
+                if self._matches_subcategory(analysis, subcategory, hits)]
+    
+    def get_category_counts(self) -> Dict[str, int]:
+        """Number of samples listed under each category's subcategories, keyed in lower case."""
+        return self.library_store.category_counts()
+    
+    def get_subcategory_counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of samples in each browsable subcategory, keyed in lower case."""
+        return self.library_store.subcategory_counts()
     
     def _passes_category_filter(self, analysis: Dict, category: Optional[str]) -> bool:
         """Check if analysis passes category filter."""
@@ -518,17 +793,16 @@ class UniversalSampleManager(QObject):
             
         return self._matches_subcategory(analysis, subcategory.lower())
     
-    def _cleanup_invalid_entries(self, invalid_keys: List[str]):
-        """Clean up invalid cache entries."""
-        for key in invalid_keys:
-            logger.info(f"Removing invalid cache entry: {key}")
-            del self.sample_cache[key]
+    def _matches_subcategory(self, analysis: Dict, subcategory: str,
+                             hits: Optional[Tuple[KeywordHits, KeywordHits]] = None) -> bool:
+        """
+        Check if an analysis matches a given subcategory.
         
-        if invalid_keys:
-            self.save_cache()
-    
-    def _matches_subcategory(self, analysis: Dict, subcategory: str) -> bool:
-        """Check if an analysis matches a given subcategory."""
+        Args:
+            analysis: Sample analysis
+            subcategory: Subcategory name
+            hits: Precomputed (file name, file path) keyword hits, when matching many subcategories
+        """
         # Check for manual overrides first
         if analysis.get('manual_override'):
             manual_subcategory = analysis.get('manual_subcategory', '').lower()
@@ -539,65 +813,44 @@ class UniversalSampleManager(QObject):
         file_name = analysis.get('file_name', '').lower()
         file_path = analysis.get('file_path', '').lower()
         category = analysis.get('category', '').lower()
-        
-        # Get keywords for this subcategory
-        keywords = self._get_subcategory_keywords().get(subcategory.lower(), [subcategory.lower()])
+        subcategory = subcategory.lower()
         
         # Check if any keywords match
-        if self._keyword_matches_file(keywords, file_name, file_path):
-            return True
+        if subcategory in self._get_subcategory_keywords():
+            name_hits, path_hits = hits or self._filename_keyword_hits(analysis)
+            name_match = name_hits.matches('subcategory', subcategory)
+            if name_match or path_hits.matches('subcategory', subcategory):
+                return True
+        else:
+            # Unknown subcategory: its own name is the only keyword
+            name_match = subcategory in file_name
+            if name_match or subcategory in file_path:
+                return True
         
         # Enhanced matching based on analysis results
-        return self._enhanced_subcategory_matching(category, subcategory.lower(), sample_type, file_name, keywords)
+        return self._enhanced_subcategory_matching(category, subcategory, sample_type, file_name, name_match)
+    
+    def _filename_keyword_hits(self, analysis: Dict) -> Tuple[KeywordHits, KeywordHits]:
+        """Scan a sample's file name and path for keywords, once each."""
+        return (keyword_matcher.scan(analysis.get('file_name', '')),
+                keyword_matcher.scan(analysis.get('file_path', '')))
     
     def _get_subcategory_keywords(self) -> Dict[str, List[str]]:
         """Get the mapping of subcategories to their keywords."""
-        return {
-            'kicks': ['kick', 'bd', 'bassdrum', 'bass drum'],
-            'snares': ['snare', 'sd', 'snr'],
-            'claps': ['clap', 'handclap', 'hand clap'],
-            'closed hi-hats': ['closed hat', 'closehat', 'closed_hat', 'chh', 'cl hat', 'clhat', 'close hat'],
-            'open hi-hats': ['open hat', 'openhat', 'open_hat', 'ohh', 'op hat', 'ophat'],
-            'hi-hats': ['hat', 'hh', 'hihat', 'hi-hat', 'hi hat'],  # Fallback for generic hi-hats
-            'cymbals': ['cymbal', 'crash', 'ride', 'splash'],
-            'percussion': ['perc', 'shaker', 'tambourine', 'conga', 'bongo', 'cowbell'],
-            '808': ['808', 'eight', 'sub bass'],
-            'bass loops': ['bass loop', 'bassloop', 'bass'],
-            'electric bass': ['electric bass', 'e-bass'],
-            'synth bass': ['synth bass', 'synthbass'],
-            'melodic loops': ['melodic loop', 'melody loop', 'melodic', 'hook', 'verse', 'bridge'],
-            'keys': ['piano', 'key', 'keys'],
-            'synth leads': ['synth', 'lead'],
-            'pads': ['pad', 'string'],
-            'plucks': ['pluck'],
-            'vocal loops': ['vocal loop', 'vox loop'],
-            'chops': ['chop', 'vocal chop'],
-            'one-shots': ['one shot', 'oneshot', 'hit'],
-            'phrases': ['phrase', 'word', 'lyric'],
-            'risers': ['riser', 'sweep', 'uplifter'],
-            'impacts': ['impact', 'hit', 'stab'],
-            'ambient': ['ambient', 'atmosphere', 'texture'],
-            'foley': ['foley', 'sound effect'],
-            'downlifters': ['downlifter', 'down'],
-            'full loops': ['drum loop', 'drumloop', 'loop']
-        }
-    
-    def _keyword_matches_file(self, keywords: List[str], file_name: str, file_path: str) -> bool:
-        """Check if any keywords match the file name or path."""
-        return any(keyword in file_name or keyword in file_path for keyword in keywords)
+        return self.SUBCATEGORY_KEYWORDS
     
-    def _enhanced_subcategory_matching(self, category: str, subcategory: str, sample_type: str, file_name: str, keywords: List[str]) -> bool:
+    def _enhanced_subcategory_matching(self, category: str, subcategory: str, sample_type: str, file_name: str, name_match: bool) -> bool:
         """Enhanced matching based on analysis results and category."""
         if category == 'bass':
             return self._match_bass_subcategory(subcategory, file_name, sample_type)
         elif category == 'drums':
-            return self._match_drums_subcategory(subcategory, sample_type, file_name, keywords)
+            return self._match_drums_subcategory(subcategory, sample_type, name_match)
         elif category == 'melodic':
-            return self._match_melodic_subcategory(subcategory, sample_type, file_name, keywords)
+            return self._match_melodic_subcategory(subcategory, sample_type, name_match)
         elif category == 'fx':
-            return self._match_fx_subcategory(subcategory, sample_type, file_name, keywords)
+            return self._match_fx_subcategory(subcategory, sample_type, name_match)
         elif category == 'vocals':
-            return self._match_vocals_subcategory(subcategory, sample_type, file_name, keywords)
+            return self._match_vocals_subcategory(subcategory, sample_type, name_match)
         
         return False
     
@@ -609,28 +862,28 @@ class UniversalSampleManager(QObject):
             return True
         return False
     
-    def _match_drums_subcategory(self, subcategory: str, sample_type: str, file_name: str, keywords: List[str]) -> bool:
+    def _match_drums_subcategory(self, subcategory: str, sample_type: str, name_match: bool) -> bool:
         """Match drums subcategories."""
         if subcategory in {'kicks', 'snares', 'claps', 'closed hi-hats', 'open hi-hats', 'hi-hats', 'cymbals', 'percussion', 'full loops'}:
-            return sample_type == 'drums' or any(kw in file_name for kw in keywords)
+            return sample_type == 'drums' or name_match
         return False
     
-    def _match_melodic_subcategory(self, subcategory: str, sample_type: str, file_name: str, keywords: List[str]) -> bool:
+    def _match_melodic_subcategory(self, subcategory: str, sample_type: str, name_match: bool) -> bool:
         """Match melodic subcategories."""
         if subcategory in {'melodic loops', 'keys', 'synth leads', 'pads', 'plucks'}:
-            return sample_type == 'melodic' or any(kw in file_name for kw in keywords)
+            return sample_type == 'melodic' or name_match
         return False
     
-    def _match_fx_subcategory(self, subcategory: str, sample_type: str, file_name: str, keywords: List[str]) -> bool:
+    def _match_fx_subcategory(self, subcategory: str, sample_type: str, name_match: bool) -> bool:
         """Match FX subcategories."""
         if subcategory in {'risers', 'impacts', 'ambient', 'foley', 'downlifters'}:
-            return sample_type == 'fx' or any(kw in file_name for kw in keywords)
+            return sample_type == 'fx' or name_match
         return False
     
-    def _match_vocals_subcategory(self, subcategory: str, sample_type: str, file_name: str, keywords: List[str]) -> bool:
+    def _match_vocals_subcategory(self, subcategory: str, sample_type: str, name_match: bool) -> bool:
         """Match vocals subcategories."""
         if subcategory in {'chops', 'one-shots', 'phrases', 'vocal loops'}:
-            return sample_type == 'vocals' or any(kw in file_name for kw in keywords)
+            return sample_type == 'vocals' or name_match
         return False
     
     def get_sample_suggestions(self, 
@@ -638,37 +891,91 @@ class UniversalSampleManager(QObject):
                              category: Optional[str] = None,
                              bpm_range: Optional[Tuple[float, float]] = None,
                              key: Optional[str] = None,
-                             min_confidence: float = 0.0) -> List[Dict]:
-        """Get sample suggestions based on criteria."""
-        suggestions = []
+                             min_confidence: float = 0.0,
+                             limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get sample suggestions based on criteria, highest confidence first.
+        Filtering and sorting run on the columnar attribute arrays; only the
+        matching analyses are read from the library.
+        """
+        equals = {name: value for name, value in
+                  (('sample_type', sample_type), ('category', category), ('key', key)) if value}
+        ranges = {'overall_confidence': (min_confidence, None)}
+        if bpm_range:
+            ranges['bpm'] = bpm_range
         
-        for analysis in self.sample_cache.values():
-            # Check criteria
-            if sample_type and analysis.get('sample_type') != sample_type:
-                continue
-            
-            if category and analysis.get('category') != category:
-                continue
-            
-            if bpm_range:
-                bpm = analysis.get('bpm', 0)
-                if not (bpm_range[0] <= bpm <= bpm_range[1]):
-                    continue
-            
-            if key and analysis.get('key') != key:
-                continue
-            
-            if analysis.get('overall_confidence', 0) < min_confidence:
-                continue
-            
-            suggestions.append(analysis)
+        file_keys = self.attribute_columns.query(equals, ranges, sort_by='overall_confidence', limit=limit)
+        return [analysis for _, analysis in self.library_store.get_many(file_keys)]
+    
+    def find_similar_samples(self, file_path: Union[str, Path], limit: int = 20) -> List[Dict]:
+        """
+        Find the samples that sound most like the given one.
+        
+        Args:
+            file_path: Indexed sample to compare against
+            limit: Maximum number of results
+        
+        Returns:
+            Analyses of the most similar samples, most similar first, each with
+            a 'similarity' score (cosine, 1.0 = identical); empty if the sample
+            has no embedding yet (analyzed before similarity search existed)
+        """
+        matches = self.similarity_index.similar_to(str(file_path), limit)
+        scores = dict(matches)
+        return [
+            {**analysis, 'similarity': scores[file_key]}
+            for file_key, analysis in self.library_store.get_many([file_key for file_key, _ in matches])
+        ]
+    
+    def find_duplicate_groups(self) -> List[Dict]:
+        """
+        Group the library into exact-duplicate (identical bytes) and
+        near-duplicate (same sound, perceptual hash) clusters.
         
-        # Sort by confidence
-        suggestions.sort(key=lambda x: x.get('overall_confidence', 0), reverse=True)
-        return suggestions
+        Returns:
+            Groups as described by DuplicateDetector.find_groups, most wasted space first
+        """
+        return self.duplicate_detector.find_groups()
+    
+    def get_duplicates(self, file_path: Union[str, Path]) -> List[Dict]:
+        """
+        Get the analyses of the samples that duplicate the given one, exact copies first.
+        Each analysis carries 'duplicate_kind' ('exact' or 'near') and 'hash_distance'.
+        """
+        matches = {match['file_path']: match for match in self.duplicate_detector.duplicates_of(str(file_path))}
+        return [
+            {**analysis, 'duplicate_kind': matches[file_key]['kind'], 'hash_distance': matches[file_key]['distance']}
+            for file_key, analysis in self.library_store.get_many(list(matches))
+        ]
+    
+    def export_duplicate_report(self, output_path: Union[str, Path]) -> int:
+        """
+        Find duplicate groups and write them to a CSV (or .json) report.
+        
+        Returns:
+            Number of samples listed in the report
+        """
+        groups = self.duplicate_detector.find_groups()
+        rows = self.duplicate_detector.export(groups, output_path)
+        logger.info(f"Exported {len(groups)} duplicate groups ({rows} samples) to {output_path}")
+        return rows
     
-    def search_samples(self, query: str) -> List[Dict]:
-        """Search samples by filename, category, or characteristics."""
+    def search_samples(self, query: str, limit: int = 200) -> List[Dict]:
+        """
+        Search samples by filename, directory, category, type, key or manual tags.
+        Uses the library's full-text index (prefix and fuzzy matched, ranked);
+        falls back to a substring scan when SQLite lacks full-text search.
+        
+        Args:
+            query: Free text as typed
+            limit: Maximum number of results from the index
+        
+        Returns:
+            Matching analyses, best match first
+        """
+        if self.library_store.search_index.available:
+            return [analysis for _, analysis in self.library_store.search(query, limit)]
+        
         query_lower = query.lower()
         results = []
         
@@ -697,17 +1004,11 @@ class UniversalSampleManager(QObject):
     
     def get_categories(self) -> Dict[str, List[str]]:
         """Get all categories and their subcategories from indexed samples."""
-        categories = {
-            "Bass": ["808", "Bass Loops", "Electric Bass", "Synth Bass"],
-            "Drums": ["Claps", "Closed Hi-Hats", "Cymbals", "Full Loops", "Kicks", "Open Hi-Hats", "Percussion", "Snares"],
-            "FX": ["Ambient", "Downlifters", "Foley", "Impacts", "Risers"],
-            "Melodic": ["Keys", "Melodic Loops", "Pads", "Plucks", "Synth Leads"],
-            "Vocals": ["Chops", "One-Shots", "Phrases", "Vocal Loops"]
-        }
+        categories = {category: list(subcategories) for category, subcategories in self.DEFAULT_CATEGORIES.items()}
         
         # Also dynamically add categories based on cached samples (merged nested if condition)
-        for analysis in self.sample_cache.values():
-            category = analysis.get('category', '').title()
+        for category in self.library_store.distinct_categories():
+            category = category.title()
             if category and category != "Unknown" and category not in categories:
                 categories[category] = []
         
@@ -718,7 +1019,7 @@ class UniversalSampleManager(QObject):
         try:
             file_key = str(Path(file_path).resolve())
             
-            if file_key in self.sample_cache and (analysis := self.sample_cache[file_key]):
+            if analysis := self.library_store.get(file_key):
                 category = analysis.get('category', 'Unknown').title()
                 subcategory = self._determine_subcategory_from_analysis(analysis, category)
                 return category, subcategory
@@ -752,74 +1053,44 @@ class UniversalSampleManager(QObject):
     
     def _get_drums_subcategory(self, file_name: str) -> str:
         """Get drums subcategory based on file name."""
-        if any(kw in file_name for kw in ['kick', 'bd', 'bassdrum']):
-            return "Kicks"
-        elif any(kw in file_name for kw in ['snare', 'sd', 'snr']):
-            return "Snares"
-        elif any(kw in file_name for kw in ['clap', 'handclap']):
-            return "Claps"
-        elif any(kw in file_name for kw in ['closed hat', 'closehat', 'closed_hat', 'chh', 'cl hat', 'clhat', 'close hat']):
-            return "Closed Hi-Hats"
-        elif any(kw in file_name for kw in ['open hat', 'openhat', 'open_hat', 'ohh', 'op hat', 'ophat']):
-            return "Open Hi-Hats"
-        elif any(kw in file_name for kw in ['hat', 'hh', 'hihat', 'hi-hat', 'hi hat']):
-            return "Closed Hi-Hats"  # Default generic hi-hats to closed (more common)
-        elif any(kw in file_name for kw in ['cymbal', 'crash', 'ride', 'splash']):
-            return "Cymbals"
-        elif any(kw in file_name for kw in ['perc', 'shaker', 'tambourine']):
-            return "Percussion"
-        else:
-            return "Full Loops"
+        return keyword_matcher.scan(file_name).first('drums_subcategory', "Full Loops")
     
     def _get_bass_subcategory(self, file_name: str) -> str:
         """Get bass subcategory based on file name."""
-        if '808' in file_name or 'eight' in file_name:
-            return "808"
-        elif any(kw in file_name for kw in ['electric bass', 'e-bass']):
-            return "Electric Bass"
-        elif any(kw in file_name for kw in ['synth bass', 'synthbass']):
-            return "Synth Bass"
-        else:
-            return "Bass Loops"
+        return keyword_matcher.scan(file_name).first('bass_subcategory', "Bass Loops")
     
     def _get_melodic_subcategory(self, file_name: str) -> str:
         """Get melodic subcategory based on file name."""
-        if any(kw in file_name for kw in ['piano', 'key', 'keys']):
-            return "Keys"
-        elif any(kw in file_name for kw in ['synth', 'lead']):
-            return "Synth Leads"
-        elif any(kw in file_name for kw in ['pad', 'string']):
-            return "Pads"
-        elif 'pluck' in file_name:
-            return "Plucks"
-        else:
-            return "Melodic Loops"
+        return keyword_matcher.scan(file_name).first('melodic_subcategory', "Melodic Loops")
     
     def _get_fx_subcategory(self, file_name: str) -> str:
         """Get FX subcategory based on file name."""
-        if any(kw in file_name for kw in ['riser', 'sweep']):
-            return "Risers"
-        elif any(kw in file_name for kw in ['impact', 'hit', 'stab']):
-            return "Impacts"
-        elif any(kw in file_name for kw in ['ambient', 'atmosphere']):
-            return "Ambient"
-        elif any(kw in file_name for kw in ['foley', 'sound effect']):
-            return "Foley"
-        elif any(kw in file_name for kw in ['downlifter', 'down']):
-            return "Downlifters"
-        else:
-            return "Impacts"
+        return keyword_matcher.scan(file_name).first('fx_subcategory', "Impacts")
     
     def _get_vocals_subcategory(self, file_name: str) -> str:
         """Get vocals subcategory based on file name."""
-        if any(kw in file_name for kw in ['chop', 'vocal chop']):
-            return "Chops"
-        elif any(kw in file_name for kw in ['phrase', 'word', 'lyric']):
-            return "Phrases"
-        elif any(kw in file_name for kw in ['one shot', 'oneshot', 'hit']):
-            return "One-Shots"
-        else:
-            return "Vocal Loops"
+        return keyword_matcher.scan(file_name).first('vocals_subcategory', "Vocal Loops")
+    
+    def apply_manual_category_override(self, file_path: str, category: str, subcategory: str, key: str) -> bool:
+        """
+        Apply a manual category, subcategory and key override to a sample.
+        
+        Returns:
+            True if the sample was found and updated
+        """
+        file_key = str(Path(file_path).resolve())
+        updated = self.sample_cache.update_entry(file_key, {
+            "category": category.lower(),
+            "key": key,
+            "manual_override": True,
+            "manual_category": category,
+            "manual_subcategory": subcategory,
+            "manual_key": key
+        })
+        
+        if updated:
+            logger.info(f"Applied manual override to {Path(file_path).name}: {category} > {subcategory}, Key: {key}")
+        return updated
     
     def remove_sample(self, file_path: str):
         """Remove a sample from cache."""
@@ -827,12 +1098,8 @@ class UniversalSampleManager(QObject):
             file_key = str(Path(file_path).resolve())
             
             # Remove from cache
-            if file_key in self.sample_cache:
-                del self.sample_cache[file_key]
+            if self.library_store.delete(file_key):
                 logger.info(f"Removed {file_path} from cache")
-                
-                # Save updated cache
-                self.save_cache()
             else:
                 logger.warning(f"Sample {file_path} not found in cache")
             
@@ -852,12 +1119,9 @@ class UniversalSampleManager(QObject):
     
     def clear_cache(self):
         """Clear the analysis cache and tracked directories."""
-        self.sample_cache = {}
+        self.library_store.clear()
         self.tracked_directories = set()
         
-        # Save empty cache
-        self.save_cache()
-        
         logger.info("Cache and tracked directories cleared")
     
     def export_analysis_results(self, output_file: str):
@@ -867,7 +1131,7 @@ class UniversalSampleManager(QObject):
                 "system_info": self.system_info,
                 "analysis_stats": self.get_analysis_stats(),
                 "tracked_directories": list(self.tracked_directories),
-                "samples": self.sample_cache
+                "samples": self.sample_cache.to_dict()
             }
             
             with open(output_file, 'w') as f:
@@ -890,11 +1154,8 @@ class UniversalSampleManager(QObject):
                 if self._process_migration_entry(file_key, analysis, migrated_cache, migration_stats):
                     migration_stats["migrated_count"] += 1
             
-            # Replace cache with migrated version
-            self.sample_cache = migrated_cache
-            
-            # Save migrated cache
-            self.save_cache()
+            # Replace cache with migrated version in a single transaction
+            self.library_store.replace_all(migrated_cache.items())
             
             logger.info(f"Cache migration complete: {migration_stats['migrated_count']} entries migrated, "
                        f"{migration_stats['fixed_paths']} paths fixed, {migration_stats['analyzed_count']} samples re-analyzed")
@@ -995,13 +1256,10 @@ class UniversalSampleManager(QObject):
     
     def _needs_cache_migration(self) -> bool:
         """Check if the cache needs migration from relative to absolute paths."""
-        for file_key, analysis in self.sample_cache.items():
-            # Check if path is relative or if category is unknown
-            if not Path(file_key).is_absolute():
-                return True
-            if analysis.get("category") == "unknown" and not analysis.get("analyzed", False):
-                return True
-        return False
+        # Check for unanalyzed unknown entries first (indexed query), then for relative keys
+        if self.library_store.has_unanalyzed_unknowns():
+            return True
+        return self.library_store.has_relative_keys()
     
     def _ensure_cache_migrated(self):
         """Ensure cache is migrated before performing operations."""
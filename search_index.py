@@ -0,0 +1,257 @@
+import re
+import sqlite3
+import logging
+from pathlib import PurePath
+from typing import Dict, Iterable, List, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Token rule of FTS5's unicode61 tokenizer: runs of letters and digits
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case search tokens the way the index does."""
+    return _TOKEN_RE.findall(text.lower())
+
+def term_trigrams(term: str) -> List[str]:
+    """Distinct trigrams of a term padded with one space on each side."""
+    padded = f" {term} "
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+def edit_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance (Levenshtein plus adjacent transpositions)."""
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+class SampleSearchIndex:
+    """
+    Full-text search index over the sample library, stored in the library database.
+    An FTS5 table indexes file names, directory components, categories, sample
+    types, keys and manual tags, with prefix indexes so every keystroke can be
+    answered as a prefix query ranked by bm25. A trigram table over the indexed
+    terms adds fuzzy matching for typos.
+    
+    The owning store calls the write and delete methods inside its own
+    transactions, so the index always matches the sample table.
+    """
+    
+    # Bump whenever the indexed document changes so existing libraries are reindexed
+    VERSION = "1"
+    
+    # bm25 weights of the indexed columns, in table order
+    COLUMN_WEIGHTS = {
+        "file_name": 10.0,
+        "directories": 2.0,
+        "category": 4.0,
+        "sample_type": 3.0,
+        "key": 3.0,
+        "tags": 6.0
+    }
+    
+    # Fuzzy matching: shortest token expanded, candidates taken from the trigram
+    # table, and number of similar terms added per token
+    FUZZY_MIN_LENGTH = 3
+    FUZZY_CANDIDATES = 100
+    FUZZY_MAX_TERMS = 8
+    
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Args:
+            conn: Library database connection (owned and locked by the store)
+        """
+        self._conn = conn
+        self.available = self._create_schema()
+        
+        weights = ", ".join(str(weight) for weight in self.COLUMN_WEIGHTS.values())
+        self._match_sql = (
+            # Ranked inside SQLite (a bounded top-k sort), so the best matches are
+            # found however many rows match
+            "SELECT rowid FROM sample_search WHERE sample_search MATCH ? "
+            f"ORDER BY bm25(sample_search, {weights}) LIMIT ?"
+        )
+    
+    def _create_schema(self) -> bool:
+        """Create the search tables. Returns False if SQLite lacks FTS5."""
+        columns = ", ".join(self.COLUMN_WEIGHTS)
+        try:
+            with self._conn:
+                self._conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS sample_search USING fts5({columns}, prefix='1 2 3 4')"
+                )
+                # Stable FTS rowid per file key (sample rows are replaced on every write)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS sample_search_keys (id INTEGER PRIMARY KEY, file_path TEXT UNIQUE)"
+                )
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_trigrams "
+                    "(trigram TEXT, term TEXT, size INTEGER, PRIMARY KEY (trigram, term)) WITHOUT ROWID"
+                )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search unavailable, falling back to linear search: {e}")
+            return False
+    
+    def _document(self, file_key: str, analysis: Dict) -> Tuple[str, ...]:
+        """Build the indexed text columns of one sample."""
+        def text(*fields: str) -> str:
+            return " ".join(str(analysis[field]) for field in fields if analysis.get(field))
+        
+        path = PurePath(file_key)
+        return (
+            analysis.get("file_name") or path.name,
+            " ".join(path.parent.parts),
+            text("category"),
+            text("sample_type"),
+            text("key"),
+            text("manual_category", "manual_subcategory", "manual_key", "hihat_subcategory")
+        )
+    
+    def write(self, items: List[Tuple[str, Dict]]):
+        """Index or reindex samples. Must run inside the store's transaction."""
+        if not self.available or not items:
+            return
+        
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO sample_search_keys (file_path) VALUES (?)", [(file_key,) for file_key, _ in items]
+        )
+        
+        rows = []
+        terms = set()
+        for file_key, analysis in items:
+            row_id = self._conn.execute(
+                "SELECT id FROM sample_search_keys WHERE file_path = ?", (file_key,)
+            ).fetchone()[0]
+            document = self._document(file_key, analysis)
+            rows.append((row_id, *document))
+            terms.update(tokenize(" ".join(document)))
+        
+        self._conn.executemany("DELETE FROM sample_search WHERE rowid = ?", [(row[0],) for row in rows])
+        self._conn.executemany(
+            f"INSERT INTO sample_search (rowid, {', '.join(self.COLUMN_WEIGHTS)}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        
+        # Vocabulary for fuzzy matching; terms are only added, stale ones are harmless
+        trigram_rows = []
+        for term in terms:
+            if len(term) >= self.FUZZY_MIN_LENGTH and not term.isdigit():
+                trigrams = term_trigrams(term)
+                trigram_rows.extend((trigram, term, len(trigrams)) for trigram in trigrams)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO search_trigrams (trigram, term, size) VALUES (?, ?, ?)", trigram_rows
+        )
+    
+    def delete(self, file_keys: Iterable[str]):
+        """Drop samples from the index. Must run inside the store's transaction."""
+        self._delete_where("file_path = ?", [(file_key,) for file_key in file_keys])
+    
+    def delete_under_directory(self, directory: str):
+        """Drop every sample whose path starts with the directory."""
+        self._delete_where("substr(file_path, 1, ?) = ?", [(len(directory), directory)])
+    
+    def delete_in_directories(self, rows: List[Tuple[str]]):
+        """Drop the samples directly inside the directories. Run before the sample rows are deleted."""
+        self._delete_where("file_path IN (SELECT file_path FROM samples WHERE directory = ?)", rows)
+    
+    def _delete_where(self, condition: str, params: List[Tuple]):
+        """Delete the FTS rows and rowid mappings of the keys matching the condition."""
+        if not self.available or not params:
+            return
+        self._conn.executemany(
+            f"DELETE FROM sample_search WHERE rowid IN (SELECT id FROM sample_search_keys WHERE {condition})", params
+        )
+        self._conn.executemany(f"DELETE FROM sample_search_keys WHERE {condition}", params)
+    
+    def clear(self):
+        """Empty the index. Must run inside the store's transaction."""
+        if not self.available:
+            return
+        self._conn.execute("DELETE FROM sample_search")
+        self._conn.execute("DELETE FROM sample_search_keys")
+        self._conn.execute("DELETE FROM search_trigrams")
+    
+    def search(self, query: str, limit: int = 200) -> List[str]:
+        """
+        Find samples matching every token of a query.
+        The last token matches as a prefix, so the word being typed already
+        hits; earlier tokens are complete words and match exactly. If that
+        leaves room under the limit, tokens are widened with similar indexed
+        terms and the fuzzy results are appended after the exact ones.
+        
+        Args:
+            query: Free text as typed
+            limit: Maximum number of results
+        
+        Returns:
+            File keys, best match first
+        """
+        if not self.available or not (tokens := tokenize(query)):
+            return []
+        
+        terms = [f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*']
+        file_keys = self._match(" AND ".join(terms), limit)
+        if len(file_keys) >= limit:
+            return file_keys
+        
+        clauses = []
+        widened = False
+        for token, term in zip(tokens, terms):
+            alternatives = [term] + [f'"{similar}"' for similar in self.similar_terms(token)]
+            widened |= len(alternatives) > 1
+            clauses.append(f"({' OR '.join(alternatives)})")
+        if not widened:
+            return file_keys
+        
+        found = set(file_keys)
+        for file_key in self._match(" AND ".join(clauses), limit):
+            if len(file_keys) >= limit:
+                break
+            if file_key not in found:
+                file_keys.append(file_key)
+        return file_keys
+    
+    def similar_terms(self, token: str) -> List[str]:
+        """
+        Indexed terms within a small edit distance of a (possibly misspelled) token.
+        Terms sharing the most trigrams are the candidates; the edit distance,
+        which also counts swapped letters as one edit, decides.
+        """
+        if len(token) < self.FUZZY_MIN_LENGTH or token.isdigit():
+            return []
+        
+        trigrams = term_trigrams(token)
+        max_edits = 1 if len(token) < 6 else 2
+        placeholders = ", ".join("?" for _ in trigrams)
+        candidates = self._conn.execute(
+            f"SELECT term FROM search_trigrams WHERE trigram IN ({placeholders}) AND abs(size - ?) <= ? "
+            "GROUP BY term ORDER BY COUNT(*) DESC LIMIT ?",
+            (*trigrams, len(trigrams), max_edits, self.FUZZY_CANDIDATES)
+        ).fetchall()
+        
+        scored = [(distance, term) for (term,) in candidates
+                  if term != token and (distance := edit_distance(token, term)) <= max_edits]
+        return [term for _, term in sorted(scored)[:self.FUZZY_MAX_TERMS]]
+    
+    def _match(self, expression: str, limit: int) -> List[str]:
+        """Run an FTS5 match expression and return file keys ranked by bm25."""
+        try:
+            rows = self._conn.execute(self._match_sql, (expression, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Search query failed ({expression}): {e}")
+            return []
+        
+        row_ids = [row_id for (row_id,) in rows]
+        placeholders = ", ".join("?" for _ in row_ids)
+        file_keys = dict(self._conn.execute(
+            f"SELECT id, file_path FROM sample_search_keys WHERE id IN ({placeholders})", row_ids
+        ).fetchall()) if row_ids else {}
+        return [file_keys[row_id] for row_id in row_ids if row_id in file_keys]
@@ -0,0 +1,219 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from audio_embedding import EMBEDDING_SIZE, EMBEDDING_VERSION
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour search over the audio embeddings of the library.
+    Embeddings live in one contiguous float32 matrix. Each dimension is
+    standardized with library-wide statistics and rows are scaled to unit
+    length, so a single matrix-vector product yields the cosine similarity
+    of every sample to the query and argpartition picks the top k.
+    
+    Like AttributeColumns, the matrix is loaded from the library store on
+    first use and then follows the store's change notifications.
+    """
+    
+    # Standardization statistics are refitted once the library has doubled
+    # (or grown past this size) since they were last computed
+    MIN_FIT_ROWS = 64
+    
+    def __init__(self, library_store, initial_capacity: int = 1024):
+        """
+        Args:
+            library_store: SampleLibraryStore whose embeddings are indexed
+            initial_capacity: Rows allocated before the first growth
+        """
+        self.library_store = library_store
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._initial_capacity = initial_capacity
+        self._reset(initial_capacity)
+        
+        library_store.add_change_listener(self)
+    
+    def _reset(self, capacity: int):
+        """Drop all rows and allocate empty matrices."""
+        self._size = 0  # High-water mark of used rows
+        self._keys: List[Optional[str]] = []
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._raw = np.zeros((capacity, EMBEDDING_SIZE), dtype=np.float32)
+        self._unit = np.zeros((capacity, EMBEDDING_SIZE), dtype=np.float32)
+        self._mean = np.zeros(EMBEDDING_SIZE, dtype=np.float32)
+        self._scale = np.ones(EMBEDDING_SIZE, dtype=np.float32)
+        self._fitted_rows = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._slots)
+    
+    # Loading and maintenance
+    
+    def _ensure_loaded(self):
+        """Load every current embedding from the store. Caller holds the lock."""
+        if self._loaded:
+            return
+        
+        rows = [
+            (file_key, embedding)
+            for file_key, embedding, version in self.library_store.iter_attribute_rows(
+                [("embedding",), ("embedding_version",)]
+            )
+            if embedding is not None and version == EMBEDDING_VERSION
+        ]
+        rows = [(file_key, embedding) for file_key, embedding in rows
+                if len(embedding) == EMBEDDING_SIZE * np.dtype(np.float32).itemsize]
+        self._reset(max(self._initial_capacity, len(rows)))
+        
+        # Bulk fill: rows are normalized together by _fit
+        self._size = len(rows)
+        self._keys = [file_key for file_key, _ in rows]
+        self._slots = {file_key: slot for slot, file_key in enumerate(self._keys)}
+        if rows:
+            self._raw[:len(rows)] = np.frombuffer(b"".join(embedding for _, embedding in rows),
+                                                  dtype=np.float32).reshape(len(rows), EMBEDDING_SIZE)
+        self._alive[:len(rows)] = True
+        self._fit()
+        self._loaded = True
+        logger.info(f"Loaded {len(rows)} sample embeddings for similarity search")
+    
+    def _set_row(self, file_key: str, embedding: np.ndarray):
+        """Store one raw embedding, allocating a row if needed."""
+        if embedding.shape != (EMBEDDING_SIZE,):
+            self._remove(file_key)
+            return
+        
+        slot = self._slots.get(file_key)
+        if slot is None:
+            slot = self._free.pop() if self._free else self._grow()
+            self._slots[file_key] = slot
+            self._keys[slot] = file_key
+        self._raw[slot] = embedding
+        self._unit[slot] = self._normalize(embedding)
+        self._alive[slot] = True
+    
+    def _remove(self, file_key: str):
+        """Free the row of a sample, if it has one."""
+        if (slot := self._slots.pop(file_key, None)) is not None:
+            self._alive[slot] = False
+            self._keys[slot] = None
+            self._unit[slot] = 0
+            self._free.append(slot)
+    
+    def _grow(self) -> int:
+        """Append a row, doubling the matrix capacity when full."""
+        slot = self._size
+        if slot >= len(self._alive):
+            capacity = max(1, len(self._alive)) * 2
+            self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+            padding = np.zeros((capacity - len(self._raw), EMBEDDING_SIZE), dtype=np.float32)
+            self._raw = np.concatenate([self._raw, padding])
+            self._unit = np.concatenate([self._unit, padding])
+        self._size += 1
+        self._keys.append(None)
+        return slot
+    
+    def _normalize(self, embeddings: np.ndarray) -> np.ndarray:
+        """Standardize embeddings (rows) and scale them to unit length."""
+        standardized = (embeddings - self._mean) / self._scale
+        norms = np.linalg.norm(standardized, axis=-1, keepdims=True)
+        return standardized / np.where(norms > 0, norms, 1)
+    
+    def _fit(self):
+        """Recompute the standardization statistics and renormalize every row."""
+        alive = self._alive[:self._size]
+        if alive.any():
+            raw = self._raw[:self._size][alive]
+            self._mean = raw.mean(axis=0)
+            scale = raw.std(axis=0)
+            self._scale = np.where(scale > 1e-6, scale, 1).astype(np.float32)
+            self._unit[:self._size] = np.where(alive[:, None], self._normalize(self._raw[:self._size]), 0)
+        self._fitted_rows = int(alive.sum())
+    
+    def samples_written(self, items: Iterable[Tuple[str, Dict]]):
+        """Store notification: analyses were inserted or replaced."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for file_key, analysis in items:
+                embedding = analysis.get("embedding")
+                if embedding is None or analysis.get("embedding_version") != EMBEDDING_VERSION:
+                    self._remove(file_key)
+                else:
+                    self._set_row(file_key, np.asarray(embedding, dtype=np.float32))
+            if len(self._slots) >= max(self.MIN_FIT_ROWS, 2 * self._fitted_rows):
+                self._fit()
+    
+    def samples_deleted(self, file_keys: Iterable[str]):
+        """Store notification: analyses were deleted."""
+        with self._lock:
+            if not self._loaded:
+                return
+            for file_key in file_keys:
+                self._remove(file_key)
+    
+    def samples_cleared(self):
+        """Store notification: every analysis was deleted."""
+        with self._lock:
+            if self._loaded:
+                self._reset(self._initial_capacity)
+    
+    # Queries
+    
+    def contains(self, file_key: str) -> bool:
+        """Check whether a sample has an embedding in the index."""
+        with self._lock:
+            self._ensure_loaded()
+            return file_key in self._slots
+    
+    def similar_to(self, file_key: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Find the samples that sound most like an indexed sample.
+        
+        Args:
+            file_key: Sample to compare against (excluded from the results)
+            limit: Maximum number of results
+        
+        Returns:
+            (file_key, cosine similarity) pairs, most similar first; empty if
+            the sample has no embedding
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if (slot := self._slots.get(file_key)) is None:
+                return []
+            return self._top_k(self._unit[slot].copy(), limit, exclude=slot)
+    
+    def similar_to_embedding(self, embedding: List[float], limit: int = 20) -> List[Tuple[str, float]]:
+        """Find the samples closest to a raw embedding (e.g. of a file outside the library)."""
+        with self._lock:
+            self._ensure_loaded()
+            return self._top_k(self._normalize(np.asarray(embedding, dtype=np.float32)), limit)
+    
+    def _top_k(self, query: np.ndarray, limit: int, exclude: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Rank live rows by cosine similarity to a unit query vector. Caller holds the lock."""
+        size = self._size
+        if size == 0 or limit <= 0:
+            return []
+        
+        scores = self._unit[:size] @ query
+        scores[~self._alive[:size]] = -np.inf
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        
+        count = min(limit, len(self._slots) - (exclude is not None))
+        if count <= 0:
+            return []
+        top = np.argpartition(-scores, count - 1)[:count] if count < size else np.arange(size)
+        top = top[np.argsort(-scores[top], kind="stable")][:count]
+        return [(self._keys[slot], float(scores[slot])) for slot in top]
@@ -0,0 +1,197 @@
+import logging
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from frame_energy import FrameEnergy
+from streaming_audio import AudioSummary, averaged_spectrum
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SpectralFeatureContext:
+    """
+    Per-sample cache of the spectral features shared by the analyzer's classifiers.
+    Each feature is computed on first access and reused afterwards, so one
+    analyze_sample call computes a single averaged spectrum and a single STFT
+    no matter how many classifiers ask for them.
+    
+    For a streamed file, the summaries gathered while decoding stand in for
+    the full-length passes: frame energies, level, zero crossings and the
+    spectrum. The spectrum estimator is the same either way, so band ratios
+    do not jump at the streaming threshold. The summaries describe the whole
+    file even when y is only the analysis window (see AnalysisWindowPolicy),
+    and so does duration.
+    """
+    
+    def __init__(self, y: np.ndarray, sr: int, hop_length: int = 512,
+                 summary: Optional[AudioSummary] = None):
+        """
+        Args:
+            y: Mono audio signal
+            sr: Sample rate of the signal
+            hop_length: Hop length used by the frame-based (librosa) features
+            summary: Whole-file summaries from stream_audio (same sr and hop_length), if streamed or windowed
+        """
+        self.y = y
+        self.sr = sr
+        self.hop_length = hop_length
+        self.summary = summary
+        self._band_energies: Dict[Tuple[Optional[float], Optional[float]], float] = {}
+    
+    @cached_property
+    def duration(self) -> float:
+        """Duration of the whole file in seconds."""
+        if self.summary is not None:
+            return self.summary.duration
+        return len(self.y) / self.sr
+    
+    @cached_property
+    def frame_energy(self) -> FrameEnergy:
+        """Per-frame energy, RMS and energy flux over hop_length frames."""
+        if self.summary is not None:
+            return self.summary.frame_energy
+        return FrameEnergy(self.y, self.hop_length)
+    
+    @cached_property
+    def rms(self) -> float:
+        """Root-mean-square level of the whole signal."""
+        if self.summary is not None:
+            return self.summary.rms
+        return float(np.sqrt(np.mean(self.y ** 2)))
+    
+    @cached_property
+    def zero_crossing_fraction(self) -> float:
+        """Sign changes per sample over the whole signal."""
+        if self.summary is not None:
+            return self.summary.zero_crossing_rate
+        return len(np.where(np.diff(np.signbit(self.y)))[0]) / len(self.y)
+    
+    # --- Averaged spectrum (numpy only) ---
+    
+    @cached_property
+    def _spectrum(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positive half of the spectrum as (frequencies, magnitudes).
+        Averaged over half-overlapping 8192-point frames (see
+        streaming_audio.AveragedSpectrum) for every file length, streamed or not.
+        """
+        if self.summary is not None:
+            return self.summary.spectrum
+        return averaged_spectrum(self.y, self.sr)
+    
+    @property
+    def positive_freqs(self) -> np.ndarray:
+        """Frequencies of the positive spectrum bins, in ascending order."""
+        return self._spectrum[0]
+    
+    @property
+    def positive_magnitude(self) -> np.ndarray:
+        """Magnitudes of the positive spectrum bins."""
+        return self._spectrum[1]
+    
+    @cached_property
+    def total_magnitude(self) -> float:
+        """Sum of all positive-bin magnitudes."""
+        return np.sum(self.positive_magnitude)
+    
+    @cached_property
+    def fft_centroid(self) -> float:
+        """Magnitude-weighted mean frequency of the spectrum (0 for silence)."""
+        if self.total_magnitude > 0:
+            return np.sum(self.positive_freqs * self.positive_magnitude) / self.total_magnitude
+        return 0
+    
+    def band_energy(self, low: Optional[float] = None, high: Optional[float] = None) -> float:
+        """
+        Summed magnitude of the bins with low <= frequency < high.
+        
+        Args:
+            low: Lower bound in Hz (None = from 0 Hz)
+            high: Upper bound in Hz, exclusive (None = up to Nyquist)
+        """
+        key = (low, high)
+        if key not in self._band_energies:
+            # Bins are sorted, so each band is a contiguous slice
+            freqs = self.positive_freqs
+            start = 0 if low is None else np.searchsorted(freqs, low, side='left')
+            stop = len(freqs) if high is None else np.searchsorted(freqs, high, side='left')
+            self._band_energies[key] = np.sum(self.positive_magnitude[start:stop])
+        return self._band_energies[key]
+    
+    @cached_property
+    def dominant_frequency(self) -> Optional[float]:
+        """Frequency of the strongest positive bin, or None for an empty signal."""
+        if len(self.positive_magnitude) == 0:
+            return None
+        return self.positive_freqs[np.argmax(self.positive_magnitude)]
+    
+    # --- STFT-based features (librosa) ---
+    
+    @cached_property
+    def stft_magnitude(self) -> np.ndarray:
+        """Magnitude STFT with librosa's default framing, shared by every frame feature."""
+        import librosa
+        return np.abs(librosa.stft(y=self.y, hop_length=self.hop_length))
+    
+    @cached_property
+    def power_spectrogram(self) -> np.ndarray:
+        """Power STFT (squared magnitude)."""
+        return self.stft_magnitude ** 2
+    
+    @cached_property
+    def log_mel_spectrogram(self) -> np.ndarray:
+        """Log-power mel spectrogram, the input to MFCCs and onset strength."""
+        import librosa
+        mel = librosa.feature.melspectrogram(S=self.power_spectrogram, sr=self.sr)
+        return librosa.power_to_db(mel)
+    
+    @cached_property
+    def onset_envelope(self) -> np.ndarray:
+        """Onset strength envelope (mean aggregation, as librosa.onset.onset_strength)."""
+        import librosa
+        return librosa.onset.onset_strength(S=self.log_mel_spectrogram, sr=self.sr, hop_length=self.hop_length)
+    
+    @cached_property
+    def tempo_onset_envelope(self) -> np.ndarray:
+        """Onset strength envelope with median aggregation, as used by librosa.beat.beat_track."""
+        import librosa
+        return librosa.onset.onset_strength(S=self.log_mel_spectrogram, sr=self.sr,
+                                            hop_length=self.hop_length, aggregate=np.median)
+    
+    @cached_property
+    def spectral_centroid(self) -> np.ndarray:
+        """Per-frame spectral centroid."""
+        import librosa
+        return librosa.feature.spectral_centroid(S=self.stft_magnitude, sr=self.sr, hop_length=self.hop_length)
+    
+    @cached_property
+    def spectral_rolloff(self) -> np.ndarray:
+        """Per-frame spectral rolloff."""
+        import librosa
+        return librosa.feature.spectral_rolloff(S=self.stft_magnitude, sr=self.sr, hop_length=self.hop_length)
+    
+    @cached_property
+    def spectral_bandwidth(self) -> np.ndarray:
+        """Per-frame spectral bandwidth."""
+        import librosa
+        return librosa.feature.spectral_bandwidth(S=self.stft_magnitude, sr=self.sr, hop_length=self.hop_length)
+    
+    @cached_property
+    def zero_crossing_rate(self) -> np.ndarray:
+        """Per-frame zero crossing rate."""
+        import librosa
+        return librosa.feature.zero_crossing_rate(self.y, hop_length=self.hop_length)
+    
+    @cached_property
+    def mfcc(self) -> np.ndarray:
+        """13 MFCCs per frame."""
+        import librosa
+        return librosa.feature.mfcc(S=self.log_mel_spectrogram, sr=self.sr, n_mfcc=13)
+    
+    @cached_property
+    def chroma(self) -> np.ndarray:
+        """Chromagram computed from the shared power STFT."""
+        import librosa
+        return librosa.feature.chroma_stft(S=self.power_spectrogram, sr=self.sr, hop_length=self.hop_length)
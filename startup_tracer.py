@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+def _resident_memory() -> Optional[int]:
+    """Current resident set size of the process in bytes, or None if unknown."""
+    if PSUTIL_AVAILABLE:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+def _peak_memory() -> Optional[int]:
+    """Peak resident set size of the process in bytes, or None if unknown."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    if PSUTIL_AVAILABLE:
+        try:
+            return getattr(psutil.Process().memory_info(), "peak_wset", None)
+        except Exception:
+            pass
+    return None
+
+class StartupTracer:
+    """
+    Records where application startup spends its time and memory.
+    Phases are timed with a context manager and may nest (importing the
+    sample manager constructs the analyzer, which runs CPU detection), so
+    the report reads as a tree. Times are offsets from the moment this
+    module was imported, which main.py does before anything heavy.
+    
+    Tracing stops at finish(), called once the window is interactive;
+    later phase() calls just run their block, so wrapped code paths that
+    also run after startup cost nothing extra.
+    """
+    
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: List[Dict] = []
+        self.marks: List[Dict] = []
+        self.finished_at: Optional[float] = None
+        self.peak_memory: Optional[int] = None
+        self._depth = 0
+        self._thread_id = threading.get_ident()
+    
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+    
+    @property
+    def active(self) -> bool:
+        """Whether phases are still being recorded."""
+        return self.finished_at is None
+    
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a block of startup work.
+        Only the thread that imported the tracer (the GUI thread) records;
+        blocks on other threads or after finish() run untraced.
+        
+        Args:
+            name: Label shown in the report
+        """
+        if not self.active or threading.get_ident() != self._thread_id:
+            yield
+            return
+        
+        record = {"name": name, "depth": self._depth, "start": self._elapsed()}
+        self.phases.append(record)
+        memory_before = _resident_memory()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            record["duration"] = self._elapsed() - record["start"]
+            memory_after = _resident_memory()
+            record["memory"] = memory_after
+            record["memory_delta"] = (memory_after - memory_before
+                                      if memory_before is not None and memory_after is not None else None)
+    
+    def mark(self, name: str):
+        """Record an instantaneous startup event (e.g. the window becoming interactive)."""
+        if self.active:
+            self.marks.append({"name": name, "time": self._elapsed(), "memory": _resident_memory()})
+    
+    def finish(self):
+        """Stop tracing; the total startup time is the time of this call."""
+        if self.active:
+            self.finished_at = self._elapsed()
+            self.peak_memory = _peak_memory()
+            logger.info(f"Startup finished in {self.finished_at * 1000:.0f} ms")
+    
+    def to_dict(self) -> Dict:
+        """Phases and marks as plain data (the JSON dump format)."""
+        return {
+            "total_seconds": self.finished_at if self.finished_at is not None else self._elapsed(),
+            "peak_memory_bytes": self.peak_memory,
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "phases": [dict(record) for record in self.phases],
+            "marks": [dict(record) for record in self.marks]
+        }
+    
+    def report(self) -> str:
+        """Human-readable table of phases and marks."""
+        def megabytes(value: Optional[int], signed: bool = False) -> str:
+            if value is None:
+                return "n/a"
+            return f"{value / (1024 * 1024):+.1f} MB" if signed else f"{value / (1024 * 1024):.1f} MB"
+        
+        data = self.to_dict()
+        lines = [f"{'Phase':<44} {'Start':>9} {'Duration':>10} {'Memory':>11}"]
+        for record in data["phases"]:
+            name = "  " * record["depth"] + record["name"]
+            duration = record.get("duration")
+            lines.append(
+                f"{name:<44} {record['start'] * 1000:>7.0f}ms "
+                f"{'running' if duration is None else f'{duration * 1000:.1f}ms':>10} "
+                f"{megabytes(record.get('memory_delta'), signed=True):>11}"
+            )
+        for record in data["marks"]:
+            lines.append(f"{'@ ' + record['name']:<44} {record['time'] * 1000:>7.0f}ms")
+        lines.append(f"Total: {data['total_seconds'] * 1000:.0f} ms, peak memory {megabytes(data['peak_memory_bytes'])}")
+        return "\n".join(lines)
+    
+    def dump(self, output_path: Union[str, Path]):
+        """
+        Write the profile to a file: JSON for a .json path, otherwise the text report.
+        
+        Args:
+            output_path: File to create
+        """
+        output_path = Path(output_path)
+        with open(output_path, "w", encoding="utf-8") as f:
+            if output_path.suffix.lower() == ".json":
+                json.dump(self.to_dict(), f, indent=2)
+            else:
+                f.write(self.report() + "\n")
+        logger.info(f"Startup profile written to {output_path}")
+
+# Global instance, created when main.py starts importing
+startup_tracer = StartupTracer()
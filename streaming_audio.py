@@ -0,0 +1,278 @@
+import logging
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from frame_energy import FrameEnergy
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Frames decoded per soundfile block
+STREAM_BLOCK_FRAMES = 65536
+
+# Frame length of the averaged spectrum (~2.7 Hz bins at 22050 Hz)
+SUMMARY_FFT_SIZE = 8192
+
+class LinearResampler:
+    """
+    Block-by-block linear-interpolation resampler.
+    Keeps the last input sample and the fractional read position between
+    blocks, so feeding a signal in pieces gives the same output as
+    resampling it in one go, without full-length index arrays.
+    """
+    
+    def __init__(self, orig_sr: int, target_sr: int):
+        """
+        Args:
+            orig_sr: Sample rate of the input blocks
+            target_sr: Sample rate of the output
+        """
+        self.step = orig_sr / target_sr
+        self._position = 0.0  # Read position of the next output sample, relative to _tail
+        self._tail = np.zeros(0, dtype=np.float32)
+    
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample the next input block; returns the output samples it completes."""
+        if self.step == 1:
+            return block
+        
+        data = np.concatenate([self._tail, block]) if len(self._tail) else block
+        last = len(data) - 1
+        if last < 0:
+            return np.zeros(0, dtype=np.float32)
+        if self._position > last:
+            # Downsampling by more than the block length: nothing due yet
+            self._position -= last
+            self._tail = data[-1:]
+            return np.zeros(0, dtype=np.float32)
+        
+        count = int((last - self._position) // self.step) + 1
+        positions = self._position + np.arange(count) * self.step
+        index = positions.astype(np.int64)
+        fraction = (positions - index).astype(np.float32)
+        upper = np.minimum(index + 1, last)
+        out = data[index] + (data[upper] - data[index]) * fraction
+        
+        # Continue from the last input sample of this block
+        self._position += count * self.step - last
+        self._tail = data[-1:]
+        return out.astype(np.float32, copy=False)
+
+class AveragedSpectrum:
+    """
+    Magnitude spectrum averaged over half-overlapping Hann frames (Welch style),
+    accumulated block by block. The signal is padded with half a frame of
+    silence at both ends, so every sample carries the same total window
+    weight, including the attack at the very start of a one-shot.
+    
+    This is the one spectrum estimator of the analyzer: feeding a signal in
+    blocks gives exactly the result of feeding it whole, so streamed and
+    in-memory files of the same sound get the same band ratios.
+    """
+    
+    def __init__(self, sr: int, fft_size: int = SUMMARY_FFT_SIZE):
+        """
+        Args:
+            sr: Sample rate of the blocks passed to update
+            fft_size: Frame length; frames advance by half of it
+        """
+        self.sr = sr
+        self.fft_size = fft_size
+        self.hop = fft_size // 2
+        # Periodic Hann: overlapping halves sum to exactly one
+        self._window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(fft_size) / fft_size)).astype(np.float32)
+        self._pending = np.zeros(self.hop, dtype=np.float32)  # Leading half frame of silence
+        self._magnitude_sum = np.zeros(fft_size // 2 + 1)
+        self._frames = 0
+        self._samples = 0
+        self._finished = False
+    
+    def _add_frames(self, data: np.ndarray) -> np.ndarray:
+        """Transform every complete frame of data; returns the samples still needed by later frames."""
+        if len(data) < self.fft_size:
+            return data
+        count = (len(data) - self.fft_size) // self.hop + 1
+        frames = np.lib.stride_tricks.sliding_window_view(data, self.fft_size)[::self.hop][:count]
+        self._magnitude_sum += np.abs(np.fft.rfft(frames * self._window, axis=1)).sum(axis=0)
+        self._frames += count
+        return data[count * self.hop:]
+    
+    def update(self, block: np.ndarray):
+        """Add the next block of the mono signal."""
+        if len(block) == 0:
+            return
+        self._samples += len(block)
+        self._pending = self._add_frames(np.concatenate([self._pending, block.astype(np.float32, copy=False)]))
+    
+    def finish(self):
+        """Close the stream: pad with silence until the last sample is fully covered."""
+        if self._finished:
+            return
+        if self._samples:
+            length = max(self.fft_size, len(self._pending) + self.hop)
+            length = self.fft_size + -(-(length - self.fft_size) // self.hop) * self.hop
+            self._add_frames(np.pad(self._pending, (0, length - len(self._pending))))
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._finished = True
+    
+    @property
+    def spectrum(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Positive-frequency spectrum as (frequencies, magnitudes), cut to fft_size // 2 bins."""
+        self.finish()
+        half = self.fft_size // 2
+        freqs = np.fft.rfftfreq(self.fft_size, 1 / self.sr)[:half]
+        magnitude = self._magnitude_sum[:half] / max(1, self._frames)
+        return freqs, magnitude
+
+def averaged_spectrum(y: np.ndarray, sr: int) -> Tuple[np.ndarray, np.ndarray]:
+    """AveragedSpectrum of a whole in-memory signal."""
+    spectrum = AveragedSpectrum(sr)
+    spectrum.update(np.asarray(y, dtype=np.float32))
+    return spectrum.spectrum
+
+class AudioSummary:
+    """
+    Whole-signal summaries accumulated block by block while streaming.
+    Covers what the analyzer needs over the full length of a file: level
+    (RMS, peak), zero crossings, per-frame energies (which also give the
+    energy-flux onset envelope) and the AveragedSpectrum for band energies. Memory is bounded by the block size plus one value per hop,
+    whatever the file's length.
+    """
+    
+    def __init__(self, sr: int, hop_length: int = 512, fft_size: int = SUMMARY_FFT_SIZE):
+        """
+        Args:
+            sr: Sample rate of the blocks passed to update
+            hop_length: Frame length of the per-frame energies (the analyzer's hop length)
+            fft_size: Frame length of the averaged spectrum
+        """
+        self.sr = sr
+        self.hop_length = hop_length
+        
+        self.samples = 0
+        self.sum_squares = 0.0
+        self.peak = 0.0
+        self.zero_crossings = 0
+        self._last_sign = None
+        
+        self._frame_pending = np.zeros(0, dtype=np.float32)
+        self._frame_energies = []
+        
+        self._spectrum = AveragedSpectrum(sr, fft_size)
+    
+    def update(self, block: np.ndarray):
+        """Add the next block of the mono signal."""
+        if len(block) == 0:
+            return
+        
+        self.samples += len(block)
+        self.sum_squares += float(np.dot(block, block))
+        self.peak = max(self.peak, float(np.max(np.abs(block))))
+        
+        signs = np.signbit(block)
+        self.zero_crossings += int(np.count_nonzero(signs[1:] != signs[:-1]))
+        if self._last_sign is not None and signs[0] != self._last_sign:
+            self.zero_crossings += 1
+        self._last_sign = signs[-1]
+        
+        # Energy of each complete hop_length frame
+        data = np.concatenate([self._frame_pending, block])
+        full = len(data) // self.hop_length * self.hop_length
+        frames = data[:full].reshape(-1, self.hop_length)
+        self._frame_energies.append(np.einsum('ij,ij->i', frames, frames))
+        self._frame_pending = data[full:]
+        
+        self._spectrum.update(block)
+    
+    def finish(self):
+        """Close the stream (pads the last spectrum frames)."""
+        self._spectrum.finish()
+    
+    @property
+    def duration(self) -> float:
+        """Signal duration in seconds."""
+        return self.samples / self.sr
+    
+    @property
+    def rms(self) -> float:
+        """Root-mean-square level of the whole signal."""
+        return float(np.sqrt(self.sum_squares / self.samples)) if self.samples else 0.0
+    
+    @property
+    def zero_crossing_rate(self) -> float:
+        """Sign changes per sample over the whole signal."""
+        return self.zero_crossings / self.samples if self.samples else 0.0
+    
+    @cached_property
+    def frame_energy(self) -> FrameEnergy:
+        """
+        Per-frame energies with FrameEnergy's framing: only full frames, and
+        a frame ending exactly on the last sample is dropped.
+        """
+        energy = np.concatenate(self._frame_energies) if self._frame_energies else np.zeros(0, dtype=np.float32)
+        return FrameEnergy.from_energy(energy[:max(0, (self.samples - 1) // self.hop_length)], self.hop_length)
+    
+    @cached_property
+    def spectrum(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Averaged magnitude spectrum of the whole signal, as (frequencies, magnitudes)."""
+        return self._spectrum.spectrum
+
+def stream_audio(file_path: str, target_sr: int, hop_length: int = 512,
+                 block_frames: int = STREAM_BLOCK_FRAMES,
+                 keep: Optional[List[Tuple[int, int]]] = None) -> Tuple[np.ndarray, AudioSummary]:
+    """
+    Decode a file block by block into mono float32 at target_sr.
+    Each block is downmixed and resampled on its own and fed to an
+    AudioSummary, so the only full-length array is the float32 output
+    (instead of the float64 multichannel decode, its mono copy and the
+    resampling index arrays). With keep, only the given ranges are
+    retained and memory no longer grows with the file's length.
+    
+    Args:
+        file_path: Audio file readable by soundfile
+        target_sr: Output sample rate
+        hop_length: Frame length of the summary's per-frame energies
+        block_frames: Input frames decoded per block
+        keep: Sorted (start, end) ranges of output samples to retain, joined
+            end to end; None retains the whole signal. The summary always
+            covers the whole signal.
+    
+    Returns:
+        (signal, summary) tuple
+    """
+    import soundfile as sf
+    
+    summary = AudioSummary(target_sr, hop_length)
+    with sf.SoundFile(file_path) as f:
+        resampler = LinearResampler(f.samplerate, target_sr)
+        if keep is None:
+            capacity = int(max(f.frames, 0) * target_sr / f.samplerate) + 2
+        else:
+            capacity = sum(end - start for start, end in keep)
+        out = np.empty(capacity, dtype=np.float32)
+        written = 0
+        position = 0  # Output samples produced so far
+        
+        for block in f.blocks(blocksize=block_frames, dtype='float32', always_2d=True):
+            mono = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1, dtype=np.float32)
+            resampled = resampler.process(mono)
+            summary.update(resampled)
+            
+            if keep is None:
+                pieces = [resampled]
+            else:
+                pieces = [resampled[max(start, position) - position:min(end, position + len(resampled)) - position]
+                          for start, end in keep if start < position + len(resampled) and end > position]
+            position += len(resampled)
+            
+            for piece in pieces:
+                if written + len(piece) > len(out):
+                    # Header frame count was short (or unknown)
+                    out = np.resize(out, max(written + len(piece), 2 * len(out)))
+                out[written:written + len(piece)] = piece
+                written += len(piece)
+    
+    summary.finish()
+    return out[:written], summary